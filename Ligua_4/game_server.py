@@ -0,0 +1,364 @@
+# Python 3
+"""Servidor asyncio que hospeda várias partidas simultâneas de Ligue 4 (humano x bot).
+
+Protocolo: uma requisição JSON por linha, uma resposta JSON por linha (o "id" enviado volta
+na resposta). Operações:
+
+    {"op": "new", "human_plays_as": 2, "human_first": true, "time_limit": 1.0, "depth": null}
+    {"op": "move", "game": "<id>", "col": 3}     -> jogada do humano + resposta do bot
+    {"op": "state", "game": "<id>"}
+    {"op": "close", "game": "<id>"}
+    {"op": "metrics"}
+
+Cada partida guarda o seu BitBoard no servidor. As buscas (choose_move) rodam num pool de
+processos compartilhado, então uma busca lenta não trava o laço de eventos nem as outras
+partidas. O pool só recebe uma busca por processo; as demais esperam vaga no servidor, no
+máximo --max-pending entre espera e execução. Quem passa do limite ou não consegue vaga em
+--queue-timeout segundos recebe {"ok": false, "error": "busy"} (a jogada do humano é desfeita e
+pode ser reenviada). O tempo por jogada é limitado por --max-move-time e conta a partir do
+envio ao pool (quando o processo começa a busca); se o processo passar do prazo + margem, o
+bot joga um lance de emergência (o primeiro da ordenação: vitória, bloqueio ou centro) e a
+partida segue.
+
+"metrics" devolve a profundidade da fila, buscas em execução, partidas ativas, recusas,
+estouros de prazo e a latência das jogadas (média, p50, p95, máx.).
+
+Uso:
+    python game_server.py --port 8765 --workers 4
+    echo '{"op": "new"}' | nc localhost 8765
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
+
+from ligue_4 import BOT, OPP, BitBoard, choose_move, order_moves
+
+TIMEOUT_GRACE = 0.5 # margem (s) além do time_limit antes da jogada de emergência
+MIN_MOVE_TIME = 0.05 # menor time_limit aceito
+LATENCY_SAMPLES = 1000
+
+# livro aberto em cada processo do pool (preenchido por _init_worker)
+_worker_book = None
+
+
+class ServerBusy(Exception):
+    """Sem vaga no pool de buscas dentro de queue_timeout."""
+    pass
+
+class RequestError(Exception):
+    """Requisição inválida; a mensagem vai p o cliente."""
+    pass
+
+
+def _init_worker(book_path: Optional[str]) -> None:
+    global _worker_book
+    if book_path:
+        from opening_book import PositionBook
+        _worker_book = PositionBook(book_path)
+
+def _search_move(pieces: List[int], heights: List[int], history: List[int], player: int, depth: Optional[int],
+                 time_limit: float) -> Tuple[int, float, Dict[str, Any]]:
+    """Roda num processo do pool: (coluna, valor, info) de choose_move."""
+    bb = BitBoard()
+    bb.pieces, bb.heights, bb.history = pieces, heights, history
+    info: Dict[str, Any] = {}
+    col, value = choose_move(bb, player, depth, time_limit=time_limit, info=info, book=_worker_book)
+    return col, value, info
+
+
+class Game:
+    __slots__ = ("id", "board", "human", "bot", "turn", "depth", "time_limit", "status", "lock", "last_active")
+
+    def __init__(self, human: int, human_first: bool, depth: Optional[int], time_limit: float):
+        self.id = uuid.uuid4().hex[:12]
+        self.board = BitBoard()
+        self.human = human
+        self.bot = BOT if human == OPP else OPP
+        self.turn = human if human_first else self.bot
+        self.depth = depth
+        self.time_limit = time_limit
+        self.status = "playing" # playing | human_won | bot_won | draw
+        self.lock = asyncio.Lock() # requisições da mesma partida rodam uma de cada vez
+        self.last_active = time.monotonic()
+
+    def apply(self, col: int, player: int) -> None:
+        self.board.play(col, player)
+        if self.board.is_winning(player):
+            self.status = "human_won" if player == self.human else "bot_won"
+        elif not self.board.valid_moves():
+            self.status = "draw"
+        self.turn = OPP if player == BOT else BOT
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"game": self.id, "board": self.board.to_grid(), "valid_moves": self.board.valid_moves(),
+                "status": self.status, "turn": self.turn, "human": self.human, "bot": self.bot}
+
+
+class GameServer:
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 queue_timeout: Optional[float] = None, default_move_time: float = 1.0, max_move_time: float = 5.0,
+                 max_games: int = 1000, idle_timeout: float = 600.0, book_path: Optional[str] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max(max_pending or 2 * self.workers, self.workers)
+        # padrão: o bastante p esperar uma jogada inteira de quem está no pool
+        self.queue_timeout = max_move_time + TIMEOUT_GRACE if queue_timeout is None else queue_timeout
+        self.default_move_time = default_move_time
+        self.max_move_time = max_move_time
+        self.max_games = max_games
+        self.idle_timeout = idle_timeout
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(book_path,))
+        # uma busca por processo: nada fica parado na fila do executor, onde o prazo já estaria correndo
+        self._slots = asyncio.Semaphore(self.workers)
+        self.games: Dict[str, Game] = {}
+        # métricas
+        self.waiting = 0   # esperando vaga
+        self.pending = 0   # enviadas ao pool e ainda não terminadas (no máximo workers)
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.move_latency: deque = deque(maxlen=LATENCY_SAMPLES)
+        self.queue_wait: deque = deque(maxlen=LATENCY_SAMPLES)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._reaper: Optional[asyncio.Task] = None
+
+    # --- Busca no pool ---
+    def _release_slot(self, _future) -> None:
+        self.pending -= 1
+        self._slots.release()
+
+    def _search_done(self, loop: asyncio.AbstractEventLoop, future) -> None:
+        # roda na thread do executor; depois de close() o laço pode já ter fechado
+        try:
+            loop.call_soon_threadsafe(self._release_slot, future)
+        except RuntimeError:
+            pass
+
+    async def _bot_move(self, game: Game) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        if self.waiting + self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ServerBusy()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ServerBusy()
+        finally:
+            self.waiting -= 1
+        self.queue_wait.append(loop.time() - start)
+
+        bb = game.board
+        self.pending += 1
+        future = self._pool.submit(_search_move, bb.pieces[:], bb.heights[:], bb.history[:], game.bot, game.depth,
+                                   game.time_limit)
+        # a vaga só volta quando o processo termina de fato, mesmo que a resposta já tenha saído
+        future.add_done_callback(lambda f: self._search_done(loop, f))
+        # com no máximo workers buscas no pool, a busca começa no envio: o prazo conta daqui
+        try:
+            col, value, info = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)),
+                                                      game.time_limit + TIMEOUT_GRACE)
+            fallback = False
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            col, value, info = order_moves(bb, bb.valid_moves(), game.bot)[0], 0.0, {}
+            fallback = True
+        latency = loop.time() - start
+        self.move_latency.append(latency)
+        self.completed += 1
+        game.apply(col, game.bot)
+        return {"bot_move": col, "value": value, "depth": info.get("depth"), "nodes": info.get("nodes"),
+                "book": info.get("book", False), "fallback": fallback, "latency": round(latency, 4)}
+
+    # --- Operações ---
+    def _get_game(self, request: Dict[str, Any]) -> Game:
+        game = self.games.get(request.get("game"))
+        if game is None:
+            raise RequestError("partida desconhecida")
+        game.last_active = time.monotonic()
+        return game
+
+    async def op_new(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if len(self.games) >= self.max_games:
+            raise ServerBusy()
+        human = request.get("human_plays_as", OPP)
+        if type(human) is not int or human not in (BOT, OPP): # bool também é int
+            raise RequestError("human_plays_as deve ser 1 (X) ou 2 (O)")
+        time_limit = request.get("time_limit", self.default_move_time)
+        if type(time_limit) not in (int, float):
+            raise RequestError("time_limit deve ser um número de segundos")
+        time_limit = min(max(float(time_limit), MIN_MOVE_TIME), self.max_move_time)
+        depth = request.get("depth")
+        if depth is not None and (type(depth) is not int or depth < 1):
+            raise RequestError("depth deve ser um inteiro positivo ou null")
+        game = Game(human, bool(request.get("human_first", True)), depth, time_limit)
+        self.games[game.id] = game
+        reply: Dict[str, Any] = {}
+        if game.turn == game.bot:
+            async with game.lock:
+                try:
+                    reply = await self._bot_move(game)
+                except Exception:
+                    del self.games[game.id]
+                    raise
+        return {**reply, **game.snapshot()}
+
+    async def op_move(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        game = self._get_game(request)
+        async with game.lock:
+            if game.status != "playing":
+                raise RequestError("partida encerrada")
+            if game.turn != game.human:
+                raise RequestError("não é a vez do humano")
+            col = request.get("col")
+            if not isinstance(col, int) or col not in game.board.valid_moves():
+                raise RequestError(f"coluna inválida: {col}")
+            game.apply(col, game.human)
+            reply: Dict[str, Any] = {}
+            if game.status == "playing":
+                try:
+                    reply = await self._bot_move(game)
+                except Exception:
+                    # desfaz a jogada do humano (busy ou falha do pool): o cliente pode reenviar
+                    game.board.undo()
+                    game.turn = game.human
+                    game.status = "playing"
+                    raise
+            return {**reply, **game.snapshot()}
+
+    async def op_state(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return self._get_game(request).snapshot()
+
+    async def op_close(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        game = self._get_game(request)
+        del self.games[game.id]
+        return {"game": game.id, "closed": True}
+
+    async def op_metrics(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return self.metrics()
+
+    def metrics(self) -> Dict[str, Any]:
+        def summary(samples: deque) -> Dict[str, Any]:
+            if not samples:
+                return {"count": 0}
+            ordered = sorted(samples)
+            return {"count": len(ordered), "mean": round(sum(ordered) / len(ordered), 4),
+                    "p50": round(ordered[len(ordered) // 2], 4),
+                    "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+                    "max": round(ordered[-1], 4)}
+        return {
+            "games": len(self.games),
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "queue_depth": self.waiting + self.pending, # o que max_pending limita
+            "waiting_for_slot": self.waiting,
+            "in_pool": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "move_latency": summary(self.move_latency),
+            "queue_wait": summary(self.queue_wait),
+        }
+
+    async def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        handler = getattr(self, f"op_{request.get('op')}", None)
+        if handler is None:
+            raise RequestError(f"operação desconhecida: {request.get('op')}")
+        return await handler(request)
+
+    # --- Conexões ---
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # uma requisição por vez por conexão: a próxima linha só é lida depois da resposta
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                request: Dict[str, Any] = {}
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise RequestError("a requisição deve ser um objeto JSON")
+                    response = {"ok": True, **await self.dispatch(request)}
+                except ServerBusy:
+                    response = {"ok": False, "error": "busy"}
+                except (RequestError, ValueError, TypeError) as exc:
+                    response = {"ok": False, "error": str(exc)}
+                except Exception as exc: # falha do pool de processos: a conexão continua
+                    response = {"ok": False, "error": f"erro interno: {exc!r}"}
+                if "id" in request:
+                    response["id"] = request["id"]
+                writer.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+                await writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            pass # conexão caiu
+        finally: # CancelledError (servidor fechando) segue adiante depois de fechar a conexão
+            writer.close()
+
+    async def _reap_idle_games(self) -> None:
+        while True:
+            await asyncio.sleep(max(1.0, self.idle_timeout / 10))
+            limit = time.monotonic() - self.idle_timeout
+            for game_id in [gid for gid, game in self.games.items() if game.last_active < limit and not game.lock.locked()]:
+                del self.games[game_id]
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, unix_path: Optional[str] = None) -> None:
+        if unix_path:
+            self._server = await asyncio.start_unix_server(self.handle_client, unix_path)
+        else:
+            self._server = await asyncio.start_server(self.handle_client, host, port)
+        self._reaper = asyncio.create_task(self._reap_idle_games())
+
+    async def close(self) -> None:
+        if self._reaper is not None:
+            self._reaper.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def serve(args) -> None:
+    server = GameServer(args.workers, args.max_pending, args.queue_timeout, args.move_time, args.max_move_time,
+                        args.max_games, args.idle_timeout, args.book)
+    await server.start(args.host, args.port, args.unix)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"servidor de Ligue 4 em {where} ({server.workers} processos)", file=sys.stderr)
+    try:
+        while True:
+            await asyncio.sleep(args.metrics_interval or 3600)
+            if args.metrics_interval:
+                print(json.dumps(server.metrics()), file=sys.stderr)
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor asyncio de partidas de Ligue 4 (JSON por linha).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="caminho de um socket Unix (no lugar de host/porta)")
+    parser.add_argument("--workers", type=int, default=None, help="processos de busca (padrão: todos os núcleos)")
+    parser.add_argument("--max-pending", type=int, default=None, help="buscas entre espera e execução (padrão: 2 x workers)")
+    parser.add_argument("--queue-timeout", type=float, default=None,
+                        help="espera máxima por vaga antes de 'busy' (padrão: max-move-time + margem)")
+    parser.add_argument("--move-time", type=float, default=1.0, help="tempo padrão por jogada do bot")
+    parser.add_argument("--max-move-time", type=float, default=5.0, help="limite do time_limit pedido pelo cliente")
+    parser.add_argument("--max-games", type=int, default=1000)
+    parser.add_argument("--idle-timeout", type=float, default=600.0, help="partidas paradas há mais tempo são descartadas")
+    parser.add_argument("--book", default=None, help="livro de aberturas (opening_book.py)")
+    parser.add_argument("--metrics-interval", type=float, default=0, help="imprime as métricas a cada N segundos")
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
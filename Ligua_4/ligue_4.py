@@ -1,5 +1,6 @@
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Dict, Any, Optional, Sequence, Union
 import math
+import time
 import random
 
 ROWS, COLS = 6, 7
@@ -7,6 +8,115 @@ EMPTY = 0
 BOT = 1
 OPP = 2
 
+# ---------- Bitboard ----------
+# Cada coluna ocupa H1 = ROWS + 1 bits (6 casas + 1 sentinela sempre vazia, que impede
+# que os deslocamentos "vazem" de uma coluna p a próxima). Bit da casa = col * H1 + altura,
+# altura 0 = linha de baixo (na matriz, a linha de baixo é ROWS - 1).
+H1 = ROWS + 1
+BOTTOM_MASK = sum(1 << (c * H1) for c in range(COLS))
+BOARD_MASK = BOTTOM_MASK * ((1 << ROWS) - 1)
+COLUMN_MASKS = [((1 << ROWS) - 1) << (c * H1) for c in range(COLS)]
+TOP_MASKS = [1 << (c * H1 + ROWS - 1) for c in range(COLS)]
+CENTER_MASK = COLUMN_MASKS[COLS // 2]
+
+def cell_bit(r: int, c: int) -> int:
+    """Bit da casa (r, c) da matriz (r = 0 é a linha de cima)."""
+    return 1 << (c * H1 + (ROWS - 1 - r))
+
+def _popcount_bin(x: int) -> int:
+    return bin(x).count("1")
+
+popcount = getattr(int, "bit_count", _popcount_bin)
+
+def has_four(bits: int) -> bool:
+    """Quatro em linha nas peças `bits`: vertical (1), horizontal (H1) e diagonais (H1-1, H1+1)."""
+    for shift in (1, H1, H1 - 1, H1 + 1):
+        m = bits & (bits >> shift)
+        if m & (m >> (2 * shift)):
+            return True
+    return False
+
+class BitBoard:
+    """Tabuleiro em bitboard: um int de 64 bits por jogador + altura de cada coluna.
+
+    pieces[BOT] e pieces[OPP] guardam as peças de cada um; heights[c] é o bit da próxima
+    casa livre da coluna c. play/undo são O(1) (undo desfaz a última jogada do histórico).
+    """
+    __slots__ = ("pieces", "heights", "history")
+
+    def __init__(self):
+        self.pieces = [0, 0, 0] # indexado por jogador (posição 0 sem uso)
+        self.heights = [c * H1 for c in range(COLS)]
+        self.history: List[int] = []
+
+    @classmethod
+    def from_grid(cls, board: List[List[int]]) -> 'BitBoard':
+        bb = cls()
+        for c in range(COLS):
+            for r in range(ROWS - 1, -1, -1):
+                player = board[r][c]
+                if player == EMPTY:
+                    break
+                bb.pieces[player] |= 1 << bb.heights[c]
+                bb.heights[c] += 1
+        return bb
+
+    def to_grid(self) -> List[List[int]]:
+        board = new_board()
+        for r in range(ROWS):
+            for c in range(COLS):
+                bit = cell_bit(r, c)
+                if self.pieces[BOT] & bit:
+                    board[r][c] = BOT
+                elif self.pieces[OPP] & bit:
+                    board[r][c] = OPP
+        return board
+
+    def copy(self) -> 'BitBoard':
+        bb = BitBoard.__new__(BitBoard)
+        bb.pieces = self.pieces[:]
+        bb.heights = self.heights[:]
+        bb.history = self.history[:]
+        return bb
+
+    @property
+    def mask(self) -> int:
+        return self.pieces[BOT] | self.pieces[OPP]
+
+    def can_play(self, col: int) -> bool:
+        return not (self.mask & TOP_MASKS[col])
+
+    def valid_moves(self) -> List[int]:
+        # casa jogável de cada coluna = a primeira livre: (ocupadas + fundo) & tabuleiro
+        playable = (self.mask + BOTTOM_MASK) & BOARD_MASK
+        return [c for c in range(COLS) if playable & COLUMN_MASKS[c]]
+
+    def play(self, col: int, player: int) -> None:
+        self.pieces[player] |= 1 << self.heights[col]
+        self.heights[col] += 1
+        self.history.append(col)
+
+    def undo(self) -> None:
+        col = self.history.pop()
+        self.heights[col] -= 1
+        bit = 1 << self.heights[col]
+        if self.pieces[BOT] & bit:
+            self.pieces[BOT] ^= bit
+        else:
+            self.pieces[OPP] ^= bit
+
+    def is_winning(self, player: int) -> bool:
+        return has_four(self.pieces[player])
+
+    def is_full(self) -> bool:
+        return self.mask == BOARD_MASK
+
+    def __len__(self) -> int:
+        return popcount(self.mask)
+
+def as_bitboard(board: Union[BitBoard, List[List[int]]]) -> BitBoard:
+    return board if isinstance(board, BitBoard) else BitBoard.from_grid(board)
+
 # ---------- Utilidades de tabuleiro ----------
 def new_board() -> List[List[int]]:
     return [[EMPTY for _ in range(COLS)] for _ in range(ROWS)]
@@ -27,28 +137,8 @@ def drop_piece(board: List[List[int]], col: int, player: int) -> Optional[List[L
             return b
     return None
 
-def is_winning(board: List[List[int]], player: int) -> bool:
-    # Horizontal
-    for r in range(ROWS):
-        for c in range(COLS - 3):
-            if all(board[r][c+i] == player for i in range(4)):
-                return True
-    # Vertical
-    for c in range(COLS):
-        for r in range(ROWS - 3):
-            if all(board[r+i][c] == player for i in range(4)):
-                return True
-    # Diag /
-    for r in range(3, ROWS):
-        for c in range(COLS - 3):
-            if all(board[r-i][c+i] == player for i in range(4)):
-                return True
-    # Diag \
-    for r in range(ROWS - 3):
-        for c in range(COLS - 3):
-            if all(board[r+i][c+i] == player for i in range(4)):
-                return True
-    return False
+def is_winning(board: Union[BitBoard, List[List[int]]], player: int) -> bool:
+    return as_bitboard(board).is_winning(player)
 
 def is_playable_cell(board: List[List[int]], r: int, c: int) -> bool:
     """Uma célula vazia é 'jogável' se estiver vazia e (linha inferior ou tem peça abaixo)."""
@@ -74,6 +164,18 @@ class Weights:
     #WIN = 1
     #LOSE = -1
 
+WEIGHT_NAMES = ("CENTER", "TWO_OPEN", "THREE_OPEN", "BROKEN_THREE", "TWO_SPACE_TWO", "WIN", "LOSE")
+
+def get_weights() -> Dict[str, float]:
+    return {name: getattr(Weights, name) for name in WEIGHT_NAMES}
+
+def set_weights(values: Dict[str, float]) -> None:
+    """Troca os pesos de Weights (só os nomes dados). Tabelas de transposição antigas ficam inválidas."""
+    for name, value in values.items():
+        if name not in WEIGHT_NAMES:
+            raise ValueError(f"peso desconhecido: {name}")
+        setattr(Weights, name, value)
+
 def count_center_bonus(board: List[List[int]], player: int) -> float:
     center_col = COLS // 2
     count = sum(1 for r in range(ROWS) if board[r][center_col] == player)
@@ -149,8 +251,8 @@ def two_space_two_horizontal(board: List[List[int]], r: int, c_start: int, playe
             return -Weights.TWO_SPACE_TWO
     return 0.0
 
-def evaluate(board: List[List[int]], player: int) -> float:
-    """Heurística estática do ponto de vista de `player`."""
+def evaluate_grid(board: List[List[int]], player: int) -> float:
+    """Heurística estática sobre a matriz (versão de referência de evaluate)."""
     opp = OPP if player == BOT else BOT
 
     # Terminais
@@ -196,69 +298,542 @@ def evaluate(board: List[List[int]], player: int) -> float:
 
     return score
 
+# janelas como máscaras de bits: as 69 de 4 casas e as 18 horizontais de 5 (2-esp-2)
+WINDOWS_4: List[int] = (
+    [sum(cell_bit(r, c + i) for i in range(4)) for r in range(ROWS) for c in range(COLS - 3)]
+    + [sum(cell_bit(r + i, c) for i in range(4)) for c in range(COLS) for r in range(ROWS - 3)]
+    + [sum(cell_bit(r - i, c + i) for i in range(4)) for r in range(3, ROWS) for c in range(COLS - 3)]
+    + [sum(cell_bit(r + i, c + i) for i in range(4)) for r in range(ROWS - 3) for c in range(COLS - 3)]
+)
+WINDOWS_5_H: List[int] = [sum(cell_bit(r, c + i) for i in range(5)) for r in range(ROWS) for c in range(COLS - 4)]
+
+def combine_score(center: int, threes: int, opp_threes: int, twos: int, opp_twos: int, broken: int, split: int) -> float:
+    """Junta as contagens da heurística com os pesos de Weights (lidos na hora).
+
+    evaluate e EvalBoard somam na mesma ordem, então dão exatamente o mesmo valor.
+    """
+    return (center * Weights.CENTER
+            + (threes - opp_threes) * Weights.THREE_OPEN
+            + (twos - opp_twos) * Weights.TWO_OPEN
+            + broken * Weights.BROKEN_THREE
+            + split * Weights.TWO_SPACE_TWO)
+
+def evaluate(board: Union[BitBoard, List[List[int]]], player: int) -> float:
+    """Heurística estática do ponto de vista de `player` (sobre o bitboard).
+
+    Dá os valores de evaluate_grid a menos do arredondamento: lá os pesos são somados janela a
+    janela; aqui as contagens são inteiras e os pesos entram uma vez só, em combine_score
+    (com pesos inteiros, como os padrão, o valor é exatamente o mesmo).
+
+    Como em evaluate_grid, broken-three e 2-esp-2 só pontuam a favor de `player`: a janela
+    com peça do oponente é descartada antes do ramo simétrico. Um EvalBoard responde com as
+    contagens que já mantém, sem varrer as janelas.
+    """
+    if isinstance(board, EvalBoard):
+        return board.evaluate(player)
+    bb = as_bitboard(board)
+    opp = OPP if player == BOT else BOT
+    own, other = bb.pieces[player], bb.pieces[opp]
+
+    # Terminais
+    if has_four(own):
+        return Weights.WIN
+    if has_four(other):
+        return Weights.LOSE
+
+    occupied = own | other
+    # vazias jogáveis: a primeira casa livre de cada coluna
+    playable_empty = (occupied + BOTTOM_MASK) & BOARD_MASK
+    threes = opp_threes = twos = opp_twos = broken = split = 0
+
+    for window in WINDOWS_4:
+        o_cnt = popcount(other & window)
+        if o_cnt == 0:
+            p_cnt = popcount(own & window)
+            if p_cnt == 3:
+                threes += 1
+                if window & playable_empty:
+                    broken += 1
+            elif p_cnt == 2:
+                twos += 1
+        elif not own & window:
+            if o_cnt == 3:
+                opp_threes += 1
+            elif o_cnt == 2:
+                opp_twos += 1
+
+    for window in WINDOWS_5_H:
+        if not other & window and popcount(own & window) == 4 and window & playable_empty:
+            split += 1
+
+    return combine_score(popcount(own & CENTER_MASK), threes, opp_threes, twos, opp_twos, broken, split)
+
+# ---------- Avaliação incremental ----------
+# Cada casa (índice do bit) -> janelas que passam por ela: no máximo 16 de 4 casas e 5 horizontais de 5.
+NUM_CELL_BITS = COLS * H1
+CELL_WINDOWS_4: List[List[int]] = [[w for w, window in enumerate(WINDOWS_4) if window >> i & 1] for i in range(NUM_CELL_BITS)]
+CELL_WINDOWS_5_H: List[List[int]] = [[w for w, window in enumerate(WINDOWS_5_H) if window >> i & 1] for i in range(NUM_CELL_BITS)]
+CENTER_CELLS = frozenset(i for i in range(NUM_CELL_BITS) if CENTER_MASK >> i & 1)
+
+class EvalBoard(BitBoard):
+    """BitBoard que mantém a heurística atualizada a cada play/undo.
+
+    Guarda quantas peças de cada jogador há em cada janela e, a partir disso, as contagens
+    que evaluate usaria: janelas abertas com 2 e 3 peças, quatro em linha, peças no centro e,
+    por casa vazia, quantas trincas (e 2-esp-2) dependem só dela (threes_at/splits_at). Uma
+    jogada só mexe nas janelas que passam pela peça; na avaliação basta olhar as no máximo
+    7 casas jogáveis.
+    """
+    __slots__ = ("counts4", "counts5", "center", "wins", "threes", "twos", "threes_at", "splits_at")
+
+    def __init__(self):
+        super().__init__()
+        self.counts4 = [[], [0] * len(WINDOWS_4), [0] * len(WINDOWS_4)] # [jogador][janela]
+        self.counts5 = [[], [0] * len(WINDOWS_5_H), [0] * len(WINDOWS_5_H)]
+        self.center = [0, 0, 0]
+        self.wins = [0, 0, 0]
+        self.threes = [0, 0, 0]
+        self.twos = [0, 0, 0]
+        self.threes_at = [[], [0] * NUM_CELL_BITS, [0] * NUM_CELL_BITS] # [jogador][casa vazia]
+        self.splits_at = [[], [0] * NUM_CELL_BITS, [0] * NUM_CELL_BITS]
+
+    @classmethod
+    def from_board(cls, board: Union[BitBoard, List[List[int]]]) -> 'EvalBoard':
+        bb = as_bitboard(board)
+        eb = cls()
+        for player in (BOT, OPP):
+            bits = bb.pieces[player]
+            while bits:
+                low = bits & -bits
+                eb._place(low.bit_length() - 1, player, True)
+                bits ^= low
+        eb.heights = bb.heights[:]
+        eb.history = bb.history[:]
+        return eb
+
+    @classmethod
+    def from_grid(cls, board: List[List[int]]) -> 'EvalBoard':
+        return cls.from_board(BitBoard.from_grid(board))
+
+    def copy(self) -> 'EvalBoard':
+        eb = EvalBoard.__new__(EvalBoard)
+        eb.pieces = self.pieces[:]
+        eb.heights = self.heights[:]
+        eb.history = self.history[:]
+        eb.counts4 = [[], self.counts4[BOT][:], self.counts4[OPP][:]]
+        eb.counts5 = [[], self.counts5[BOT][:], self.counts5[OPP][:]]
+        eb.center = self.center[:]
+        eb.wins = self.wins[:]
+        eb.threes = self.threes[:]
+        eb.twos = self.twos[:]
+        eb.threes_at = [[], self.threes_at[BOT][:], self.threes_at[OPP][:]]
+        eb.splits_at = [[], self.splits_at[BOT][:], self.splits_at[OPP][:]]
+        return eb
+
+    def _terms(self, index: int, sign: int) -> None:
+        """Soma (sign=1) ou tira (sign=-1) a contribuição das janelas que passam pela casa `index`."""
+        bot4, opp4 = self.counts4[BOT], self.counts4[OPP]
+        empty = BOARD_MASK & ~(self.pieces[BOT] | self.pieces[OPP])
+        for w in CELL_WINDOWS_4[index]:
+            b, o = bot4[w], opp4[w]
+            if o == 0:
+                player, n = BOT, b
+            elif b == 0:
+                player, n = OPP, o
+            else:
+                continue # janela bloqueada: não conta p ninguém
+            if n == 2:
+                self.twos[player] += sign
+            elif n == 3:
+                self.threes[player] += sign
+                self.threes_at[player][(WINDOWS_4[w] & empty).bit_length() - 1] += sign
+            elif n == 4:
+                self.wins[player] += sign
+        bot5, opp5 = self.counts5[BOT], self.counts5[OPP]
+        for w in CELL_WINDOWS_5_H[index]:
+            b, o = bot5[w], opp5[w]
+            if b == 4 and o == 0:
+                self.splits_at[BOT][(WINDOWS_5_H[w] & empty).bit_length() - 1] += sign
+            elif o == 4 and b == 0:
+                self.splits_at[OPP][(WINDOWS_5_H[w] & empty).bit_length() - 1] += sign
+
+    def _place(self, index: int, player: int, adding: bool) -> None:
+        self._terms(index, -1)
+        delta = 1 if adding else -1
+        self.pieces[player] ^= 1 << index
+        counts4, counts5 = self.counts4[player], self.counts5[player]
+        for w in CELL_WINDOWS_4[index]:
+            counts4[w] += delta
+        for w in CELL_WINDOWS_5_H[index]:
+            counts5[w] += delta
+        if index in CENTER_CELLS:
+            self.center[player] += delta
+        self._terms(index, 1)
+
+    def play(self, col: int, player: int) -> None:
+        self._place(self.heights[col], player, True)
+        self.heights[col] += 1
+        self.history.append(col)
+
+    def undo(self) -> None:
+        col = self.history.pop()
+        self.heights[col] -= 1
+        index = self.heights[col]
+        self._place(index, BOT if self.pieces[BOT] >> index & 1 else OPP, False)
+
+    def is_winning(self, player: int) -> bool:
+        return self.wins[player] > 0
+
+    def evaluate(self, player: int) -> float:
+        opp = OPP if player == BOT else BOT
+        if self.wins[player]:
+            return Weights.WIN
+        if self.wins[opp]:
+            return Weights.LOSE
+        threes_at, splits_at = self.threes_at[player], self.splits_at[player]
+        broken = split = 0
+        for c in range(COLS):
+            index = self.heights[c]
+            if index < c * H1 + ROWS: # coluna não cheia: index é a casa jogável
+                broken += threes_at[index]
+                split += splits_at[index]
+        return combine_score(self.center[player], self.threes[player], self.threes[opp],
+                             self.twos[player], self.twos[opp], broken, split)
+
+def check_incremental_eval(samples: int = 2000, seed: int = 0) -> int:
+    """Compara EvalBoard com evaluate (varredura completa) ao longo de partidas aleatórias com
+    jogadas e desfeitas; devolve o número de divergências (esperado: 0)."""
+    rng = random.Random(seed)
+    eb = EvalBoard()
+    player = BOT
+    mismatches = 0
+    for _ in range(samples):
+        vm = eb.valid_moves()
+        if eb.history and (not vm or eb.is_winning(BOT) or eb.is_winning(OPP) or rng.random() < 0.3):
+            eb.undo()
+            player = OPP if player == BOT else BOT
+        else:
+            eb.play(rng.choice(vm), player)
+            player = OPP if player == BOT else BOT
+        plain = BitBoard.copy(eb)
+        for pov in (BOT, OPP):
+            if eb.evaluate(pov) != evaluate(plain, pov):
+                mismatches += 1
+        if EvalBoard.from_board(plain).evaluate(BOT) != eb.evaluate(BOT):
+            mismatches += 1
+    return mismatches
+
+# ---------- Tabela de transposição ----------
+# Chave da posição: peças do BOT + (ocupadas + fundo). Somar o fundo às ocupadas deixa um
+# único bit acima do topo de cada coluna, então a soma identifica a posição sem colisões.
+# Na chave da tabela entram também o ponto de vista e quem joga (o valor depende dos dois).
+TT_EXACT, TT_LOWER, TT_UPPER = 0, 1, 2
+TT_DEFAULT_ENTRIES = 1 << 17
+_HASH_MULT = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+def position_key(bb: BitBoard) -> int:
+    return bb.pieces[BOT] + bb.mask + BOTTOM_MASK
+
+def tt_key(bb: BitBoard, pov_player: int, maximizing: bool) -> int:
+    return (position_key(bb) << 2) | ((pov_player == BOT) << 1) | maximizing
+
+class TranspositionTable:
+    """Tabela de transposição limitada: max_entries entradas em baldes de 2 posições.
+
+    Cada balde tem uma posição "profundidade preferida" (só é trocada por busca igual ou mais
+    funda, ou pela mesma chave) e uma "sempre substitui" (fica com o resto). Entrada:
+    (chave, profundidade, valor, tipo do limite, melhor lance). Os valores dependem de
+    Weights: chame clear() ao trocar os pesos.
+    """
+    def __init__(self, max_entries: int = TT_DEFAULT_ENTRIES):
+        self.resize(max_entries)
+
+    def resize(self, max_entries: int) -> None:
+        """Realoca a tabela (apaga as entradas) p caber em max_entries."""
+        buckets = 1
+        while buckets * 4 <= max_entries:
+            buckets *= 2
+        self._shift = 64 - (buckets.bit_length() - 1)
+        self._deep: List[Optional[Tuple[int, int, float, int, Optional[int]]]] = [None] * buckets
+        self._recent: List[Optional[Tuple[int, int, float, int, Optional[int]]]] = [None] * buckets
+        self.clear_stats()
+
+    def clear(self) -> None:
+        self._deep = [None] * len(self._deep)
+        self._recent = [None] * len(self._recent)
+        self.clear_stats()
+
+    def clear_stats(self) -> None:
+        self.probes = 0
+        self.hits = 0
+        self.cutoffs = 0 # contado pelo minimax quando a entrada encerra o nó
+        self.stores = 0
+
+    def _index(self, key: int) -> int:
+        return ((key * _HASH_MULT) & _MASK64) >> self._shift if self._shift < 64 else 0
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, float, int, Optional[int]]]:
+        self.probes += 1
+        i = self._index(key)
+        for slot in (self._deep, self._recent):
+            entry = slot[i]
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry
+        return None
+
+    def store(self, key: int, depth: int, value: float, flag: int, move: Optional[int]) -> None:
+        self.stores += 1
+        i = self._index(key)
+        entry = (key, depth, value, flag, move)
+        deep = self._deep[i]
+        if deep is None or deep[0] == key or depth >= deep[1]:
+            if deep is not None and deep[0] != key:
+                self._recent[i] = deep # a entrada rasa desalojada ainda fica no outro lugar
+            self._deep[i] = entry
+        else:
+            self._recent[i] = entry
+
+    def __len__(self) -> int:
+        return sum(1 for slot in (self._deep, self._recent) for entry in slot if entry is not None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": 2 * len(self._deep),
+            "entries": len(self),
+            "probes": self.probes,
+            "hits": self.hits,
+            "cutoffs": self.cutoffs,
+            "stores": self.stores,
+            "hit_rate": round(self.hits / self.probes, 4) if self.probes else 0.0,
+        }
+
+DEFAULT_TT = TranspositionTable()
+
 # ---------- Minimax com poda e ordenação ----------
-def order_moves(board: List[List[int]], moves: List[int], player: int) -> List[int]:
+MAX_PLY = ROWS * COLS
+DEADLINE_CHECK_EVERY = 1024 # nós entre consultas ao relógio
+
+class SearchTimeout(Exception):
+    """Estourou o prazo de uma iteração do aprofundamento iterativo."""
+    pass
+
+class SearchContext:
+    """Estado de uma busca (aprofundamento iterativo): prazo, nós, killers, histórico e variação principal.
+
+    killers[ply]: os 2 últimos lances que cortaram naquele ply; history[jogador][coluna]:
+    soma de profundidade² dos cortes; pv: variação principal da iteração anterior (a ser
+    tentada primeiro); lines: variações montadas na iteração corrente.
+    """
+    __slots__ = ("deadline", "nodes", "root_ply", "killers", "history", "pv", "lines")
+
+    def __init__(self, root_ply: int = 0, deadline: Optional[float] = None):
+        self.deadline = deadline
+        self.nodes = 0
+        self.root_ply = root_ply
+        self.killers: List[List[Optional[int]]] = [[None, None] for _ in range(MAX_PLY + 1)]
+        self.history = [[0] * COLS for _ in range(3)]
+        self.pv: List[int] = []
+        self.lines: List[List[int]] = [[] for _ in range(MAX_PLY + 2)]
+
+    def record_cutoff(self, ply: int, player: int, col: int, depth: int) -> None:
+        killers = self.killers[ply]
+        if killers[0] != col:
+            killers[1] = killers[0]
+            killers[0] = col
+        self.history[player][col] += depth * depth
+
+def order_moves(board: Union[BitBoard, List[List[int]]], moves: List[int], player: int,
+                first: Optional[int] = None, killers: Sequence[Optional[int]] = (),
+                history: Optional[List[int]] = None) -> List[int]:
+    """Ordena os lances de `player`: `first` (lance da TT/PV), vitória imediata, bloqueio de
+    vitória do oponente, killers, histórico e, por fim, distância ao centro."""
+    bb = as_bitboard(board)
+    opp = OPP if player == BOT else BOT
+    own, other = bb.pieces[player], bb.pieces[opp]
     center = COLS // 2
-    return sorted(moves, key=lambda c: abs(c - center))
 
-def minimax(board: List[List[int]], depth: int, alpha: float, beta: float, maximizing: bool, pov_player: int) -> Tuple[float, Optional[int]]:
+    def key(c: int) -> Tuple[int, int, int]:
+        bit = 1 << bb.heights[c]
+        if c == first:
+            rank = 0
+        elif has_four(own | bit):
+            rank = 1
+        elif has_four(other | bit):
+            rank = 2
+        elif c in killers:
+            rank = 3
+        else:
+            rank = 4
+        return rank, -(history[c] if history else 0), abs(c - center)
+
+    return sorted(moves, key=key)
+
+def minimax(board: Union[BitBoard, List[List[int]]], depth: int, alpha: float, beta: float, maximizing: bool, pov_player: int,
+            tt: Optional[TranspositionTable] = None, ctx: Optional[SearchContext] = None) -> Tuple[float, Optional[int]]:
+    """Alfa-beta sobre o bitboard: cada filho é feito com play e desfeito com undo, sem cópias.
+
+    Com tt, consulta a tabela antes de expandir (encerra o nó se a entrada tiver profundidade
+    suficiente e o limite guardado bastar), tenta primeiro o melhor lance guardado e grava o
+    resultado com o tipo do limite (exato, inferior ou superior) em relação à janela original.
+    Com ctx, conta nós, respeita o prazo (SearchTimeout), ordena por PV/killers/histórico e
+    monta a variação principal em ctx.lines.
+    """
+    bb = as_bitboard(board)
     opp = OPP if pov_player == BOT else BOT
 
-    # Parada
-    if depth == 0 or is_winning(board, pov_player) or is_winning(board, opp) or not valid_moves(board):
-        return evaluate(board, pov_player), None
+    ply = 0
+    if ctx is not None:
+        ctx.nodes += 1
+        if ctx.deadline is not None and ctx.nodes % DEADLINE_CHECK_EVERY == 0 and time.perf_counter() > ctx.deadline:
+            raise SearchTimeout()
+        ply = len(bb.history) - ctx.root_ply
+        ctx.lines[ply] = []
 
-    moves = order_moves(board, valid_moves(board), pov_player if maximizing else opp)
+    # Parada
+    if depth == 0 or bb.is_winning(pov_player) or bb.is_winning(opp) or bb.is_full():
+        return evaluate(bb, pov_player), None
+
+    mover = pov_player if maximizing else opp
+    first = None
+    alpha_orig, beta_orig = alpha, beta
+    if tt is not None:
+        key = tt_key(bb, pov_player, maximizing)
+        entry = tt.probe(key)
+        if entry is not None:
+            _, entry_depth, entry_value, entry_flag, entry_move = entry
+            if entry_depth >= depth and (entry_flag == TT_EXACT
+                                         or (entry_flag == TT_LOWER and entry_value >= beta)
+                                         or (entry_flag == TT_UPPER and entry_value <= alpha)):
+                tt.cutoffs += 1
+                return entry_value, entry_move
+            first = entry_move # o melhor lance da busca anterior abre a ordenação
+    if ctx is None:
+        moves = order_moves(bb, bb.valid_moves(), mover, first)
+    else:
+        if first is None and ply < len(ctx.pv) and bb.history[ctx.root_ply:] == ctx.pv[:ply]:
+            first = ctx.pv[ply] # ainda na variação principal da iteração anterior
+        moves = order_moves(bb, bb.valid_moves(), mover, first, ctx.killers[ply], ctx.history[mover])
 
     best_move = None
     if maximizing:
         value = -math.inf
         for c in moves:
-            child = drop_piece(board, c, pov_player)
-            if child is None:
-                continue
-            child_val, _ = minimax(child, depth - 1, alpha, beta, False, pov_player)
+            bb.play(c, mover)
+            child_val, _ = minimax(bb, depth - 1, alpha, beta, False, pov_player, tt, ctx)
+            bb.undo()
             if child_val > value:
                 value, best_move = child_val, c
+                if ctx is not None:
+                    ctx.lines[ply] = [c] + ctx.lines[ply + 1]
             alpha = max(alpha, value)
             if alpha >= beta:
+                if ctx is not None:
+                    ctx.record_cutoff(ply, mover, c, depth)
                 break
-        return value, best_move
     else:
         value = math.inf
         for c in moves:
-            child = drop_piece(board, c, opp)
-            if child is None:
-                continue
-            child_val, _ = minimax(child, depth - 1, alpha, beta, True, pov_player)
+            bb.play(c, mover)
+            child_val, _ = minimax(bb, depth - 1, alpha, beta, True, pov_player, tt, ctx)
+            bb.undo()
             if child_val < value:
                 value, best_move = child_val, c
+                if ctx is not None:
+                    ctx.lines[ply] = [c] + ctx.lines[ply + 1]
             beta = min(beta, value)
             if alpha >= beta:
+                if ctx is not None:
+                    ctx.record_cutoff(ply, mover, c, depth)
                 break
-        return value, best_move
 
-def choose_move(board: List[List[int]], player: int = BOT, depth: int = 5) -> Tuple[int, float]:
-    value, move = minimax(board, depth, -math.inf, math.inf, True, player)
+    if tt is not None:
+        if value <= alpha_orig:
+            flag = TT_UPPER
+        elif value >= beta_orig:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+        tt.store(key, depth, value, flag, best_move)
+    return value, best_move
+
+def choose_move(board: Union[BitBoard, List[List[int]]], player: int = BOT, depth: Optional[int] = 5,
+                tt: Optional[TranspositionTable] = DEFAULT_TT, time_limit: Optional[float] = None,
+                info: Optional[Dict[str, Any]] = None, book: Optional[Any] = None) -> Tuple[int, float]:
+    """Melhor coluna p `player`, por aprofundamento iterativo (profundidade 1, 2, ... até `depth`).
+
+    Com time_limit (segundos), a iteração que estourar o prazo é descartada e vale o lance
+    da última profundidade completa (a profundidade 1 sempre termina). depth=None aprofunda
+    até o tabuleiro encher, então só faz sentido com time_limit. tt=None desliga a tabela de
+    transposição (DEFAULT_TT é compartilhada entre jogadas). Se `info` for um dict, recebe
+    depth (última completa), nodes, seconds e pv. Com `book` (opening_book.PositionBook), a
+    posição é procurada no livro antes e a busca só roda se não estiver lá.
+    """
+    start = time.perf_counter()
+    if book is not None:
+        hit = book.probe(board, player)
+        if hit is not None:
+            if info is not None:
+                info.update(depth=0, nodes=0, seconds=time.perf_counter() - start, pv=[hit[0]], book=True)
+            return hit
+    bb = EvalBoard.from_board(board) # a busca mexe no tabuleiro (com avaliação incremental); o do chamador fica intacto
+    empty = ROWS * COLS - len(bb)
+    max_depth = empty if depth is None else min(depth, empty)
+    ctx = SearchContext(root_ply=len(bb.history))
+    value, move, completed = evaluate(bb, player), None, 0
+    for d in range(1, max(max_depth, 1) + 1):
+        if time_limit is not None and d > 1:
+            ctx.deadline = start + time_limit
+        try:
+            value, move = minimax(bb, d, -math.inf, math.inf, True, player, tt, ctx)
+        except SearchTimeout:
+            break
+        completed = d
+        ctx.pv = ctx.lines[0]
+        if move is None:
+            break # posição terminal
+    if info is not None:
+        info.update(depth=completed, nodes=ctx.nodes, seconds=time.perf_counter() - start, pv=list(ctx.pv))
     if move is None:
-        vm = valid_moves(board)
+        vm = bb.valid_moves()
         return (random.choice(vm) if vm else -1), value
     return move, value
 
 # ---------- Visualização e loop de jogo ----------
-def print_board(board: List[List[int]]) -> None:
+def print_board(board: Union[BitBoard, List[List[int]]]) -> None:
+    if isinstance(board, BitBoard):
+        board = board.to_grid()
     symbols = {EMPTY: ".", BOT: "X", OPP: "O"}
     print("\n 0 1 2 3 4 5 6")
     for r in range(ROWS):
         print(" " + " ".join(symbols[board[r][c]] for c in range(COLS)))
     print()
 
-def play(depth: int = 5, human_plays_as: int = OPP) -> None:
+def play(depth: Optional[int] = None, human_plays_as: int = OPP, time_limit: Optional[float] = 2.0,
+         workers: Optional[int] = None) -> None:
     """
     human_plays_as: OPP (padrão, 'O') ou BOT ('X') caso queira começar.
-    depth: profundidade do minimax do bot.
+    depth: profundidade máxima do minimax do bot (None = sem limite, só o tempo).
+    time_limit: segundos por jogada do bot (None = busca até `depth`, sem prazo).
+    workers: com 2 ou mais, o bot divide a raiz entre processos (parallel_search).
     """
-    board = new_board()
+    from opening_book import open_default_book
+    book = open_default_book() # None se o livro não foi gerado
+    search = None
+    if workers is not None and workers > 1:
+        from parallel_search import ParallelSearch
+        search = ParallelSearch(workers)
+    try:
+        _play_loop(depth, human_plays_as, time_limit, search, book)
+    finally:
+        if search is not None:
+            search.close()
+        if book is not None:
+            book.close()
+
+def _play_loop(depth: Optional[int], human_plays_as: int, time_limit: Optional[float], search, book) -> None:
+    board = BitBoard()
     print_board(board)
 
     human = human_plays_as
@@ -271,7 +846,7 @@ def play(depth: int = 5, human_plays_as: int = OPP) -> None:
 
     while True:
         if turn == human:
-            vm = valid_moves(board)
+            vm = board.valid_moves()
             if not vm:
                 print("Empate!")
                 break
@@ -281,39 +856,54 @@ def play(depth: int = 5, human_plays_as: int = OPP) -> None:
                     move = int(input(f"Sua vez ({'X' if human==BOT else 'O'})! Colunas válidas {vm}: "))
                 except ValueError:
                     move = None
-            next_board = drop_piece(board, move, human)
-            if next_board is None:
-                print("Coluna inválida. Tente novamente.")
-                continue
-            board = next_board
-            if is_winning(board, human):
+            board.play(move, human)
+            if board.is_winning(human):
                 print_board(board)
                 print("Você venceu!")
                 break
         else:
-            vm = valid_moves(board)
+            vm = board.valid_moves()
             if not vm:
                 print("Empate!")
                 break
-            col, val = choose_move(board, player=bot, depth=depth)
-            board = drop_piece(board, col, bot)
-            print(f"Bot ({'X' if bot==BOT else 'O'}) jogou na coluna {col} (valor={val:.1f})")
-            if is_winning(board, bot):
+            info: Dict[str, Any] = {}
+            if search is None:
+                col, val = choose_move(board, player=bot, depth=depth, time_limit=time_limit, info=info, book=book)
+            else:
+                col, val = search.choose_move(board, player=bot, depth=depth, time_limit=time_limit, info=info, book=book)
+            board.play(col, bot)
+            print(f"Bot ({'X' if bot==BOT else 'O'}) jogou na coluna {col} (valor={val:.1f}, "
+                  f"profundidade {info['depth']}, {info['nodes']} nós em {info['seconds']:.2f}s)")
+            if board.is_winning(bot):
                 print_board(board)
                 print("Bot venceu!")
                 break
 
         print_board(board)
-        if not valid_moves(board):
+        if not board.valid_moves():
             print("Empate!")
             break
         turn = BOT if turn == OPP else OPP
 
 # ---------- Execução direta ----------
 if __name__ == "__main__":
+    import sys
+    if sys.argv[1:2] == ["--check-eval"]:
+        # python ligue_4.py --check-eval [amostras]: confere EvalBoard contra evaluate
+        samples = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+        mismatches = check_incremental_eval(samples)
+        print(f"{samples} posições, {mismatches} divergências")
+        sys.exit(1 if mismatches else 0)
+
     # Opções rápidas:
-    # 1) Humano começa como OPP (O) e bot com profundidade 5
-    play(depth=2, human_plays_as=OPP)
+    # 1) Humano começa como OPP (O) e bot com 2 segundos por jogada
+    play(human_plays_as=OPP, time_limit=2.0)
 
     # 2) Se quiser começar como BOT (X), use:
-    # play(depth=5, human_plays_as=BOT)
+    # play(human_plays_as=BOT, time_limit=2.0)
+
+    # 3) Raiz dividida entre 4 processos:
+    # play(human_plays_as=OPP, time_limit=2.0, workers=4)
+
+    # 4) Profundidade fixa, sem prazo:
+    # play(depth=5, human_plays_as=OPP, time_limit=None)
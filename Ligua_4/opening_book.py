@@ -0,0 +1,330 @@
+# Python 3
+"""Livro de aberturas e cache de posições resolvidas do Ligue 4, num arquivo indexado por chave.
+
+O construtor percorre todas as posições até --ply jogadas a partir do tabuleiro vazio e
+guarda o lance de uma busca funda (choose_move) p cada uma. Depois joga cada posição do
+livro até o fim com o próprio bot e, nas posições com até --solve-empty casas vazias, roda
+um resolvedor exato (vitória/empate/derrota p quem joga), guardando o resultado provado.
+
+Chave: peças de quem joga + ocupadas + fundo (não depende da cor), na menor entre a posição e
+o seu espelho (o tabuleiro é simétrico); o lance é guardado na orientação da chave.
+
+Formato (little-endian): magic "L4OB", versão (uint8), quantidade (uint32) e os registros
+ordenados por chave, de RECORD.size bytes: chave (uint64), lance (int8), resultado (int8:
+1/0/-1 provado, BOOK_MOVE se só veio da busca), profundidade (uint8), valor (float32).
+A leitura usa mmap e busca binária: nada é carregado de uma vez.
+
+Uso:
+    python opening_book.py build --ply 4 --depth 8 --solve-empty 12 --output ligue_4.book
+    python opening_book.py info ligue_4.book
+"""
+import os
+import sys
+import json
+import mmap
+import time
+import struct
+import argparse
+from typing import Dict, Tuple, Optional, Iterator, Union, List, NamedTuple
+
+from ligue_4 import (BOT, OPP, ROWS, COLS, H1, BOTTOM_MASK, BitBoard, Weights, TranspositionTable, as_bitboard,
+                     choose_move, has_four, order_moves)
+
+BOOK_MAGIC = b"L4OB"
+BOOK_VERSION = 1
+HEADER = struct.Struct("<4sBI")
+RECORD = struct.Struct("<QbbBf")
+KEY = struct.Struct("<Q")
+BOOK_MOVE = 2 # resultado: lance de livro sem prova
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ligue_4.book")
+
+_COLUMN_BITS = (1 << H1) - 1
+
+
+class BookEntry(NamedTuple):
+    move: int
+    result: int
+    depth: int
+    value: float
+
+
+# --- Chaves ---
+def mirror_key(key: int) -> int:
+    """Espelha uma chave (ou máscara de bits) trocando a coluna c pela COLS-1-c."""
+    out = 0
+    for c in range(COLS):
+        out |= ((key >> (c * H1)) & _COLUMN_BITS) << ((COLS - 1 - c) * H1)
+    return out
+
+def book_key(board: Union[BitBoard, List[List[int]]], player: int) -> Tuple[int, bool]:
+    """(chave canônica, espelhada?) da posição com `player` a jogar."""
+    bb = as_bitboard(board)
+    key = bb.pieces[player] + bb.mask + BOTTOM_MASK
+    mirrored = mirror_key(key)
+    return (mirrored, True) if mirrored < key else (key, False)
+
+
+# --- Resolvedor exato ---
+class SolveAborted(Exception):
+    """O resolvedor passou do limite de nós."""
+    pass
+
+def _negamax(bb: BitBoard, player: int, alpha: int, beta: int, cache: Dict[int, Tuple[int, int]], budget: List[int]) -> int:
+    budget[0] -= 1
+    if budget[0] < 0:
+        raise SolveAborted()
+    moves = bb.valid_moves()
+    if not moves:
+        return 0
+    own = bb.pieces[player]
+    for c in moves:
+        if has_four(own | (1 << bb.heights[c])):
+            return 1
+    # limites já provados p esta posição (mesma chave do livro, sem espelhar)
+    key = own + bb.mask + BOTTOM_MASK
+    lower, upper = cache.get(key, (-1, 1))
+    if lower >= beta:
+        return lower
+    if upper <= alpha:
+        return upper
+    alpha, beta = max(alpha, lower), min(beta, upper)
+    alpha_orig = alpha
+
+    opp = OPP if player == BOT else BOT
+    value = -1
+    for c in order_moves(bb, moves, player):
+        bb.play(c, player)
+        child = -_negamax(bb, opp, -beta, -alpha, cache, budget)
+        bb.undo()
+        if child > value:
+            value = child
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+    if value <= alpha_orig:
+        cache[key] = (lower, value)
+    elif value >= beta:
+        cache[key] = (value, upper)
+    else:
+        cache[key] = (value, value)
+    return value
+
+def solve(board: Union[BitBoard, List[List[int]]], player: int, max_nodes: int = 2_000_000,
+          cache: Optional[Dict[int, Tuple[int, int]]] = None) -> Tuple[int, int]:
+    """Resultado exato com `player` a jogar (1 vitória, 0 empate, -1 derrota) e um lance que o garante.
+
+    Independe de Weights. SolveAborted se passar de max_nodes nós; cache (chave -> limites
+    inferior/superior) pode ser reaproveitado entre chamadas.
+    """
+    bb = BitBoard.copy(as_bitboard(board))
+    cache = {} if cache is None else cache
+    budget = [max_nodes]
+    opp = OPP if player == BOT else BOT
+    moves = order_moves(bb, bb.valid_moves(), player)
+    if not moves:
+        raise ValueError("posição sem lances")
+    best_value, best_move = -2, moves[0]
+    for c in moves:
+        bb.play(c, player)
+        value = 1 if bb.is_winning(player) else -_negamax(bb, opp, -1, -max(best_value, -1), cache, budget)
+        bb.undo()
+        if value > best_value:
+            best_value, best_move = value, c
+            if best_value == 1:
+                break
+    return best_value, best_move
+
+
+# --- Arquivo ---
+def write_book(path: str, entries: Dict[int, BookEntry]) -> None:
+    """Grava as entradas (chave canônica -> BookEntry) ordenadas por chave."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(BOOK_MAGIC, BOOK_VERSION, len(entries)))
+        for key in sorted(entries):
+            entry = entries[key]
+            f.write(RECORD.pack(key, entry.move, entry.result, min(entry.depth, 255), entry.value))
+    os.replace(tmp_path, path) # leitores com o arquivo antigo aberto continuam válidos
+
+class PositionBook:
+    """Leitor do livro via mmap; probe é o gancho que choose_move consulta antes do minimax."""
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError: # arquivo vazio
+            self._file.close()
+            raise ValueError(f"livro inválido: {path}")
+        magic, version, count = HEADER.unpack_from(self._mm, 0)
+        if magic != BOOK_MAGIC:
+            self.close()
+            raise ValueError(f"livro inválido: {path}")
+        if version != BOOK_VERSION:
+            self.close()
+            raise ValueError(f"versão de livro não suportada: {version}")
+        self._count = count
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _find(self, key: int) -> Optional[BookEntry]:
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = HEADER.size + mid * RECORD.size
+            (mid_key,) = KEY.unpack_from(self._mm, offset)
+            if mid_key < key:
+                lo = mid + 1
+            elif mid_key > key:
+                hi = mid
+            else:
+                _, move, result, depth, value = RECORD.unpack_from(self._mm, offset)
+                return BookEntry(move, result, depth, value)
+        return None
+
+    def lookup(self, board: Union[BitBoard, List[List[int]]], player: int) -> Optional[BookEntry]:
+        """Entrada da posição com `player` a jogar (lance já na orientação do tabuleiro) ou None."""
+        key, mirrored = book_key(board, player)
+        entry = self._find(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry._replace(move=COLS - 1 - entry.move) if mirrored else entry
+
+    def probe(self, board: Union[BitBoard, List[List[int]]], player: int) -> Optional[Tuple[int, float]]:
+        """(coluna, valor) no contrato de choose_move; resultados provados valem WIN/LOSE/0."""
+        entry = self.lookup(board, player)
+        if entry is None:
+            return None
+        if entry.result == 1:
+            return entry.move, Weights.WIN
+        if entry.result == -1:
+            return entry.move, Weights.LOSE
+        if entry.result == 0:
+            return entry.move, 0.0
+        return entry.move, entry.value
+
+    def entries(self) -> Iterator[Tuple[int, BookEntry]]:
+        for i in range(self._count):
+            key, move, result, depth, value = RECORD.unpack_from(self._mm, HEADER.size + i * RECORD.size)
+            yield key, BookEntry(move, result, depth, value)
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def open_default_book() -> Optional[PositionBook]:
+    """O livro em DEFAULT_BOOK_PATH, se existir."""
+    return PositionBook(DEFAULT_BOOK_PATH) if os.path.exists(DEFAULT_BOOK_PATH) else None
+
+
+# --- Construção ---
+def _canonical(board: BitBoard, player: int, move: int) -> Tuple[int, int]:
+    key, mirrored = book_key(board, player)
+    return key, (COLS - 1 - move) if mirrored else move
+
+def book_positions(ply: int) -> Iterator[Tuple[BitBoard, int]]:
+    """Posições distintas (a menos de espelho e cor) com menos de `ply` jogadas e o jogador da vez."""
+    seen = set()
+    frontier = [(BitBoard(), BOT)]
+    for _ in range(ply):
+        next_frontier = []
+        for bb, player in frontier:
+            key, _ = book_key(bb, player)
+            if key in seen:
+                continue
+            seen.add(key)
+            yield bb, player
+            opp = OPP if player == BOT else BOT
+            for c in bb.valid_moves():
+                child = bb.copy()
+                child.play(c, player)
+                if not child.is_winning(player):
+                    next_frontier.append((child, opp))
+        frontier = next_frontier
+
+def build_book(ply: int, depth: Optional[int] = 8, time_limit: Optional[float] = None, solve_empty: int = 12,
+               solve_nodes: int = 2_000_000, entries: Optional[Dict[int, BookEntry]] = None,
+               progress=None) -> Dict[int, BookEntry]:
+    """Monta (ou completa) as entradas do livro: lances de busca até `ply` e finais resolvidos."""
+    entries = {} if entries is None else entries
+    tt = TranspositionTable()
+    cache: Dict[int, Tuple[int, int]] = {}
+    book = list(book_positions(ply))
+    for index, (bb, player) in enumerate(book):
+        key, _ = book_key(bb, player)
+        existing = entries.get(key)
+        if existing is None or (existing.result == BOOK_MOVE and existing.depth < (depth or 0)):
+            move, value = choose_move(bb, player, depth, tt, time_limit)
+            _, stored_move = _canonical(bb, player, move)
+            entries[key] = BookEntry(stored_move, BOOK_MOVE, depth or 0, value)
+
+        # continua a partida com o bot e resolve as posições do final
+        game, turn = bb.copy(), player
+        while game.valid_moves() and not game.is_winning(BOT) and not game.is_winning(OPP):
+            empty = ROWS * COLS - len(game)
+            if empty <= solve_empty:
+                game_key, _ = book_key(game, turn)
+                if game_key not in entries or entries[game_key].result == BOOK_MOVE:
+                    try:
+                        result, move = solve(game, turn, solve_nodes, cache)
+                    except SolveAborted:
+                        result = None
+                    if result is not None:
+                        _, stored_move = _canonical(game, turn, move)
+                        entries[game_key] = BookEntry(stored_move, result, empty, float(result))
+            move, _ = choose_move(game, turn, min(depth or 4, 4), tt)
+            game.play(move, turn)
+            turn = OPP if turn == BOT else BOT
+        if progress is not None:
+            progress(index + 1, len(book), len(entries))
+    return entries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Livro de aberturas e finais resolvidos do Ligue 4.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="monta (ou completa) o livro")
+    build.add_argument("--ply", type=int, default=4, help="posições com menos de PLY jogadas entram no livro")
+    build.add_argument("--depth", type=int, default=8, help="profundidade da busca de cada posição do livro")
+    build.add_argument("--time", type=float, default=None, help="limite de tempo por posição (segundos)")
+    build.add_argument("--solve-empty", type=int, default=12, help="resolve finais com até N casas vazias")
+    build.add_argument("--solve-nodes", type=int, default=2_000_000, help="limite de nós por final resolvido")
+    build.add_argument("--output", default=DEFAULT_BOOK_PATH)
+    build.add_argument("--merge", action="store_true", help="mantém as entradas do arquivo existente")
+    info = sub.add_parser("info", help="resumo de um livro")
+    info.add_argument("path", nargs="?", default=DEFAULT_BOOK_PATH)
+    args = parser.parse_args()
+
+    if args.command == "info":
+        with PositionBook(args.path) as book:
+            results = {"book": 0, "win": 0, "draw": 0, "loss": 0}
+            names = {BOOK_MOVE: "book", 1: "win", 0: "draw", -1: "loss"}
+            for _, entry in book.entries():
+                results[names[entry.result]] += 1
+            print(json.dumps({"path": args.path, "entries": len(book), "bytes": os.path.getsize(args.path),
+                              "results": results}, indent=2))
+        sys.exit(0)
+
+    entries: Dict[int, BookEntry] = {}
+    if args.merge and os.path.exists(args.output):
+        with PositionBook(args.output) as book:
+            entries = dict(book.entries())
+
+    start_time = time.time()
+    def progress(done: int, total: int, count: int) -> None:
+        print(f"[{done}/{total}] {count} entradas, {time.time() - start_time:.1f}s", file=sys.stderr)
+
+    entries = build_book(args.ply, args.depth, args.time, args.solve_empty, args.solve_nodes, entries, progress)
+    write_book(args.output, entries)
+    print(json.dumps({"output": args.output, "entries": len(entries), "seconds": round(time.time() - start_time, 2)}))
@@ -0,0 +1,216 @@
+# Python 3
+"""Busca paralela na raiz p o bot de Ligue 4.
+
+Os lances da raiz são divididos entre processos (ProcessPoolExecutor), em aprofundamento
+iterativo como em choose_move. Em cada profundidade, o primeiro lance da ordenação (o da
+variação principal anterior) é buscado no processo principal p fixar um alfa; os demais
+vão p os processos. O melhor alfa já conhecido fica num multiprocessing.Value
+compartilhado: cada tarefa o atualiza ao terminar e o relê antes de cada resposta do
+oponente ao seu lance, então um lance resolvido num processo estreita a janela dos que
+ainda estão rodando nos outros. Cada processo mantém a sua própria tabela de transposição
+entre tarefas.
+
+O prazo vai p os processos como horário absoluto (time.time()): tarefas que só começam
+depois dele são puladas, e o primeiro estouro cancela as que ainda estão na fila.
+
+Os processos leem Weights quando são criados: troque os pesos antes de abrir o pool.
+
+Uso:
+    with ParallelSearch(workers=4) as search:
+        col, value = search.choose_move(board, player=BOT, time_limit=2.0)
+"""
+import os
+import math
+import time
+import random
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+from typing import List, Tuple, Dict, Any, Optional, Union
+
+from ligue_4 import (BOT, OPP, ROWS, COLS, TT_DEFAULT_ENTRIES, BitBoard, EvalBoard, SearchContext, SearchTimeout,
+                     TranspositionTable, as_bitboard, evaluate, minimax, order_moves)
+
+PARALLEL_MIN_DEPTH = 4 # abaixo disso a busca é tão curta que não compensa mandar p os processos
+
+# estado de cada processo do pool (preenchido por _init_worker)
+_shared_alpha = None
+_worker_tt: Optional[TranspositionTable] = None
+
+
+def _init_worker(shared_alpha, tt_entries: int) -> None:
+    global _shared_alpha, _worker_tt
+    _shared_alpha = shared_alpha
+    _worker_tt = TranspositionTable(tt_entries)
+
+
+def _raise_alpha(shared_alpha, value: float) -> None:
+    with shared_alpha.get_lock():
+        if value > shared_alpha.value:
+            shared_alpha.value = value
+
+
+def _search_root_move(board: EvalBoard, col: int, player: int, depth: int, tt: Optional[TranspositionTable],
+                      alpha: float, deadline: Optional[float]) -> Tuple[float, int]:
+    """Valor do lance `col` da raiz (janela alpha..inf) e nós visitados; SearchTimeout no prazo."""
+    ctx = SearchContext(root_ply=len(board.history), deadline=deadline)
+    board.play(col, player)
+    try:
+        value, _ = minimax(board, depth - 1, alpha, math.inf, False, player, tt, ctx)
+    finally:
+        board.undo()
+    return value, ctx.nodes
+
+
+def _search_root_move_shared(board: EvalBoard, col: int, player: int, depth: int, tt: Optional[TranspositionTable],
+                             shared_alpha, deadline: Optional[float]) -> Tuple[float, float, int]:
+    """Como _search_root_move, mas o nó de resposta do oponente é feito aqui: antes de cada
+    resposta o alfa compartilhado é relido, e a janela sobe junto com o dos outros processos.
+
+    Devolve (valor, alfa usado no fim, nós); valor <= alfa usado é só um limite superior.
+    """
+    ctx = SearchContext(root_ply=len(board.history), deadline=deadline)
+    opp = OPP if player == BOT else BOT
+    alpha = shared_alpha.value
+    board.play(col, player)
+    try:
+        ctx.nodes += 1
+        if depth == 1 or board.is_winning(player) or board.is_full():
+            return evaluate(board, player), alpha, ctx.nodes
+        value = math.inf
+        for reply in order_moves(board, board.valid_moves(), opp):
+            alpha = max(alpha, shared_alpha.value)
+            if value <= alpha:
+                break # o lance já não supera o melhor conhecido
+            board.play(reply, opp)
+            try:
+                child_value, _ = minimax(board, depth - 2, alpha, value, True, player, tt, ctx)
+            finally:
+                board.undo()
+            value = min(value, child_value)
+    finally:
+        board.undo()
+    return value, alpha, ctx.nodes
+
+def _worker_task(pieces: List[int], heights: List[int], history: List[int], col: int, player: int, depth: int,
+                 wall_deadline: Optional[float]) -> Tuple[int, Optional[float], float, int]:
+    """Tarefa de um processo: (coluna, valor ou None se estourou o prazo, alfa usado, nós).
+
+    Valor <= alfa usado é só um limite superior (o lance não supera o melhor já conhecido).
+    """
+    alpha = _shared_alpha.value
+    deadline = None
+    if wall_deadline is not None:
+        # o prazo chega em time.time() (comum aos processos) e vira perf_counter local
+        remaining = wall_deadline - time.time()
+        if remaining <= 0:
+            return col, None, alpha, 0 # ficou na fila além do prazo
+        deadline = time.perf_counter() + remaining
+    bb = BitBoard()
+    bb.pieces, bb.heights, bb.history = pieces, heights, history
+    try:
+        value, alpha, nodes = _search_root_move_shared(EvalBoard.from_board(bb), col, player, depth, _worker_tt,
+                                                       _shared_alpha, deadline)
+    except SearchTimeout:
+        return col, None, alpha, 0
+    _raise_alpha(_shared_alpha, value)
+    return col, value, alpha, nodes
+
+
+class ParallelSearch:
+    """Pool de processos reaproveitado entre jogadas; workers=None usa todos os núcleos."""
+    def __init__(self, workers: Optional[int] = None, tt_entries: int = TT_DEFAULT_ENTRIES):
+        self.workers = workers or os.cpu_count() or 1
+        self._alpha = multiprocessing.Value("d", -math.inf)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                         initargs=(self._alpha, tt_entries))
+        self.tt = TranspositionTable(tt_entries) # do processo principal (lance da PV)
+
+    def _search_depth(self, eb: EvalBoard, moves: List[int], player: int, depth: int,
+                      deadline: Optional[float]) -> Tuple[float, int, int]:
+        """Uma profundidade completa: (valor, lance, nós); SearchTimeout se alguma parte estourar o prazo."""
+        first, rest = moves[0], moves[1:]
+        best_value, nodes = _search_root_move(eb, first, player, depth, self.tt, -math.inf, deadline)
+        best_move = first
+        if not rest:
+            return best_value, best_move, nodes
+        if depth < PARALLEL_MIN_DEPTH:
+            for col in rest:
+                value, move_nodes = _search_root_move(eb, col, player, depth, self.tt, best_value, deadline)
+                nodes += move_nodes
+                if value > best_value:
+                    best_value, best_move = value, col
+            return best_value, best_move, nodes
+        self._alpha.value = best_value
+        wall_deadline = None if deadline is None else time.time() + (deadline - time.perf_counter())
+        futures = [self._pool.submit(_worker_task, eb.pieces, eb.heights, eb.history, col, player, depth, wall_deadline)
+                   for col in rest]
+        timed_out = False
+        for future in futures: # na ordem dos lances: empates ficam com o primeiro, como em minimax
+            try:
+                col, value, alpha, worker_nodes = future.result()
+            except CancelledError:
+                continue
+            nodes += worker_nodes
+            if value is None:
+                if not timed_out:
+                    timed_out = True
+                    for pending in futures:
+                        pending.cancel() # só as que ainda não começaram; as outras param no prazo
+            elif value > alpha and value > best_value: # só valores exatos disputam
+                best_value, best_move = value, col
+        if timed_out:
+            raise SearchTimeout()
+        return best_value, best_move, nodes
+
+    def choose_move(self, board: Union[BitBoard, List[List[int]]], player: int = BOT, depth: Optional[int] = 5,
+                    time_limit: Optional[float] = None, info: Optional[Dict[str, Any]] = None,
+                    book: Optional[Any] = None) -> Tuple[int, float]:
+        """Mesmo contrato de ligue_4.choose_move: (coluna, valor) da última profundidade completa."""
+        start = time.perf_counter()
+        if book is not None:
+            hit = book.probe(board, player)
+            if hit is not None:
+                if info is not None:
+                    info.update(depth=0, nodes=0, seconds=time.perf_counter() - start, workers=self.workers, book=True)
+                return hit
+        eb = EvalBoard.from_board(as_bitboard(board))
+        opp = OPP if player == BOT else BOT
+        moves = eb.valid_moves()
+        if not moves or eb.is_winning(player) or eb.is_winning(opp):
+            if info is not None:
+                info.update(depth=0, nodes=0, seconds=time.perf_counter() - start, workers=self.workers)
+            return (random.choice(moves) if moves else -1), evaluate(eb, player)
+
+        empty = ROWS * COLS - len(eb)
+        max_depth = empty if depth is None else min(depth, empty)
+        value, move, completed, nodes = evaluate(eb, player), None, 0, 0
+        moves = order_moves(eb, moves, player)
+        for d in range(1, max(max_depth, 1) + 1):
+            deadline = start + time_limit if time_limit is not None and d > 1 else None
+            try:
+                d_value, d_move, d_nodes = self._search_depth(eb, moves, player, d, deadline)
+            except SearchTimeout:
+                break
+            nodes += d_nodes
+            value, move, completed = d_value, d_move, d
+            moves.remove(move)
+            moves.insert(0, move) # o melhor lance abre a próxima profundidade
+        if info is not None:
+            info.update(depth=completed, nodes=nodes, seconds=time.perf_counter() - start, workers=self.workers)
+        return move, value
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def choose_move_parallel(board: Union[BitBoard, List[List[int]]], player: int = BOT, depth: Optional[int] = 5,
+                         workers: Optional[int] = None, time_limit: Optional[float] = None) -> Tuple[int, float]:
+    """Atalho p uma jogada só (abre e fecha o pool); em partidas, reaproveite um ParallelSearch."""
+    with ParallelSearch(workers) as search:
+        return search.choose_move(board, player, depth, time_limit)
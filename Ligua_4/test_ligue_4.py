@@ -0,0 +1,72 @@
+# Python 3
+"""Testes da avaliação incremental (EvalBoard) contra a varredura completa (evaluate) e a original (evaluate_grid).
+
+Uso:
+    python -m pytest Ligua_4/test_ligue_4.py
+"""
+import random
+
+import pytest
+
+from ligue_4 import BOT, OPP, BitBoard, EvalBoard, evaluate, evaluate_grid, get_weights, set_weights
+import ligue_4_eu
+
+# pesos padrão e um conjunto não inteiro (o de ligue_4_eu.py, como em tournament.py)
+EU_WEIGHTS = {"CENTER": 1e-6, "TWO_OPEN": ligue_4_eu.peso_2_pontos, "THREE_OPEN": ligue_4_eu.peso_3_pontos,
+              "BROKEN_THREE": ligue_4_eu.peso_3_pontos_quebrados, "TWO_SPACE_TWO": ligue_4_eu.peso_4_pontos_quebrados,
+              "WIN": ligue_4_eu.peso_4_pontos, "LOSE": -ligue_4_eu.peso_4_pontos}
+WEIGHT_SETS = {"default": None, "eu": EU_WEIGHTS}
+
+
+@pytest.fixture(params=sorted(WEIGHT_SETS))
+def weights(request):
+    saved = get_weights()
+    if WEIGHT_SETS[request.param] is not None:
+        set_weights(WEIGHT_SETS[request.param])
+    yield request.param
+    set_weights(saved)
+
+
+def random_walk(seed: int, steps: int):
+    """EvalBoard depois de cada passo de uma sequência aleatória de jogadas e desfeitas."""
+    rng = random.Random(seed)
+    eb, player = EvalBoard(), BOT
+    for _ in range(steps):
+        moves = eb.valid_moves()
+        if eb.history and (not moves or eb.is_winning(BOT) or eb.is_winning(OPP) or rng.random() < 0.3):
+            eb.undo()
+        else:
+            eb.play(rng.choice(moves), player)
+        player = OPP if player == BOT else BOT
+        yield eb
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_matches_full_evaluate(weights, seed):
+    for eb in random_walk(seed, 400):
+        plain = BitBoard.copy(eb)
+        for pov in (BOT, OPP):
+            assert eb.evaluate(pov) == evaluate(plain, pov)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_bitboard_matches_grid_evaluate(weights, seed):
+    # evaluate_grid (a versão original) soma os pesos janela a janela: com pesos não inteiros
+    # a ordem das somas muda o arredondamento
+    for eb in random_walk(seed, 200):
+        grid = eb.to_grid()
+        for pov in (BOT, OPP):
+            expected = evaluate_grid(grid, pov)
+            if weights == "default":
+                assert evaluate(BitBoard.copy(eb), pov) == expected
+            else:
+                assert evaluate(BitBoard.copy(eb), pov) == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+
+def test_play_undo_restores_counts(weights):
+    for eb in random_walk(7, 150):
+        before = (eb.evaluate(BOT), eb.evaluate(OPP), eb.threes[:], eb.twos[:], eb.wins[:], eb.center[:])
+        for col in eb.valid_moves():
+            eb.play(col, BOT)
+            eb.undo()
+            assert (eb.evaluate(BOT), eb.evaluate(OPP), eb.threes[:], eb.twos[:], eb.wins[:], eb.center[:]) == before
@@ -0,0 +1,247 @@
+# Python 3
+"""Torneio de autojogo (sem interação) entre configurações do bot de Ligue 4.
+
+Cada motor é um nome + profundidade, tempo por jogada e conjunto de pesos. Todos os pares
+jogam --games partidas a partir de aberturas aleatórias (--opening-plies lances sorteados,
+com semente); cada abertura é jogada duas vezes, trocando quem começa. As partidas são
+distribuídas num pool de processos e cada motor usa a sua própria tabela de transposição.
+
+O relatório traz, por par, vitórias/empates/derrotas, taxa de vitória com intervalo de
+Wilson e pontuação média (empate = 0,5) com intervalo normal; e, por motor, nós/segundo,
+latência média por jogada e profundidade alcançada.
+
+Conjuntos de pesos: "default" (Weights), "alt" (a alternativa comentada em Weights),
+"eu" (o rascunho de ligue_4_eu.py) ou o caminho de um JSON de pesos (tune_weights.py fit).
+
+Uso:
+    python tournament.py --engine base:depth=4 --engine eu:depth=4,weights=eu --games 20
+    python tournament.py --engine d6:depth=6 --engine t05:time=0.5 --games 40 --workers 4 --output torneio.json
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+from itertools import combinations
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, NamedTuple
+
+from ligue_4 import BOT, OPP, BitBoard, TranspositionTable, choose_move, get_weights, set_weights
+import ligue_4_eu
+
+WEIGHT_SETS: Dict[str, Dict[str, float]] = {
+    "default": get_weights(),
+    "alt": {"CENTER": 1e-6, "TWO_OPEN": 0.019, "THREE_OPEN": 0.16, "BROKEN_THREE": 0.16, "TWO_SPACE_TWO": 0.16,
+            "WIN": 1, "LOSE": -1},
+    # ligue_4_eu.py não tem peso de centro: fica o da alternativa
+    "eu": {"CENTER": 1e-6, "TWO_OPEN": ligue_4_eu.peso_2_pontos, "THREE_OPEN": ligue_4_eu.peso_3_pontos,
+           "BROKEN_THREE": ligue_4_eu.peso_3_pontos_quebrados, "TWO_SPACE_TWO": ligue_4_eu.peso_4_pontos_quebrados,
+           "WIN": ligue_4_eu.peso_4_pontos, "LOSE": -ligue_4_eu.peso_4_pontos},
+}
+
+Z_95 = 1.959964
+
+
+def load_weight_set(name: str) -> Dict[str, float]:
+    """Um conjunto de WEIGHT_SETS ou um JSON de pesos (como o de tune_weights.py fit)."""
+    if name in WEIGHT_SETS:
+        return WEIGHT_SETS[name]
+    with open(name, encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("weights", data)
+
+
+class EngineConfig(NamedTuple):
+    name: str
+    depth: Optional[int] = 4
+    time_limit: Optional[float] = None
+    weights: str = "default"
+
+def parse_engine(spec: str) -> EngineConfig:
+    """"nome:depth=6,time=0.5,weights=eu" -> EngineConfig (depth=none aprofunda só pelo tempo)."""
+    name, _, options = spec.partition(":")
+    config = EngineConfig(name)
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        if key == "depth":
+            config = config._replace(depth=None if value.lower() == "none" else int(value))
+        elif key == "time":
+            config = config._replace(time_limit=float(value))
+        elif key == "weights":
+            if value not in WEIGHT_SETS and not os.path.exists(value):
+                raise ValueError(f"conjunto de pesos desconhecido: {value}")
+            config = config._replace(weights=value)
+        else:
+            raise ValueError(f"opção de motor desconhecida: {key}")
+    if config.depth is None and config.time_limit is None:
+        raise ValueError(f"{name}: sem profundidade, o motor precisa de time")
+    return config
+
+
+# --- Partidas ---
+def random_opening(plies: int, seed: int) -> List[int]:
+    """Colunas de uma abertura aleatória que não termina o jogo."""
+    rng = random.Random(seed)
+    while True:
+        bb, player, moves = BitBoard(), BOT, []
+        for _ in range(plies):
+            col = rng.choice(bb.valid_moves())
+            bb.play(col, player)
+            moves.append(col)
+            if bb.is_winning(player):
+                break
+            player = OPP if player == BOT else BOT
+        else:
+            return moves
+
+def play_game(first: EngineConfig, second: EngineConfig, opening: List[int]) -> Dict[str, Any]:
+    """Uma partida; `first` joga com BOT e começa. winner: 1 (first), 2 (second) ou 0 (empate)."""
+    engines = {BOT: first, OPP: second}
+    tables = {BOT: TranspositionTable(), OPP: TranspositionTable()} # os valores dependem dos pesos
+    stats = {player: {"moves": 0, "nodes": 0, "seconds": 0.0, "depth": 0, "max_depth": 0} for player in engines}
+    bb, player = BitBoard(), BOT
+    for col in opening:
+        bb.play(col, player)
+        player = OPP if player == BOT else BOT
+    winner = 0
+    while bb.valid_moves():
+        engine = engines[player]
+        set_weights(load_weight_set(engine.weights))
+        info: Dict[str, Any] = {}
+        col, _ = choose_move(bb, player, engine.depth, tables[player], engine.time_limit, info)
+        entry = stats[player]
+        entry["moves"] += 1
+        entry["nodes"] += info["nodes"]
+        entry["seconds"] += info["seconds"]
+        entry["depth"] += info["depth"]
+        entry["max_depth"] = max(entry["max_depth"], info["depth"])
+        bb.play(col, player)
+        if bb.is_winning(player):
+            winner = player
+            break
+        player = OPP if player == BOT else BOT
+    return {"first": first.name, "second": second.name, "opening": opening, "winner": winner,
+            "plies": len(bb.history), "stats": {first.name: stats[BOT], second.name: stats[OPP]}}
+
+def schedule(engines: List[EngineConfig], games: int, opening_plies: int, seed: int
+             ) -> List[Tuple[EngineConfig, EngineConfig, List[int]]]:
+    """Todos os pares; cada abertura sorteada é jogada com os dois motores começando."""
+    jobs = []
+    for pair_index, (a, b) in enumerate(combinations(engines, 2)):
+        for game in range(0, games, 2):
+            opening = random_opening(opening_plies, seed * 1_000_003 + pair_index * 10_007 + game)
+            jobs.append((a, b, opening))
+            if game + 1 < games:
+                jobs.append((b, a, opening))
+    return jobs
+
+
+# --- Estatística ---
+def wilson_interval(successes: int, n: int, z: float = Z_95) -> Tuple[float, float]:
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    center = (p + z * z / (2 * n)) / (1 + z * z / n)
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return max(0.0, center - half), min(1.0, center + half)
+
+def score_interval(wins: int, draws: int, losses: int, z: float = Z_95) -> Tuple[float, float, float]:
+    """Pontuação média (vitória 1, empate 0,5) e intervalo normal."""
+    n = wins + draws + losses
+    if n == 0:
+        return 0.5, 0.0, 1.0
+    mean = (wins + 0.5 * draws) / n
+    variance = (wins * (1 - mean) ** 2 + draws * (0.5 - mean) ** 2 + losses * mean ** 2) / n
+    half = z * math.sqrt(variance / n)
+    return mean, max(0.0, mean - half), min(1.0, mean + half)
+
+def summarize(engines: List[EngineConfig], results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    pairs = {}
+    for a, b in combinations(engines, 2):
+        wins = draws = losses = 0
+        for game in results:
+            if {game["first"], game["second"]} != {a.name, b.name}:
+                continue
+            if game["winner"] == 0:
+                draws += 1
+            elif (game["winner"] == BOT) == (game["first"] == a.name):
+                wins += 1
+            else:
+                losses += 1
+        n = wins + draws + losses
+        low, high = wilson_interval(wins, n)
+        score, score_low, score_high = score_interval(wins, draws, losses)
+        pairs[f"{a.name} x {b.name}"] = {
+            "games": n, "wins": wins, "draws": draws, "losses": losses,
+            "win_rate": round(wins / n, 4) if n else 0.0, "win_rate_ci95": [round(low, 4), round(high, 4)],
+            "score": round(score, 4), "score_ci95": [round(score_low, 4), round(score_high, 4)],
+        }
+
+    per_engine = {}
+    for engine in engines:
+        totals = {"moves": 0, "nodes": 0, "seconds": 0.0, "depth": 0, "max_depth": 0}
+        for game in results:
+            entry = game["stats"].get(engine.name)
+            if entry is None:
+                continue
+            for key in ("moves", "nodes", "seconds", "depth"):
+                totals[key] += entry[key]
+            totals["max_depth"] = max(totals["max_depth"], entry["max_depth"])
+        moves = totals["moves"] or 1
+        per_engine[engine.name] = {
+            **engine._asdict(),
+            "moves": totals["moves"],
+            "nodes_per_second": round(totals["nodes"] / (totals["seconds"] or 1e-9), 1),
+            "mean_move_seconds": round(totals["seconds"] / moves, 4),
+            "mean_depth": round(totals["depth"] / moves, 2),
+            "max_depth": totals["max_depth"],
+        }
+    return {"pairs": pairs, "engines": per_engine}
+
+def run_tournament(engines: List[EngineConfig], games: int = 20, opening_plies: int = 4, seed: int = 1,
+                   workers: Optional[int] = None, progress=None) -> Dict[str, Any]:
+    names = [engine.name for engine in engines]
+    if len(set(names)) != len(names) or len(engines) < 2:
+        raise ValueError("o torneio precisa de pelo menos 2 motores com nomes distintos")
+    jobs = schedule(engines, games, opening_plies, seed)
+    start = time.time()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = [pool.submit(play_game, first, second, opening) for first, second, opening in jobs]
+        for future in futures:
+            results.append(future.result())
+            if progress is not None:
+                progress(len(results), len(jobs), results[-1])
+    return {
+        "config": {"games": games, "opening_plies": opening_plies, "seed": seed, "workers": workers,
+                   "weight_sets": {engine.weights: load_weight_set(engine.weights) for engine in engines}},
+        "seconds": round(time.time() - start, 2),
+        "summary": summarize(engines, results),
+        "games": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Torneio de autojogo entre configurações do bot de Ligue 4.")
+    parser.add_argument("--engine", action="append", default=None,
+                        help='"nome:depth=N,time=S,weights=default|alt|eu|arquivo.json" (repita p cada motor)')
+    parser.add_argument("--games", type=int, default=20, help="partidas por par de motores")
+    parser.add_argument("--opening-plies", type=int, default=4, help="lances aleatórios antes dos motores")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: todos os núcleos)")
+    parser.add_argument("--output", default=None, help="arquivo JSON com o relatório completo")
+    args = parser.parse_args()
+
+    engines = [parse_engine(spec) for spec in (args.engine or ["default:depth=4", "eu:depth=4,weights=eu"])]
+
+    def progress(done: int, total: int, game: Dict[str, Any]) -> None:
+        winner = {0: "empate", BOT: game["first"], OPP: game["second"]}[game["winner"]]
+        print(f"[{done}/{total}] {game['first']} x {game['second']}: {winner} ({game['plies']} lances)", file=sys.stderr)
+
+    report = run_tournament(engines, args.games, args.opening_plies, args.seed, args.workers, progress)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    print(json.dumps(report["summary"], indent=2, ensure_ascii=False))
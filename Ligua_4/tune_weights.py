@@ -0,0 +1,195 @@
+# Python 3
+"""Ajuste dos pesos de Weights a partir de partidas de autojogo.
+
+generate: joga partidas do bot contra ele mesmo (abertura aleatória com semente e, depois,
+um lance aleatório com probabilidade --epsilon p variar as posições) e grava cada posição
+não terminal com o resultado final do ponto de vista de quem joga. As partidas vão p um pool
+de processos e as posições são gravadas assim que cada partida termina.
+
+fit: lê o arquivo em lotes (np.memmap, nada é carregado de uma vez), calcula as
+características com vector_eval.batch_features e ajusta uma regressão logística,
+P(vitória de quem joga) = sigmoide(características . pesos), com Adam sobre os lotes
+(empate = 0,5). Multiplicar todos os pesos por uma constante positiva não muda as escolhas
+do minimax, então os pesos ajustados são reescalados p THREE_OPEN = Weights.THREE_OPEN
+(WIN continua dominando). O JSON de saída pode ser usado em tournament.py (weights=arquivo.json).
+
+Formato do arquivo de posições: magic "L4PS", versão (uint8) e registros de 17 bytes:
+peças de quem joga (uint64), peças do oponente (uint64), resultado (int8: 1, 0, -1).
+
+Uso:
+    python tune_weights.py generate --games 2000 --depth 3 --output posicoes.bin
+    python tune_weights.py fit posicoes.bin --epochs 10 --output pesos.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import struct
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Iterator
+
+from ligue_4 import BOT, OPP, BitBoard, TranspositionTable, Weights, choose_move, get_weights
+from vector_eval import FEATURE_NAMES, batch_features, np, _require_numpy
+
+POSITIONS_MAGIC = b"L4PS"
+POSITIONS_VERSION = 1
+POSITIONS_HEADER = struct.Struct("<4sB")
+POSITION_RECORD = struct.Struct("<QQb")
+
+
+# --- Geração ---
+def self_play_positions(seed: int, depth: int = 3, opening_plies: int = 4, epsilon: float = 0.1) -> List[Tuple[int, int, int]]:
+    """(peças de quem joga, peças do oponente, resultado p quem joga) de cada posição de uma partida."""
+    rng = random.Random(seed)
+    tt = TranspositionTable(1 << 14)
+    bb, player = BitBoard(), BOT
+    seen: List[Tuple[int, int, int]] = [] # (peças de quem joga, do oponente, quem joga)
+    winner = 0
+    while bb.valid_moves():
+        opp = OPP if player == BOT else BOT
+        seen.append((bb.pieces[player], bb.pieces[opp], player))
+        if len(bb.history) < opening_plies or rng.random() < epsilon:
+            col = rng.choice(bb.valid_moves())
+        else:
+            col, _ = choose_move(bb, player, depth, tt)
+        bb.play(col, player)
+        if bb.is_winning(player):
+            winner = player
+            break
+        player = opp
+    if len(bb.history) <= opening_plies:
+        return [] # acabou ainda na abertura aleatória
+    return [(own, other, 0 if winner == 0 else (1 if winner == mover else -1)) for own, other, mover in seen]
+
+def generate_positions(path: str, games: int, depth: int = 3, opening_plies: int = 4, epsilon: float = 0.1,
+                       seed: int = 1, workers: Optional[int] = None, progress=None) -> int:
+    """Grava as posições de `games` partidas em `path`; devolve quantas posições foram gravadas."""
+    count = 0
+    with open(path, "wb") as f, ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        f.write(POSITIONS_HEADER.pack(POSITIONS_MAGIC, POSITIONS_VERSION))
+        futures = [pool.submit(self_play_positions, seed * 1_000_003 + game, depth, opening_plies, epsilon)
+                   for game in range(games)]
+        for index, future in enumerate(futures):
+            records = future.result()
+            f.write(b"".join(POSITION_RECORD.pack(*record) for record in records))
+            count += len(records)
+            if progress is not None:
+                progress(index + 1, games, count)
+    return count
+
+
+# --- Leitura em lotes ---
+def _position_dtype():
+    return np.dtype([("own", "<u8"), ("other", "<u8"), ("result", "i1")])
+
+def iter_position_batches(path: str, batch_size: int = 65536, shuffle_seed: Optional[int] = None
+                          ) -> Iterator[Tuple["np.ndarray", "np.ndarray", "np.ndarray"]]:
+    """(own, other, resultado) em lotes de até batch_size, lidos do memmap.
+
+    Com shuffle_seed, a ordem dos lotes é embaralhada (as posições de uma mesma partida
+    ficam juntas no arquivo).
+    """
+    _require_numpy()
+    with open(path, "rb") as f:
+        magic, version = POSITIONS_HEADER.unpack(f.read(POSITIONS_HEADER.size))
+    if magic != POSITIONS_MAGIC:
+        raise ValueError(f"arquivo de posições inválido: {path}")
+    if version != POSITIONS_VERSION:
+        raise ValueError(f"versão de arquivo não suportada: {version}")
+    if os.path.getsize(path) == POSITIONS_HEADER.size:
+        return
+    records = np.memmap(path, dtype=_position_dtype(), mode="r", offset=POSITIONS_HEADER.size)
+    starts = list(range(0, len(records), batch_size))
+    if shuffle_seed is not None:
+        random.Random(shuffle_seed).shuffle(starts)
+    for start in starts:
+        batch = records[start:start + batch_size]
+        yield np.array(batch["own"]), np.array(batch["other"]), np.array(batch["result"])
+
+
+# --- Ajuste ---
+def fit_weights(path: str, epochs: int = 10, batch_size: int = 65536, learning_rate: float = 0.05,
+                l2: float = 1e-4, seed: int = 0, progress=None) -> Dict[str, Any]:
+    """Regressão logística dos resultados sobre as características de evaluate (Adam por lotes)."""
+    _require_numpy()
+    theta = np.zeros(len(FEATURE_NAMES))
+    m, v = np.zeros_like(theta), np.zeros_like(theta)
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    step = 0
+    history = []
+    for epoch in range(epochs):
+        loss_sum, correct, decided, seen = 0.0, 0, 0, 0
+        for own, other, result in iter_position_batches(path, batch_size, shuffle_seed=seed + epoch):
+            features, _, _ = batch_features(own, other)
+            target = (result.astype(np.float64) + 1) / 2
+            logits = features @ theta
+            prob = 1 / (1 + np.exp(-logits))
+            grad = features.T @ (prob - target) / len(target) + l2 * theta
+            step += 1
+            m = beta1 * m + (1 - beta1) * grad
+            v = beta2 * v + (1 - beta2) * grad * grad
+            theta -= learning_rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + eps)
+
+            prob = np.clip(prob, 1e-12, 1 - 1e-12)
+            loss_sum += float(-(target * np.log(prob) + (1 - target) * np.log(1 - prob)).sum())
+            mask = result != 0
+            correct += int(((prob[mask] > 0.5) == (result[mask] > 0)).sum())
+            decided += int(mask.sum())
+            seen += len(target)
+        if seen == 0:
+            raise ValueError(f"nenhuma posição em {path}")
+        entry = {"epoch": epoch + 1, "log_loss": round(loss_sum / seen, 6),
+                 "accuracy": round(correct / decided, 4) if decided else None}
+        history.append(entry)
+        if progress is not None:
+            progress(entry)
+
+    raw = dict(zip(FEATURE_NAMES, theta.tolist()))
+    three = raw["THREE_OPEN"]
+    scale = Weights.THREE_OPEN / three if three > 0 else 1.0
+    weights = {name: round(value * scale, 6) for name, value in raw.items()}
+    weights.update(WIN=Weights.WIN, LOSE=Weights.LOSE)
+    return {"weights": weights, "raw": raw, "scale": scale, "positions": seen, "history": history,
+            "baseline": get_weights()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ajuste dos pesos do bot de Ligue 4 por autojogo.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    gen = sub.add_parser("generate", help="gera posições de autojogo")
+    gen.add_argument("--games", type=int, default=1000)
+    gen.add_argument("--depth", type=int, default=3, help="profundidade do bot nas partidas")
+    gen.add_argument("--opening-plies", type=int, default=4, help="lances aleatórios no começo")
+    gen.add_argument("--epsilon", type=float, default=0.1, help="chance de um lance aleatório depois da abertura")
+    gen.add_argument("--seed", type=int, default=1)
+    gen.add_argument("--workers", type=int, default=None)
+    gen.add_argument("--output", default="posicoes.bin")
+    fit = sub.add_parser("fit", help="ajusta os pesos às posições de um arquivo")
+    fit.add_argument("positions")
+    fit.add_argument("--epochs", type=int, default=10)
+    fit.add_argument("--batch", type=int, default=65536, help="posições por lote lido do disco")
+    fit.add_argument("--lr", type=float, default=0.05)
+    fit.add_argument("--l2", type=float, default=1e-4)
+    fit.add_argument("--seed", type=int, default=0)
+    fit.add_argument("--output", default=None, help="JSON com os pesos ajustados")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    if args.command == "generate":
+        def progress(done: int, total: int, count: int) -> None:
+            if done % 50 == 0 or done == total:
+                print(f"[{done}/{total}] {count} posições", file=sys.stderr)
+        count = generate_positions(args.output, args.games, args.depth, args.opening_plies, args.epsilon,
+                                   args.seed, args.workers, progress)
+        print(json.dumps({"output": args.output, "positions": count, "seconds": round(time.time() - start_time, 2)}))
+        sys.exit(0)
+
+    report = fit_weights(args.positions, args.epochs, args.batch, args.lr, args.l2, args.seed,
+                         lambda entry: print(json.dumps(entry), file=sys.stderr))
+    report["seconds"] = round(time.time() - start_time, 2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    print(json.dumps(report["weights"], indent=2))
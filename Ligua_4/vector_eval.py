@@ -0,0 +1,182 @@
+# Python 3
+"""Avaliação em lote (NumPy) da heurística do Ligue 4: milhares de posições numa chamada só.
+
+As posições entram como dois arrays uint64 (peças de quem avalia e do oponente, no layout
+do BitBoard) e viram uma matriz (n, COLS*H1) de casas. As janelas são arrays de índices
+pré-calculados (69 de 4 casas, 18 horizontais de 5), convertidos numa matriz de incidência
+casa x janela: contar as peças de todas as janelas de um lote é um produto de matrizes.
+batch_features devolve as contagens que multiplicam cada peso de Weights (é a base do
+ajuste em tune_weights.py) e batch_evaluate dá os mesmos valores de evaluate.
+
+NumPy é opcional: o resto do projeto não depende deste módulo.
+
+Uso:
+    python vector_eval.py --check 5000
+    python vector_eval.py --bench 100000
+"""
+import sys
+import time
+import random
+import argparse
+from typing import List, Tuple, Iterable, Union
+
+try:
+    import numpy as np
+except ImportError: # pragma: no cover - depende do ambiente
+    np = None
+
+from ligue_4 import (BOT, OPP, COLS, H1, CENTER_MASK, WINDOWS_4, WINDOWS_5_H, BitBoard, Weights, as_bitboard,
+                     evaluate)
+
+NUM_CELL_BITS = COLS * H1
+# ordem das colunas de batch_features (e dos pesos que as multiplicam)
+FEATURE_NAMES = ("CENTER", "THREE_OPEN", "TWO_OPEN", "BROKEN_THREE", "TWO_SPACE_TWO")
+
+def _bit_indices(mask: int) -> List[int]:
+    return [i for i in range(NUM_CELL_BITS) if mask >> i & 1]
+
+WINDOW_INDEX_4 = [_bit_indices(window) for window in WINDOWS_4]
+WINDOW_INDEX_5_H = [_bit_indices(window) for window in WINDOWS_5_H]
+CENTER_INDEX = _bit_indices(CENTER_MASK)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("vector_eval precisa do numpy (pip install numpy)")
+
+
+# --- Tabelas ---
+class _NumpyTables:
+    def __init__(self):
+        self.windows_4 = np.array(WINDOW_INDEX_4, dtype=np.intp)
+        self.windows_5 = np.array(WINDOW_INDEX_5_H, dtype=np.intp)
+        self.center = np.array(CENTER_INDEX, dtype=np.intp)
+        # incidência casa x janela: casas (n, bits) @ incidência = peças por janela (float32 é exato aqui)
+        self.incidence_4 = np.zeros((NUM_CELL_BITS, len(WINDOW_INDEX_4)), dtype=np.float32)
+        self.incidence_4[self.windows_4, np.arange(len(WINDOW_INDEX_4))[:, None]] = 1
+        self.incidence_5 = np.zeros((NUM_CELL_BITS, len(WINDOW_INDEX_5_H)), dtype=np.float32)
+        self.incidence_5[self.windows_5, np.arange(len(WINDOW_INDEX_5_H))[:, None]] = 1
+        self.shifts = np.arange(NUM_CELL_BITS, dtype=np.uint64)
+        self.bottom = np.arange(NUM_CELL_BITS) % H1 == 0
+
+_TABLES = None
+
+def _tables() -> _NumpyTables:
+    global _TABLES
+    if _TABLES is None:
+        _require_numpy()
+        _TABLES = _NumpyTables()
+    return _TABLES
+
+
+# --- Conversão ---
+def boards_to_arrays(boards: Iterable[Union[BitBoard, List[List[int]]]], player: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    """(peças de `player`, peças do oponente) de cada tabuleiro, como arrays uint64."""
+    _require_numpy()
+    opp = OPP if player == BOT else BOT
+    pairs = [(bb.pieces[player], bb.pieces[opp]) for bb in map(as_bitboard, boards)]
+    arrays = np.array(pairs, dtype=np.uint64).reshape(-1, 2)
+    return arrays[:, 0], arrays[:, 1]
+
+def unpack_bits(bits: "np.ndarray") -> "np.ndarray":
+    """Matriz (n, COLS*H1) de bool com as casas ocupadas de cada bitboard."""
+    return ((np.asarray(bits, dtype=np.uint64)[:, None] >> _tables().shifts) & np.uint64(1)).astype(bool)
+
+
+# --- Avaliação em lote ---
+def batch_features(own: "np.ndarray", other: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """(características (n, 5) na ordem de FEATURE_NAMES, quatro em linha de own, de other).
+
+    Mesmas contagens de evaluate: peças no centro, trincas e duplas abertas (as do oponente
+    subtraídas), trincas com a vazia jogável e 2-esp-2, as duas últimas só a favor de own.
+    """
+    tables = _tables()
+    own_cells, other_cells = unpack_bits(own), unpack_bits(other)
+    occupied = own_cells | other_cells
+    below = np.zeros_like(occupied)
+    below[:, 1:] = occupied[:, :-1]
+    # a casa de baixo de uma linha inferior é a sentinela da coluna anterior (sempre vazia)
+    playable = ~occupied & (tables.bottom | below)
+
+    own_f, other_f, playable_f = (cells.astype(np.float32) for cells in (own_cells, other_cells, playable))
+    own_4, other_4 = own_f @ tables.incidence_4, other_f @ tables.incidence_4
+    own_open, other_open = other_4 == 0, own_4 == 0
+    threes = own_open & (own_4 == 3)
+    opp_threes = other_open & (other_4 == 3)
+    twos = (own_open & (own_4 == 2)).sum(axis=1)
+    opp_twos = (other_open & (other_4 == 2)).sum(axis=1)
+    broken = (threes & (playable_f @ tables.incidence_4 > 0)).sum(axis=1)
+
+    own_5, other_5 = own_f @ tables.incidence_5, other_f @ tables.incidence_5
+    split = ((own_5 == 4) & (other_5 == 0) & (playable_f @ tables.incidence_5 > 0)).sum(axis=1)
+
+    features = np.stack([
+        own_cells[:, tables.center].sum(axis=1),
+        threes.sum(axis=1) - opp_threes.sum(axis=1),
+        twos - opp_twos,
+        broken,
+        split,
+    ], axis=1).astype(np.float64)
+    return features, (own_4 == 4).any(axis=1), (other_4 == 4).any(axis=1)
+
+def batch_evaluate(own: "np.ndarray", other: "np.ndarray") -> "np.ndarray":
+    """evaluate de cada posição do ponto de vista de own (pesos de Weights lidos na hora)."""
+    features, own_wins, other_wins = batch_features(own, other)
+    # mesma ordem de soma de combine_score: valores idênticos aos de evaluate
+    score = (features[:, 0] * Weights.CENTER
+             + features[:, 1] * Weights.THREE_OPEN
+             + features[:, 2] * Weights.TWO_OPEN
+             + features[:, 3] * Weights.BROKEN_THREE
+             + features[:, 4] * Weights.TWO_SPACE_TWO)
+    return np.where(own_wins, Weights.WIN, np.where(other_wins, Weights.LOSE, score))
+
+
+# --- Conferência e medição ---
+def random_positions(count: int, seed: int = 0) -> List[Tuple[BitBoard, int]]:
+    """Posições de partidas aleatórias (podem ser terminais) e o jogador da vez."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        bb, player = BitBoard(), BOT
+        for _ in range(rng.randint(0, 41)):
+            moves = bb.valid_moves()
+            if not moves or bb.is_winning(BOT) or bb.is_winning(OPP):
+                break
+            bb.play(rng.choice(moves), player)
+            player = OPP if player == BOT else BOT
+        positions.append((bb, player))
+    return positions
+
+def check_batch_eval(samples: int = 2000, seed: int = 0) -> int:
+    """Divergências entre batch_evaluate e evaluate em posições aleatórias (esperado: 0)."""
+    mismatches = 0
+    positions = random_positions(samples, seed)
+    for player in (BOT, OPP):
+        own, other = boards_to_arrays([bb for bb, _ in positions], player)
+        batch = batch_evaluate(own, other).tolist()
+        mismatches += sum(1 for (bb, _), value in zip(positions, batch) if evaluate(bb, player) != value)
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Avaliação em lote (NumPy) da heurística do Ligue 4.")
+    parser.add_argument("--check", type=int, default=None, metavar="N", help="confere N posições contra evaluate")
+    parser.add_argument("--bench", type=int, default=None, metavar="N", help="mede posições/segundo (lote vs escalar)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.check:
+        mismatches = check_batch_eval(args.check, args.seed)
+        print(f"{args.check} posições (x2 pontos de vista), {mismatches} divergências")
+        sys.exit(1 if mismatches else 0)
+    if args.bench:
+        positions = [bb for bb, _ in random_positions(args.bench, args.seed)]
+        own, other = boards_to_arrays(positions, BOT)
+        start = time.perf_counter()
+        batch_evaluate(own, other)
+        batch_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        for bb in positions:
+            evaluate(bb, BOT)
+        scalar_seconds = time.perf_counter() - start
+        print(f"lote: {args.bench / batch_seconds:.0f} posições/s; evaluate: {args.bench / scalar_seconds:.0f} posições/s")
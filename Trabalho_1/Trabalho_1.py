@@ -2,21 +2,176 @@
 import time
 import json
 import heapq
-from typing import List, Tuple, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Tuple, Dict, Any, Optional, Union, Callable, Iterator
 
-GOAL_STATE_LIST = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
-GOAL_STATE_TUPLE = tuple(map(tuple, GOAL_STATE_LIST))
-# calc pos do estado final p busca O(1) na heurística de D Manhattan
-GOAL_POSITIONS = {tile: (r, c) for r, row in enumerate(GOAL_STATE_LIST) for c, tile in enumerate(row)}
+# estado compacto: um int com B bits por peça, célula i = r*N+c nos bits [B*i, B*i+B)
+PackedState = int
+
+MOVE_DIRECTIONS = [(-1, 0, 'UP'), (1, 0, 'DOWN'), (0, -1, 'LEFT'), (0, 1, 'RIGHT')]
+
+
+# --- Tabelas do conflito linear ---
+def _longest_increasing_run(values: List[int]) -> int:
+    """Tamanho da maior subsequência crescente (linhas têm no máximo N elementos)."""
+    best = [1] * len(values)
+    for j in range(len(values)):
+        for i in range(j):
+            if values[i] < values[j] and best[i] + 1 > best[j]:
+                best[j] = best[i] + 1
+    return max(best, default=0)
+
+_LINE_CONFLICT_TABLES: Dict[int, List[int]] = {}
+
+def line_conflict_table(size: int) -> List[int]:
+    """Peças a tirar de uma linha p desfazer seus conflitos lineares, por padrão da linha.
+
+    O padrão é um número em base size+1: o dígito da posição i é a posição-objetivo (dentro
+    da linha) da peça que está ali, ou size se a peça não pertence a esta linha.
+    """
+    table = _LINE_CONFLICT_TABLES.get(size)
+    if table is None:
+        base = size + 1
+        table = []
+        for code in range(base ** size):
+            digits = [(code // base ** i) % base for i in range(size)]
+            members = [d for d in digits if d < size]
+            table.append(len(members) - _longest_increasing_run(members))
+        _LINE_CONFLICT_TABLES[size] = table
+    return table
+
+
+class PuzzleSpec:
+    """Dados pré-calculados de um tabuleiro NxN: objetivo, movimentos do vazio e tabelas das heurísticas."""
+    def __init__(self, size: int, goal: Optional[List[List[int]]] = None):
+        """goal troca o objetivo padrão (usado p a busca de trás p frente da busca bidirecional)."""
+        if size < 2:
+            raise ValueError("o tabuleiro precisa ter pelo menos 2x2")
+        self.size = size
+        self.num_cells = size * size
+        # 4 bits bastam até o 15-puzzle; o 24-puzzle precisa de 5
+        self.bits_per_tile = max(4, (self.num_cells - 1).bit_length())
+        self.tile_mask = (1 << self.bits_per_tile) - 1
+
+        if goal is None:
+            goal = [[(r * size + c + 1) % self.num_cells for c in range(size)] for r in range(size)]
+        self.goal_list = [list(row) for row in goal]
+        self.goal_tuple = tuple(map(tuple, self.goal_list))
+        # calc pos do estado final p busca O(1) na heurística de D Manhattan
+        self.goal_positions = {tile: (r, c) for r, row in enumerate(self.goal_list) for c, tile in enumerate(row)}
+        self.goal_state = encode_state(self.goal_list, self)
+
+        # movimentos do vazio p cada célula: (nova célula, nome do movimento)
+        self.blank_moves: List[List[Tuple[int, str]]] = []
+        for cell in range(self.num_cells):
+            r, c = divmod(cell, size)
+            self.blank_moves.append([((r + dr) * size + c + dc, name) for dr, dc, name in MOVE_DIRECTIONS
+                                     if 0 <= r + dr < size and 0 <= c + dc < size])
+        self.blank_neighbors = [[new_cell for new_cell, _ in moves] for moves in self.blank_moves]
+
+        # tabelas [peça][célula] p as heurísticas não precisarem desempacotar o estado
+        self.manhattan_table = [
+            [0 if tile == 0 else abs(cell // size - self.goal_positions[tile][0]) + abs(cell % size - self.goal_positions[tile][1])
+             for cell in range(self.num_cells)]
+            for tile in range(self.num_cells)
+        ]
+        self.misplaced_table = [
+            [0 if tile == 0 or self.goal_positions[tile] == divmod(cell, size) else 1 for cell in range(self.num_cells)]
+            for tile in range(self.num_cells)
+        ]
+
+        # conflito linear: contribuição de cada (peça, célula) p o padrão da sua linha e da sua coluna
+        base = size + 1
+        self.line_conflicts = line_conflict_table(size)
+        self.row_pattern_table = [[0] * self.num_cells for _ in range(self.num_cells)]
+        self.col_pattern_table = [[0] * self.num_cells for _ in range(self.num_cells)]
+        for tile in range(self.num_cells):
+            goal_row, goal_col = self.goal_positions[tile]
+            for cell in range(self.num_cells):
+                r, c = divmod(cell, size)
+                in_row = tile != 0 and goal_row == r
+                in_col = tile != 0 and goal_col == c
+                self.row_pattern_table[tile][cell] = (goal_col if in_row else size) * base ** c
+                self.col_pattern_table[tile][cell] = (goal_row if in_col else size) * base ** r
+
+        # walking distance: cada peça soma 1 no contador (linha atual, linha-objetivo) e (coluna atual, coluna-objetivo)
+        count_bits = size.bit_length()
+        self.walking_row_table = [
+            [0 if tile == 0 else 1 << (count_bits * ((cell // size) * size + self.goal_positions[tile][0])) for cell in range(self.num_cells)]
+            for tile in range(self.num_cells)
+        ]
+        self.walking_col_table = [
+            [0 if tile == 0 else 1 << (count_bits * ((cell % size) * size + self.goal_positions[tile][1])) for cell in range(self.num_cells)]
+            for tile in range(self.num_cells)
+        ]
+
+
+_SPECS: Dict[int, PuzzleSpec] = {}
+
+def get_spec(size: int) -> PuzzleSpec:
+    """Retorna (e guarda) o PuzzleSpec de um tabuleiro size x size."""
+    spec = _SPECS.get(size)
+    if spec is None:
+        spec = _SPECS[size] = PuzzleSpec(size)
+    return spec
+
+
+# --- Codificação do estado ---
+def encode_state(state: Union[PackedState, List[List[int]], Tuple[Tuple[int, ...], ...]], spec: Optional[PuzzleSpec] = None) -> PackedState:
+    """Converte um tabuleiro (lista/tupla de linhas) p o int compacto."""
+    if isinstance(state, int):
+        return state
+    bits = spec.bits_per_tile if spec is not None else get_spec(len(state)).bits_per_tile
+    packed = 0
+    for cell, tile in enumerate(tile for row in state for tile in row):
+        packed |= tile << (cell * bits)
+    return packed
+
+def decode_state(packed: PackedState, spec: Optional[PuzzleSpec] = None) -> Tuple[Tuple[int, ...], ...]:
+    """Converte o int compacto de volta p tupla de tuplas (exportação/visualização)."""
+    spec = spec or PUZZLE_3X3
+    tiles = [(packed >> (cell * spec.bits_per_tile)) & spec.tile_mask for cell in range(spec.num_cells)]
+    return tuple(tuple(tiles[r * spec.size:(r + 1) * spec.size]) for r in range(spec.size))
+
+def get_tile(state: PackedState, cell: int, spec: Optional[PuzzleSpec] = None) -> int:
+    spec = spec or PUZZLE_3X3
+    return (state >> (cell * spec.bits_per_tile)) & spec.tile_mask
+
+
+PUZZLE_3X3 = get_spec(3)
+PUZZLE_4X4 = get_spec(4)
+PUZZLE_5X5 = get_spec(5)
+
+# atalhos do 8-puzzle (tabuleiro padrão)
+BOARD_SIZE = PUZZLE_3X3.size
+NUM_CELLS = PUZZLE_3X3.num_cells
+BITS_PER_TILE = PUZZLE_3X3.bits_per_tile
+TILE_MASK = PUZZLE_3X3.tile_mask
+GOAL_STATE_LIST = PUZZLE_3X3.goal_list
+GOAL_STATE_TUPLE = PUZZLE_3X3.goal_tuple
+GOAL_POSITIONS = PUZZLE_3X3.goal_positions
+GOAL_STATE = PUZZLE_3X3.goal_state
+BLANK_MOVES = PUZZLE_3X3.blank_moves
+MANHATTAN_TABLE = PUZZLE_3X3.manhattan_table
+MISPLACED_TABLE = PUZZLE_3X3.misplaced_table
+
+
+class SearchTimeout(Exception):
+    """Levantada quando a busca estoura o limite de tempo (time_limit)."""
 
 
 class Node:
-    def __init__(self, state: Tuple[Tuple[int, ...], ...], parent: Optional['Node'] = None, action: Optional[Dict[str, Any]] = None, g: int = 0, h: int = 0):
+    # sem __dict__ e sem o dicionário de ação: o movimento que gerou o nó fica implícito
+    # na célula do vazio (parent.blank -> blank) e a ação só é montada ao reconstruir o caminho
+    __slots__ = ("state", "parent", "g", "h", "blank")
+
+    def __init__(self, state: PackedState, parent: Optional['Node'] = None, g: int = 0, h: int = 0, blank: Optional[int] = None):
         self.state = state
         self.parent = parent
-        self.action = action
         self.g = g
         self.h = h
+        # posição do vazio guardada no nó p não precisar procurar a cada expansão
+        self.blank = find_blank(state) if blank is None else blank
 
     def get_f_score(self) -> int:
         return self.g + self.h
@@ -25,99 +180,552 @@ class Node:
         return self.get_f_score() < other.get_f_score()
 
 # --- Funções Auxiliares ---
-def find_pos(state: Tuple[Tuple[int, ...], ...], value: int) -> Optional[Tuple[int, int]]:
-    for r, row in enumerate(state):
-        for c, tile in enumerate(row):
-            if tile == value:
-                return r, c
+def find_pos(state: PackedState, value: int, spec: Optional[PuzzleSpec] = None) -> Optional[Tuple[int, int]]:
+    spec = spec or PUZZLE_3X3
+    for cell in range(spec.num_cells):
+        if get_tile(state, cell, spec) == value:
+            return divmod(cell, spec.size)
     return None
 
-def reconstruct_solution_path(final_node: Node) -> List[Dict[str, Any]]:
-    """Reconstrói o caminho da solução a partir do nó final."""
+def find_blank(state: PackedState, spec: Optional[PuzzleSpec] = None) -> int:
+    """Índice da célula vazia (r*N+c)."""
+    spec = spec or PUZZLE_3X3
+    for cell in range(spec.num_cells):
+        if (state >> (cell * spec.bits_per_tile)) & spec.tile_mask == 0:
+            return cell
+    raise ValueError("estado sem célula vazia")
+
+def make_action(state: PackedState, empty_cell: int, new_cell: int, spec: PuzzleSpec) -> Dict[str, Any]:
+    """Monta o dicionário de ação p o vazio indo de empty_cell p new_cell a partir de state."""
+    size = spec.size
+    empty_row, empty_col = divmod(empty_cell, size)
+    new_row, new_col = divmod(new_cell, size)
+    for dr, dc, move_name in MOVE_DIRECTIONS:
+        if (empty_row + dr, empty_col + dc) == (new_row, new_col):
+            break
+    else:
+        raise ValueError("células não são vizinhas")
+    return {
+        "move_direction": move_name, "moved_tile": get_tile(state, new_cell, spec),
+        "empty_tile_from": [empty_row, empty_col], "empty_tile_to": [new_row, new_col]
+    }
+
+def reconstruct_solution_path(final_node: Node, spec: Optional[PuzzleSpec] = None) -> List[Dict[str, Any]]:
+    """Reconstrói o caminho da solução a partir do nó final (as ações detalhadas só são montadas aqui)."""
+    spec = spec or PUZZLE_3X3
     path = []
     current_node = final_node
     while current_node.parent is not None:
-        path.append(current_node.action)
-        current_node = current_node.parent
+        parent = current_node.parent
+        path.append(make_action(parent.state, parent.blank, current_node.blank, spec))
+        current_node = parent
     path.reverse()
     return path
 
-def get_all_successors(node: Node) -> List[Node]:
+def get_all_successors(node: Node, spec: Optional[PuzzleSpec] = None) -> List[Node]:
     """Gera todos os nós sucessores válidos a partir do nó atual."""
+    spec = spec or PUZZLE_3X3
+    bits, tile_mask = spec.bits_per_tile, spec.tile_mask
     successors = []
-    empty_pos = find_pos(node.state, 0)
-    if empty_pos is None:
-        return []
-
-    empty_row, empty_col = empty_pos
-    possible_moves = [(-1, 0, 'UP'), (1, 0, 'DOWN'), (0, -1, 'LEFT'), (0, 1, 'RIGHT')]
+    state = node.state
+    empty_shift = node.blank * bits
     new_g_score = node.g + 1
 
-    for dr, dc, move_name in possible_moves:
-        new_row, new_col = empty_row + dr, empty_col + dc
-        if 0 <= new_row < 3 and 0 <= new_col < 3:
-            # converte tupla p lista p poder modificar
-            new_state_list = [list(row) for row in node.state]
-            moved_tile = new_state_list[new_row][new_col]
-            
-            new_state_list[empty_row][empty_col] = moved_tile
-            new_state_list[new_row][new_col] = 0
-            
-            # converte p tupla p ser imutável
-            new_state_tuple = tuple(map(tuple, new_state_list))
-            
-            detailed_action = {
-                "move_direction": move_name, "moved_tile": moved_tile,
-                "empty_tile_from": [empty_row, empty_col], "empty_tile_to": [new_row, new_col]
-            }
-            successors.append(Node(state=new_state_tuple, parent=node, action=detailed_action, g=new_g_score))
+    for new_cell in spec.blank_neighbors[node.blank]:
+        new_shift = new_cell * bits
+        moved_tile = (state >> new_shift) & tile_mask
+        # a célula do vazio vale 0, então trocar é só somar/subtrair a peça nas duas posições
+        new_state = state + (moved_tile << empty_shift) - (moved_tile << new_shift)
+        successors.append(Node(state=new_state, parent=node, g=new_g_score, blank=new_cell))
     return successors
 
 # --- Funções de Heurística ---
-def h_uniform_cost(state: Tuple[Tuple[int, ...], ...]) -> int:
+# Todas recebem (estado compacto, spec do tabuleiro); o spec padrão é o 8-puzzle.
+def h_uniform_cost(state: PackedState, spec: PuzzleSpec = PUZZLE_3X3) -> int:
     """Heurística p busca de Custo Uniforme (sempre 0)."""
     return 0
 
-def h_non_admissible(state: Tuple[Tuple[int, ...], ...]) -> int:
+def h_non_admissible(state: PackedState, spec: PuzzleSpec = PUZZLE_3X3) -> int:
     """Heurística não admissível (superestima o custo)."""
-    return h_manhattan_distance(state) * 3
+    return h_manhattan_distance(state, spec) * 3
 
-def h_misplaced_tiles(state: Tuple[Tuple[int, ...], ...]) -> int:
+def h_misplaced_tiles(state: PackedState, spec: PuzzleSpec = PUZZLE_3X3) -> int:
     """Heurística admissível simples: conta as peças fora do lugar."""
+    table, bits, tile_mask = spec.misplaced_table, spec.bits_per_tile, spec.tile_mask
     misplaced = 0
-    for r in range(3):
-        for c in range(3):
-            if state[r][c] != GOAL_STATE_TUPLE[r][c] and state[r][c] != 0:
-                misplaced += 1
+    for cell in range(spec.num_cells):
+        misplaced += table[state & tile_mask][cell]
+        state >>= bits
     return misplaced
 
-def h_manhattan_distance(state: Tuple[Tuple[int, ...], ...]) -> int:
+def h_manhattan_distance(state: PackedState, spec: PuzzleSpec = PUZZLE_3X3) -> int:
     """Heurística admissível Distância de Manhattan."""
+    table, bits, tile_mask = spec.manhattan_table, spec.bits_per_tile, spec.tile_mask
     dist = 0
-    for r in range(3):
-        for c in range(3):
-            value = state[r][c]
-            if value != 0:
-                # busca O(1) no mapa existenet
-                goal_r, goal_c = GOAL_POSITIONS[value]
-                dist += abs(r - goal_r) + abs(c - goal_c)
+    for cell in range(spec.num_cells):
+        # busca O(1) na tabela pré-calculada
+        dist += table[state & tile_mask][cell]
+        state >>= bits
     return dist
 
+def h_linear_conflict(state: PackedState, spec: PuzzleSpec = PUZZLE_3X3) -> int:
+    """Heurística admissível: Manhattan + 2 por peça que precisa sair da linha/coluna p desfazer conflitos."""
+    table, bits, tile_mask, size = spec.manhattan_table, spec.bits_per_tile, spec.tile_mask, spec.size
+    row_table, col_table = spec.row_pattern_table, spec.col_pattern_table
+    row_patterns = [0] * size
+    col_patterns = [0] * size
+    dist = 0
+    for cell in range(spec.num_cells):
+        tile = state & tile_mask
+        dist += table[tile][cell]
+        row_patterns[cell // size] += row_table[tile][cell]
+        col_patterns[cell % size] += col_table[tile][cell]
+        state >>= bits
+    conflicts = spec.line_conflicts
+    return dist + 2 * (sum(conflicts[p] for p in row_patterns) + sum(conflicts[p] for p in col_patterns))
+
+_WALKING_DISTANCE_TABLES: Dict[Tuple[int, int], Dict[int, int]] = {}
+
+def walking_distance_table(size: int, blank_goal_line: int) -> Dict[int, int]:
+    """BFS do walking distance (Takahashi) num eixo: matriz de contagens -> movimentos.
+
+    A matriz conta, p cada linha (ou coluna), quantas peças de cada linha-objetivo estão nela,
+    empacotada num int (size.bit_length() bits por contador). Um movimento leva uma peça
+    de uma linha vizinha p a linha do vazio. A tabela é gerada uma vez por processo
+    (24.964 matrizes no 15-puzzle).
+    """
+    key = (size, blank_goal_line)
+    table = _WALKING_DISTANCE_TABLES.get(key)
+    if table is not None:
+        return table
+    if size > 4:
+        raise ValueError("walking distance só é suportado até o 15-puzzle (a tabela do 5x5 não cabe em memória)")
+    count_bits = size.bit_length()
+    goal = 0
+    for line in range(size):
+        goal += (size - 1 if line == blank_goal_line else size) << (count_bits * (line * size + line))
+    table = {goal: 0}
+    frontier = [(goal, blank_goal_line)]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for code, blank_line in frontier:
+            for neighbor in (blank_line - 1, blank_line + 1):
+                if not 0 <= neighbor < size:
+                    continue
+                for group in range(size):
+                    from_shift = count_bits * (neighbor * size + group)
+                    if (code >> from_shift) & ((1 << count_bits) - 1) == 0:
+                        continue
+                    child = code - (1 << from_shift) + (1 << (count_bits * (blank_line * size + group)))
+                    if child not in table:
+                        table[child] = depth
+                        next_frontier.append((child, neighbor))
+        frontier = next_frontier
+    _WALKING_DISTANCE_TABLES[key] = table
+    return table
+
+def h_walking_distance(state: PackedState, spec: PuzzleSpec = PUZZLE_3X3) -> int:
+    """Heurística admissível walking distance: movimentos verticais + horizontais vistos só por linhas/colunas."""
+    row_table, col_table, bits, tile_mask = spec.walking_row_table, spec.walking_col_table, spec.bits_per_tile, spec.tile_mask
+    rows = cols = 0
+    for cell in range(spec.num_cells):
+        tile = state & tile_mask
+        rows += row_table[tile][cell]
+        cols += col_table[tile][cell]
+        state >>= bits
+    blank_goal_row, blank_goal_col = spec.goal_positions[0]
+    return walking_distance_table(spec.size, blank_goal_row)[rows] + walking_distance_table(spec.size, blank_goal_col)[cols]
+
+# variação de h quando a peça `tile` anda de from_cell p to_cell (usada pelo IDA* p não recalcular h)
+HEURISTIC_MOVE_DELTAS = {
+    h_uniform_cost: lambda tile, from_cell, to_cell, spec: 0,
+    h_manhattan_distance: lambda tile, from_cell, to_cell, spec: spec.manhattan_table[tile][to_cell] - spec.manhattan_table[tile][from_cell],
+    h_non_admissible: lambda tile, from_cell, to_cell, spec: 3 * (spec.manhattan_table[tile][to_cell] - spec.manhattan_table[tile][from_cell]),
+    h_misplaced_tiles: lambda tile, from_cell, to_cell, spec: spec.misplaced_table[tile][to_cell] - spec.misplaced_table[tile][from_cell],
+}
+
+def heuristic_move_delta(heuristic_func) -> Optional[Callable[..., int]]:
+    """Delta de HEURISTIC_MOVE_DELTAS da heurística (ou da que está dentro de um HeuristicCache)."""
+    return HEURISTIC_MOVE_DELTAS.get(getattr(heuristic_func, "heuristic_func", heuristic_func))
+
+# heurísticas que leem o objetivo do spec e por isso servem p qualquer objetivo (ex.: a busca de trás p frente)
+GOAL_AGNOSTIC_HEURISTICS = {h_uniform_cost, h_non_admissible, h_misplaced_tiles, h_manhattan_distance, h_linear_conflict, h_walking_distance}
+
+# heurísticas que nunca superestimam o custo: só com elas o A* anytime tem limite de qualidade
+# (pattern_database.py registra h_pattern_database aqui)
+ADMISSIBLE_HEURISTICS = {h_uniform_cost, h_misplaced_tiles, h_manhattan_distance, h_linear_conflict, h_walking_distance}
+
+def is_admissible(heuristic_func) -> bool:
+    """True se heuristic_func (ou a heurística dentro de um HeuristicCache) é admissível."""
+    return getattr(heuristic_func, "heuristic_func", heuristic_func) in ADMISSIBLE_HEURISTICS
+
+# --- Cache de heurísticas ---
+HEURISTIC_CACHE_SIZE = 1 << 20
+
+class HeuristicCache:
+    """LRU limitado em volta de uma heurística, chaveado pelo estado (e pelo objetivo do spec).
+
+    Funciona como a própria heurística, h(state, spec). Obtida por cached_heuristic, a mesma
+    instância é reaproveitada por todas as buscas do processo, então estados repetidos entre
+    tabuleiros diferentes (resolução em lote) não são recalculados. Se a heurística embrulhada
+    tem delta (HEURISTIC_MOVE_DELTAS), as buscas continuam usando o delta nos filhos e o cache
+    só é consultado na raiz.
+    """
+    def __init__(self, heuristic_func, maxsize: int = HEURISTIC_CACHE_SIZE):
+        self.heuristic_func = heuristic_func
+        self.maxsize = maxsize
+        # a chave inclui o objetivo, então o cache serve a qualquer objetivo se a heurística servir
+        self.goal_agnostic = heuristic_func in GOAL_AGNOSTIC_HEURISTICS
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[Tuple[PackedState, PackedState], int]" = OrderedDict()
+
+    def __call__(self, state: PackedState, spec: PuzzleSpec = PUZZLE_3X3) -> int:
+        key = (state, spec.goal_state)
+        cache = self._cache
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = cache[key] = self.heuristic_func(state, spec)
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False) # descarta o usado há mais tempo
+        return value
+
+    def cache_info(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "size": len(self._cache),
+            "maxsize": self.maxsize,
+        }
+
+    def resize(self, maxsize: int) -> None:
+        """Troca o limite; ao diminuir, descarta os usados há mais tempo até caber."""
+        self.maxsize = maxsize
+        cache = self._cache
+        while len(cache) > maxsize:
+            cache.popitem(last=False)
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+
+_HEURISTIC_CACHES: Dict[Callable, HeuristicCache] = {}
+
+def cached_heuristic(heuristic_func, maxsize: Optional[int] = None) -> HeuristicCache:
+    """Versão com cache LRU de heuristic_func, compartilhada por todas as chamadas do processo.
+
+    maxsize só aumenta um cache já existente (outro chamador pode ter pedido um maior); p
+    diminuir, use cache.resize. Sem maxsize, um cache novo fica com HEURISTIC_CACHE_SIZE.
+    """
+    cache = _HEURISTIC_CACHES.get(heuristic_func)
+    if cache is None:
+        cache = _HEURISTIC_CACHES[heuristic_func] = HeuristicCache(heuristic_func, maxsize or HEURISTIC_CACHE_SIZE)
+    elif maxsize is not None and maxsize > cache.maxsize:
+        cache.resize(maxsize)
+    return cache
+
+def heuristic_cache_info() -> Dict[str, Dict[str, Any]]:
+    """Acertos/erros de todos os caches de heurística criados no processo."""
+    return {getattr(func, "__name__", repr(func)): cache.cache_info() for func, cache in _HEURISTIC_CACHES.items()}
+
+# --- Lista de abertos (fronteira) ---
+# As duas implementações têm a mesma interface: push, decrease_key, pop, len e iteração.
+# Ao melhorar o g de um nó que já está na fronteira, decrease_key insere uma nova entrada
+# e a antiga fica "morta" (remoção preguiçosa): ela é descartada quando sair no pop,
+# pois o g guardado na entrada não bate mais com o g atual do nó.
+class HeapOpenList:
+    """Heap binário ordenado por (f, h) com remoção preguiçosa."""
+    def __init__(self):
+        self._heap: List[Tuple[int, int, int, int, Node]] = []
+        self._counter = 0 # desempate FIFO entre f e h iguais
+        self._size = 0
+
+    def _insert(self, node: Node) -> None:
+        heapq.heappush(self._heap, (node.get_f_score(), node.h, self._counter, node.g, node))
+        self._counter += 1
+
+    def push(self, node: Node) -> None:
+        self._insert(node)
+        self._size += 1
+
+    def decrease_key(self, node: Node) -> None:
+        self._insert(node)
+
+    def pop(self) -> Node:
+        heap = self._heap
+        while heap:
+            _, _, _, g, node = heapq.heappop(heap)
+            if g == node.g:
+                self._size -= 1
+                return node
+        raise IndexError("pop em lista de abertos vazia")
+
+    def peek(self) -> Node:
+        """Próximo nó a sair, sem removê-lo."""
+        heap = self._heap
+        while heap and heap[0][3] != heap[0][4].g:
+            heapq.heappop(heap) # descarta entradas mortas do topo
+        if not heap:
+            raise IndexError("peek em lista de abertos vazia")
+        return heap[0][4]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        return (node for _, _, _, g, node in self._heap if g == node.g)
+
+
+class BucketOpenList:
+    """Fila de baldes indexada por f (inteiro) e, dentro de cada f, por h (menor h sai primeiro)."""
+    def __init__(self):
+        self._buckets: List[List[List[Tuple[int, Node]]]] = [] # [f][h] -> pilha de (g, nó)
+        self._min_f = 0
+        self._size = 0
+
+    def _insert(self, node: Node) -> None:
+        f, h = node.get_f_score(), node.h
+        buckets = self._buckets
+        while len(buckets) <= f:
+            buckets.append([])
+        by_h = buckets[f]
+        while len(by_h) <= h:
+            by_h.append([])
+        by_h[h].append((node.g, node))
+        # heurísticas inconsistentes podem gerar f menor que o mínimo atual
+        if f < self._min_f:
+            self._min_f = f
+
+    def push(self, node: Node) -> None:
+        self._insert(node)
+        self._size += 1
+
+    def decrease_key(self, node: Node) -> None:
+        self._insert(node)
+
+    def pop(self) -> Node:
+        buckets = self._buckets
+        f = self._min_f
+        while f < len(buckets):
+            for bucket in buckets[f]:
+                while bucket:
+                    g, node = bucket.pop()
+                    if g == node.g:
+                        self._min_f = f
+                        self._size -= 1
+                        return node
+            f += 1
+        self._min_f = f
+        raise IndexError("pop em lista de abertos vazia")
+
+    def peek(self) -> Node:
+        """Próximo nó a sair, sem removê-lo."""
+        buckets = self._buckets
+        f = self._min_f
+        while f < len(buckets):
+            for bucket in buckets[f]:
+                while bucket and bucket[-1][0] != bucket[-1][1].g:
+                    bucket.pop() # descarta entradas mortas do topo
+                if bucket:
+                    self._min_f = f
+                    return bucket[-1][1]
+            f += 1
+        self._min_f = f
+        raise IndexError("peek em lista de abertos vazia")
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        return (node for by_h in self._buckets for bucket in by_h for g, node in bucket if g == node.g)
+
+
+OPEN_LIST_BACKENDS = {
+    "heap": HeapOpenList,
+    "bucket": BucketOpenList,
+}
+
+# --- Instrumentação ---
+# Opcional: sem stats a busca roda sem nenhum custo extra. Com stats, a heurística,
+# get_all_successors e a lista de abertos são embrulhados por versões cronometradas.
+class SearchStats:
+    """Contadores, tempos por etapa e curva da fronteira de uma execução do a_star_search."""
+    def __init__(self, sample_every: int = 256):
+        self.sample_every = sample_every # expansões entre duas amostras da fronteira
+        self.expanded = 0
+        self.generated = 0
+        self.pushed = 0
+        self.reopened = 0 # nós da fronteira que ganharam um g menor (decrease_key)
+        self.heuristic_calls = 0
+        self.heuristic_seconds = 0.0
+        self.successor_seconds = 0.0
+        self.open_list_seconds = 0.0
+        self.total_seconds = 0.0
+        self.frontier_samples: List[Tuple[int, int]] = [] # (expansões, tamanho da fronteira)
+
+    @property
+    def duplicates_skipped(self) -> int:
+        """Sucessores descartados: já visitados ou já na fronteira com g igual ou menor (a raiz conta em generated)."""
+        return self.generated - self.pushed - self.reopened
+
+    def wrap_heuristic(self, heuristic_func):
+        """Também serve p os deltas de HEURISTIC_MOVE_DELTAS (mesma contagem e cronômetro)."""
+        perf_counter = time.perf_counter
+        def timed_heuristic(*args) -> int:
+            start = perf_counter()
+            value = heuristic_func(*args)
+            self.heuristic_seconds += perf_counter() - start
+            self.heuristic_calls += 1
+            return value
+        return timed_heuristic
+
+    def wrap_successors(self, successors_func):
+        perf_counter = time.perf_counter
+        def timed_successors(node: Node, spec: Optional[PuzzleSpec] = None) -> List[Node]:
+            start = perf_counter()
+            successors = successors_func(node, spec)
+            self.successor_seconds += perf_counter() - start
+            self.generated += len(successors)
+            return successors
+        return timed_successors
+
+    def to_dict(self) -> Dict[str, Any]:
+        total = self.total_seconds or 1e-9
+        other = max(0.0, self.total_seconds - self.heuristic_seconds - self.successor_seconds - self.open_list_seconds)
+        return {
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "pushed": self.pushed,
+            "reopened": self.reopened,
+            "duplicates_skipped": self.duplicates_skipped,
+            "heuristic_calls": self.heuristic_calls,
+            "total_seconds": round(self.total_seconds, 6),
+            "expanded_per_second": round(self.expanded / total, 1),
+            "seconds": {
+                "heuristic": round(self.heuristic_seconds, 6),
+                "successors": round(self.successor_seconds, 6),
+                "open_list": round(self.open_list_seconds, 6),
+                "other": round(other, 6),
+            },
+            "frontier_samples": self.frontier_samples,
+        }
+
+
+class InstrumentedOpenList:
+    """Embrulha uma lista de abertos cronometrando as operações e amostrando o tamanho da fronteira."""
+    def __init__(self, open_list, stats: SearchStats):
+        self._open_list = open_list
+        self._stats = stats
+
+    def push(self, node: Node) -> None:
+        start = time.perf_counter()
+        self._open_list.push(node)
+        self._stats.open_list_seconds += time.perf_counter() - start
+        self._stats.pushed += 1
+
+    def decrease_key(self, node: Node) -> None:
+        start = time.perf_counter()
+        self._open_list.decrease_key(node)
+        self._stats.open_list_seconds += time.perf_counter() - start
+        self._stats.reopened += 1
+
+    def pop(self) -> Node:
+        stats = self._stats
+        start = time.perf_counter()
+        node = self._open_list.pop()
+        stats.open_list_seconds += time.perf_counter() - start
+        if stats.expanded % stats.sample_every == 0:
+            stats.frontier_samples.append((stats.expanded, len(self._open_list) + 1))
+        stats.expanded += 1
+        return node
+
+    def peek(self) -> Node:
+        start = time.perf_counter()
+        node = self._open_list.peek()
+        self._stats.open_list_seconds += time.perf_counter() - start
+        return node
+
+    def __len__(self) -> int:
+        return len(self._open_list)
+
+    def __iter__(self):
+        return iter(self._open_list)
+
 # --- Algoritmo A* ---
-def a_star_search(initial_state_list: List[List[int]], heuristic_func) -> Optional[Dict[str, Any]]:
-    """Executa o algoritmo de busca A* para resolver o 8-Puzzle."""
-    initial_state = tuple(map(tuple, initial_state_list))
-    initial_h = heuristic_func(initial_state)
-    initial_node = Node(state=initial_state, g=0, h=initial_h)
+def prepare_initial_state(initial_state_list: Union[List[List[int]], PackedState], spec: Optional[PuzzleSpec] = None) -> Tuple[PackedState, PuzzleSpec]:
+    """Codifica o estado inicial e descobre o tamanho do tabuleiro (int compacto sem spec = 8-puzzle)."""
+    if spec is None:
+        spec = PUZZLE_3X3 if isinstance(initial_state_list, int) else get_spec(len(initial_state_list))
+    return encode_state(initial_state_list, spec), spec
+
+def is_solvable(initial_state_list: Union[List[List[int]], PackedState], spec: Optional[PuzzleSpec] = None) -> bool:
+    """Teste de paridade de inversões (objetivo com o vazio no canto inferior direito)."""
+    state, spec = prepare_initial_state(initial_state_list, spec)
+    tiles = [get_tile(state, cell, spec) for cell in range(spec.num_cells)]
+    pieces = [tile for tile in tiles if tile != 0]
+    inversions = sum(1 for i in range(len(pieces)) for j in range(i + 1, len(pieces)) if pieces[i] > pieces[j])
+    if spec.size % 2 == 1:
+        return inversions % 2 == 0
+    # largura par: a linha do vazio (contada de baixo, a partir de 1) entra na paridade
+    blank_row_from_bottom = spec.size - tiles.index(0) // spec.size
+    return (inversions + blank_row_from_bottom) % 2 == 1
 
-    open_list_heap = [initial_node] # fila de prioridade da fronteira de escolha
+def a_star_search(initial_state_list: Union[List[List[int]], PackedState], heuristic_func, open_list_backend: str = "heap", spec: Optional[PuzzleSpec] = None, time_limit: Optional[float] = None, on_expand: Optional[Callable[[Node], None]] = None, stats: Optional[SearchStats] = None) -> Optional[Dict[str, Any]]:
+    """Executa o algoritmo de busca A* para resolver o N-Puzzle.
+
+    open_list_backend escolhe a fronteira: "heap" (heap binário) ou "bucket" (fila de baldes, exige f inteiro).
+    time_limit (segundos) levanta SearchTimeout se a busca passar do prazo.
+    on_expand é chamado com cada nó no momento em que entra nos visitados (exportação em streaming).
+    stats (SearchStats) recebe contadores, tempos por etapa e amostras da fronteira.
+    """
+    start_time = time.perf_counter()
+    deadline = time.time() + time_limit if time_limit is not None else None
+    initial_state, spec = prepare_initial_state(initial_state_list, spec)
+    if not is_solvable(initial_state, spec):
+        return None
+    goal_state = spec.goal_state
+    open_list = OPEN_LIST_BACKENDS[open_list_backend]() # fila de prioridade da fronteira de escolha
+    successors_func = get_all_successors
+    # heurísticas com delta conhecido: h do filho = h do pai + variação da peça movida
+    move_delta = heuristic_move_delta(heuristic_func)
+    if stats is not None:
+        heuristic_func = stats.wrap_heuristic(heuristic_func)
+        if move_delta is not None:
+            move_delta = stats.wrap_heuristic(move_delta)
+        successors_func = stats.wrap_successors(successors_func)
+        open_list = InstrumentedOpenList(open_list, stats)
+        stats.generated += 1 # a raiz entra em pushed sem passar por get_all_successors
+    try:
+        return _a_star_loop(initial_state, spec, goal_state, heuristic_func, move_delta, successors_func, open_list, deadline, time_limit, on_expand)
+    finally:
+        if stats is not None:
+            stats.total_seconds += time.perf_counter() - start_time
+
+def _a_star_loop(initial_state, spec, goal_state, heuristic_func, move_delta, successors_func, open_list, deadline, time_limit, on_expand) -> Optional[Dict[str, Any]]:
+    bits, tile_mask = spec.bits_per_tile, spec.tile_mask
+    initial_h = heuristic_func(initial_state, spec)
+    initial_node = Node(state=initial_state, g=0, h=initial_h, blank=find_blank(initial_state, spec))
+
+    open_list.push(initial_node)
     open_dict = {initial_state: initial_node} # acesso rápido aos nos na fronteira
     closed_dict = {} # nós visitados
     
     max_frontier_size = 1
 
-    while open_list_heap:
-        current_node = heapq.heappop(open_list_heap)
+    while open_list:
+        # consulta o relógio só de tempos em tempos p não pesar no laço
+        if deadline is not None and len(closed_dict) & 1023 == 0 and time.time() > deadline:
+            raise SearchTimeout(f"busca excedeu {time_limit} segundos")
+        current_node = open_list.pop()
         
         if current_node.state in open_dict:
             del open_dict[current_node.state]
@@ -126,52 +734,409 @@ def a_star_search(initial_state_list: List[List[int]], heuristic_func) -> Option
             continue
         
         closed_dict[current_node.state] = current_node
+        if on_expand is not None:
+            on_expand(current_node)
         
         # alcançou o estado final?
-        if current_node.state == GOAL_STATE_TUPLE:
+        if current_node.state == goal_state:
             return {
-                "solution_path": reconstruct_solution_path(current_node),
+                "solution_path": reconstruct_solution_path(current_node, spec),
                 "nodes_visited": len(closed_dict),
                 "max_frontier_size": max_frontier_size,
-                "final_frontier": open_list_heap,
+                "final_frontier": list(open_list),
                 "visited_nodes": closed_dict
             }
 
-        for successor_node in get_all_successors(current_node):
+        for successor_node in successors_func(current_node, spec):
             if successor_node.state in closed_dict:
                 continue
 
-            successor_node.h = heuristic_func(successor_node.state)
-
-            if successor_node.state in open_dict:
-                existing_node = open_dict[successor_node.state]
+            existing_node = open_dict.get(successor_node.state)
+            if existing_node is not None:
                 # se o novo caminho for melhor (menor g), atualiza
                 if successor_node.g < existing_node.g:
                     existing_node.g = successor_node.g
                     existing_node.parent = successor_node.parent
-                    existing_node.action = successor_node.action
-                    heapq.heapify(open_list_heap) # reordena a heap
+                    open_list.decrease_key(existing_node) # O(log n) em vez de re-heapify
             else:
                 # adiciona o novo nó à fronteira
-                heapq.heappush(open_list_heap, successor_node)
+                if move_delta is not None:
+                    # a peça movida agora está onde era o vazio do pai
+                    tile = (successor_node.state >> (current_node.blank * bits)) & tile_mask
+                    successor_node.h = current_node.h + move_delta(tile, successor_node.blank, current_node.blank, spec)
+                else:
+                    successor_node.h = heuristic_func(successor_node.state, spec)
+                open_list.push(successor_node)
                 open_dict[successor_node.state] = successor_node
 
-        max_frontier_size = max(max_frontier_size, len(open_list_heap))
+        max_frontier_size = max(max_frontier_size, len(open_list))
 
     return None # se não encontrar solução
 
+# --- Busca bidirecional ---
+def bidirectional_search(initial_state_list: Union[List[List[int]], PackedState], heuristic_func, open_list_backend: str = "heap", spec: Optional[PuzzleSpec] = None, time_limit: Optional[float] = None, on_expand: Optional[Callable[[Node], None]] = None) -> Optional[Dict[str, Any]]:
+    """A* bidirecional (front-to-end): uma fronteira parte do estado inicial e outra do objetivo.
+
+    Os movimentos são reversíveis, então a busca de trás p frente usa os mesmos sucessores,
+    com a heurística medida até o estado inicial (PuzzleSpec com objetivo trocado). Heurísticas
+    presas ao objetivo padrão (PDB, tabela) viram h = 0 nesse lado, o que continua admissível.
+    Expande sempre o lado com menos nós abertos e para quando o melhor encontro não pode
+    mais ser melhorado: custo <= max(f mín. de cada lado, g mín. frente + g mín. trás + 1).
+    Retorna o mesmo dicionário de métricas do a_star_search.
+    """
+    deadline = time.time() + time_limit if time_limit is not None else None
+    initial_state, spec = prepare_initial_state(initial_state_list, spec)
+    if not is_solvable(initial_state, spec):
+        return None
+    backward_spec = PuzzleSpec(spec.size, goal=[list(row) for row in decode_state(initial_state, spec)])
+    goal_agnostic = heuristic_func in GOAL_AGNOSTIC_HEURISTICS or getattr(heuristic_func, "goal_agnostic", False)
+    backward_h = heuristic_func if goal_agnostic else h_uniform_cost
+
+    # estado de cada lado: [lista de abertos, abertos por estado, visitados, heurística, spec da heurística, contagem de g abertos]
+    sides = []
+    for start, h_func, h_spec in ((initial_state, heuristic_func, spec), (spec.goal_state, backward_h, backward_spec)):
+        node = Node(state=start, g=0, h=h_func(start, h_spec), blank=find_blank(start, spec))
+        open_list = OPEN_LIST_BACKENDS[open_list_backend]()
+        open_list.push(node)
+        sides.append([open_list, {start: node}, {}, h_func, h_spec, [1]])
+
+    def min_open_g(g_counts: List[int]) -> int:
+        for g, count in enumerate(g_counts):
+            if count:
+                return g
+        return 0
+
+    best_cost = 0 if initial_state == spec.goal_state else float('inf')
+    meeting: Optional[Tuple[Node, Node]] = (sides[0][1][initial_state], sides[1][1][initial_state]) if best_cost == 0 else None
+    max_frontier_size = 2
+    expansions = 0
+
+    while sides[0][0] and sides[1][0]:
+        if deadline is not None and expansions & 1023 == 0 and time.time() > deadline:
+            raise SearchTimeout(f"busca excedeu {time_limit} segundos")
+        lower_bound = max(sides[0][0].peek().get_f_score(), sides[1][0].peek().get_f_score(),
+                          min_open_g(sides[0][5]) + min_open_g(sides[1][5]) + 1)
+        if best_cost <= lower_bound:
+            break
+
+        direction = 0 if len(sides[0][0]) <= len(sides[1][0]) else 1
+        open_list, open_dict, closed_dict, h_func, h_spec, g_counts = sides[direction]
+        _, other_open, other_closed, _, _, _ = sides[1 - direction]
+
+        current_node = open_list.pop()
+        del open_dict[current_node.state]
+        g_counts[current_node.g] -= 1
+        closed_dict[current_node.state] = current_node
+        expansions += 1
+        if on_expand is not None:
+            on_expand(current_node)
+
+        for successor_node in get_all_successors(current_node, spec):
+            if successor_node.state in closed_dict:
+                continue
+            existing_node = open_dict.get(successor_node.state)
+            if existing_node is not None:
+                if successor_node.g >= existing_node.g:
+                    continue
+                g_counts[existing_node.g] -= 1
+                existing_node.g = successor_node.g
+                existing_node.parent = successor_node.parent
+                open_list.decrease_key(existing_node)
+                node = existing_node
+            else:
+                successor_node.h = h_func(successor_node.state, h_spec)
+                open_list.push(successor_node)
+                open_dict[successor_node.state] = successor_node
+                node = successor_node
+            while len(g_counts) <= node.g:
+                g_counts.append(0)
+            g_counts[node.g] += 1
+
+            # as duas fronteiras se tocaram?
+            other_node = other_open.get(node.state) or other_closed.get(node.state)
+            if other_node is not None and node.g + other_node.g < best_cost:
+                best_cost = node.g + other_node.g
+                meeting = (node, other_node) if direction == 0 else (other_node, node)
+
+        max_frontier_size = max(max_frontier_size, len(sides[0][0]) + len(sides[1][0]))
+
+    if meeting is None:
+        return None
+
+    # metade da frente pelo encadeamento normal; a de trás é percorrida rumo ao objetivo
+    forward_node, backward_node = meeting
+    solution_path = reconstruct_solution_path(forward_node, spec)
+    node = backward_node
+    while node.parent is not None:
+        solution_path.append(make_action(node.state, node.blank, node.parent.blank, spec))
+        node = node.parent
+
+    forward_closed, backward_closed = sides[0][2], sides[1][2]
+    return {
+        "solution_path": solution_path,
+        "nodes_visited": len(forward_closed) + len(backward_closed),
+        "nodes_visited_forward": len(forward_closed),
+        "nodes_visited_backward": len(backward_closed),
+        "max_frontier_size": max_frontier_size,
+        "final_frontier": list(sides[0][0]) + list(sides[1][0]),
+        "visited_nodes": {**backward_closed, **forward_closed}
+    }
+
+# --- A* anytime (ARA*) ---
+def anytime_a_star(initial_state_list: Union[List[List[int]], PackedState], heuristic_func, weight: float = 3.0, weight_step: float = 0.5, spec: Optional[PuzzleSpec] = None, time_limit: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    """A* ponderado anytime (estilo ARA*): devolve (yield) cada solução melhor que a anterior.
+
+    A primeira busca ordena a fronteira por g + weight * h e acha uma solução rápido. Depois
+    o peso cai weight_step por vez e a busca continua reaproveitando os nós já gerados: só os
+    nós cujo g melhorou depois de fechados (INCONS) voltam p a fronteira. Cada solução vem com
+    "suboptimality_bound" (custo <= bound x ótimo); bound 1 prova a otimalidade e encerra.
+    O bound só vale p h admissível (ADMISSIBLE_HEURISTICS): com outra heurística ele vem
+    None, "proven_optimal" é sempre False e a busca para depois da rodada com peso 1.
+    time_limit (segundos) levanta SearchTimeout dentro do gerador.
+    """
+    if weight < 1:
+        raise ValueError("o peso precisa ser >= 1")
+    start_time = time.time()
+    deadline = start_time + time_limit if time_limit is not None else None
+    initial_state, spec = prepare_initial_state(initial_state_list, spec)
+    if not is_solvable(initial_state, spec):
+        return
+    goal_state = spec.goal_state
+    bits, tile_mask = spec.bits_per_tile, spec.tile_mask
+    move_delta = heuristic_move_delta(heuristic_func)
+    admissible = is_admissible(heuristic_func)
+
+    initial_node = Node(state=initial_state, g=0, h=heuristic_func(initial_state, spec), blank=find_blank(initial_state, spec))
+    nodes = {initial_state: initial_node} # todos os nós gerados, com o melhor g conhecido
+    open_states = {initial_state}
+    incons = set() # melhoraram depois de fechados nesta rodada
+    visited = {}
+    counter = 0
+    heap = [(initial_node.h * weight, initial_node.h, counter, 0, initial_node)]
+    best_cost = float('inf')
+    expansions = 0
+    max_frontier_size = 1
+
+    while True:
+        closed = set()
+        # ImprovePath: expande enquanto algum nó aberto pode levar a um custo menor que o do objetivo
+        while heap:
+            key, _, _, g, node = heap[0]
+            if g != node.g or node.state not in open_states:
+                heapq.heappop(heap) # entrada morta (g mudou ou o nó já saiu da fronteira)
+                continue
+            goal_node = nodes.get(goal_state)
+            if goal_node is not None and goal_node.g <= key:
+                break
+            heapq.heappop(heap)
+            open_states.discard(node.state)
+            closed.add(node.state)
+            visited[node.state] = node
+            expansions += 1
+            if deadline is not None and expansions & 1023 == 0 and time.time() > deadline:
+                raise SearchTimeout(f"busca excedeu {time_limit} segundos")
+
+            for child in get_all_successors(node, spec):
+                existing = nodes.get(child.state)
+                if existing is None:
+                    if move_delta is not None:
+                        tile = (child.state >> (node.blank * bits)) & tile_mask
+                        child.h = node.h + move_delta(tile, child.blank, node.blank, spec)
+                    else:
+                        child.h = heuristic_func(child.state, spec)
+                    nodes[child.state] = existing = child
+                elif child.g < existing.g:
+                    existing.g = child.g
+                    existing.parent = node
+                else:
+                    continue
+                if existing.state in closed:
+                    incons.add(existing.state)
+                else:
+                    open_states.add(existing.state)
+                    counter += 1
+                    heapq.heappush(heap, (existing.g + weight * existing.h, existing.h, counter, existing.g, existing))
+            max_frontier_size = max(max_frontier_size, len(open_states) + len(incons))
+
+        goal_node = nodes.get(goal_state)
+        if goal_node is None:
+            return
+        bound = None
+        proven_optimal = False
+        if admissible:
+            # limite inferior do ótimo: menor g + h entre os nós que ainda podem melhorar o caminho
+            lower_bound = min((nodes[state].get_f_score() for state in open_states | incons), default=goal_node.g)
+            bound = max(min(weight, goal_node.g / lower_bound) if lower_bound > 0 else 1.0, 1.0)
+            proven_optimal = bound <= 1.0
+        if goal_node.g < best_cost or proven_optimal:
+            best_cost = goal_node.g
+            yield {
+                "solution_path": reconstruct_solution_path(goal_node, spec),
+                "cost": goal_node.g,
+                "weight": weight,
+                "suboptimality_bound": None if bound is None else round(bound, 4),
+                "proven_optimal": proven_optimal,
+                "nodes_visited": expansions,
+                "max_frontier_size": max_frontier_size,
+                "elapsed_seconds": round(time.time() - start_time, 4),
+                "final_frontier": [nodes[state] for state in open_states],
+                "visited_nodes": visited,
+            }
+        # com peso 1 e nada em INCONS, outra rodada repetiria esta
+        if proven_optimal or (weight <= 1.0 and not incons):
+            return
+
+        # próxima rodada: peso menor, INCONS de volta p a fronteira e reordenação com o novo peso
+        weight = max(1.0, weight - weight_step)
+        open_states |= incons
+        incons = set()
+        heap = []
+        for state in open_states:
+            node = nodes[state]
+            counter += 1
+            heap.append((node.g + weight * node.h, node.h, counter, node.g, node))
+        heapq.heapify(heap)
+
+def anytime_a_star_search(initial_state_list: Union[List[List[int]], PackedState], heuristic_func, weight: float = 3.0, weight_step: float = 0.5, spec: Optional[PuzzleSpec] = None, time_limit: Optional[float] = None, on_solution: Optional[Callable[[Dict[str, Any]], None]] = None) -> Optional[Dict[str, Any]]:
+    """Roda anytime_a_star até provar a otimalidade ou o prazo acabar e devolve a melhor solução.
+
+    Ao estourar time_limit com alguma solução em mãos, devolve a melhor em vez de levantar
+    SearchTimeout (só levanta se nenhuma solução saiu a tempo). on_solution recebe cada
+    solução assim que é encontrada. Retorna o dicionário de métricas do a_star_search mais
+    "cost", "proven_optimal" e "solutions" (histórico de custo/peso/bound/tempo).
+    """
+    best = None
+    history = []
+    try:
+        for solution in anytime_a_star(initial_state_list, heuristic_func, weight, weight_step, spec, time_limit):
+            best = solution
+            history.append({key: solution[key] for key in ("cost", "weight", "suboptimality_bound", "nodes_visited", "elapsed_seconds")})
+            if on_solution is not None:
+                on_solution(solution)
+    except SearchTimeout:
+        if best is None:
+            raise
+    if best is None:
+        return None
+    return {**best, "solutions": history}
+
+# --- Algoritmo IDA* ---
+def ida_star_search(initial_state_list: Union[List[List[int]], PackedState], heuristic_func, spec: Optional[PuzzleSpec] = None, time_limit: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Executa IDA* (A* com aprofundamento iterativo) p tabuleiros grandes (15/24-puzzle).
+
+    Usa memória proporcional à profundidade: não há open_dict/closed_dict nem objetos Node,
+    só uma pilha com as células do vazio ao longo do caminho, alterada no lugar (append/pop).
+    Retorna o mesmo dicionário de métricas do a_star_search (fronteira e visitados ficam vazios).
+    time_limit (segundos) levanta SearchTimeout se a busca passar do prazo.
+    """
+    deadline = time.time() + time_limit if time_limit is not None else None
+    initial_state, spec = prepare_initial_state(initial_state_list, spec)
+    goal_state = spec.goal_state
+    bits, tile_mask, neighbors = spec.bits_per_tile, spec.tile_mask, spec.blank_neighbors
+    move_delta = heuristic_move_delta(heuristic_func)
+
+    initial_blank = find_blank(initial_state, spec)
+    path = [initial_blank] # células do vazio desde a raiz
+    nodes_visited = 0
+    max_depth = 0
+    if not is_solvable(initial_state, spec):
+        return None # o DFS nunca terminaria num estado sem solução
+    initial_h = heuristic_func(initial_state, spec)
+    bound = initial_h
+    next_bound = bound
+
+    def dfs(state: PackedState, blank: int, g: int, h: int) -> bool:
+        nonlocal nodes_visited, max_depth, next_bound
+        f = g + h
+        if f > bound:
+            if f < next_bound:
+                next_bound = f
+            return False
+        if state == goal_state:
+            return True
+        nodes_visited += 1
+        if deadline is not None and nodes_visited & 4095 == 0 and time.time() > deadline:
+            raise SearchTimeout(f"busca excedeu {time_limit} segundos")
+        if g > max_depth:
+            max_depth = g
+        previous_blank = path[-2] if len(path) > 1 else -1
+        blank_shift = blank * bits
+        for new_cell in neighbors[blank]:
+            if new_cell == previous_blank: # não desfaz o último movimento
+                continue
+            new_shift = new_cell * bits
+            tile = (state >> new_shift) & tile_mask
+            child = state + (tile << blank_shift) - (tile << new_shift)
+            if move_delta is not None:
+                child_h = h + move_delta(tile, new_cell, blank, spec)
+            else:
+                child_h = heuristic_func(child, spec)
+            path.append(new_cell)
+            if dfs(child, new_cell, g + 1, child_h):
+                return True
+            path.pop()
+        return False
+
+    iterations = 0
+    while True:
+        iterations += 1
+        next_bound = float('inf')
+        if dfs(initial_state, initial_blank, 0, initial_h):
+            break
+        bound = next_bound
+
+    # refaz o caminho a partir das células do vazio p montar as ações detalhadas
+    solution_path = []
+    state = initial_state
+    for empty_cell, new_cell in zip(path, path[1:]):
+        action = make_action(state, empty_cell, new_cell, spec)
+        solution_path.append(action)
+        tile = action["moved_tile"]
+        state = state + (tile << (empty_cell * bits)) - (tile << (new_cell * bits))
+
+    return {
+        "solution_path": solution_path,
+        "nodes_visited": nodes_visited,
+        "max_frontier_size": max_depth + 1, # a "fronteira" do IDA* é a pilha do caminho atual
+        "iterations": iterations,
+        "final_frontier": [],
+        "visited_nodes": {}
+    }
+
 # --- Bloco Principal para Execução ---
-if __name__ == "__main__":
+def main() -> None:
+    """Menu interativo: tabuleiro, heurística, algoritmo e formato de saída."""
+    from pattern_database import PatternDatabaseMissing, h_pattern_database
+    from search_export import open_search_writer
+
     initial_states = {
         "facil": [[1, 2, 3], [4, 5, 6], [0, 7, 8]],
         "medio": [[1, 3, 0], [4, 2, 5], [7, 8, 6]],
-        "dificil": [[8, 6, 7], [2, 5, 4], [3, 0, 1]]
+        "dificil": [[8, 6, 7], [2, 5, 4], [3, 0, 1]],
+        "15puzzle": [[1, 6, 0, 4], [9, 7, 2, 3], [12, 5, 15, 8], [13, 10, 11, 14]]
+    }
+    algorithms = {
+        "1": ("A*", a_star_search),
+        "2": ("IDA*", ida_star_search),
+        "3": ("A* Bidirecional", bidirectional_search),
+        "4": ("A* Anytime (ARA*)", anytime_a_star_search)
     }
     heuristics = {
         "1": ("Custo Uniforme", h_uniform_cost),
         "2": ("A* Nao Admissivel", h_non_admissible),
         "3": ("A* Pecas Fora do Lugar", h_misplaced_tiles),
-        "4": ("A* Distancia de Manhattan", h_manhattan_distance)
+        "4": ("A* Distancia de Manhattan", h_manhattan_distance),
+        "5": ("A* Pattern Database", h_pattern_database),
+        "6": ("A* Conflito Linear", h_linear_conflict),
+        "7": ("A* Walking Distance", h_walking_distance)
+    }
+    # (nome, formato, compressão, extensão); json é o arquivo completo de sempre, os demais são gravados durante a busca
+    export_formats = {
+        "1": ("JSON completo", None, None, "json"),
+        "2": ("NDJSON (streaming)", "ndjson", None, "ndjson"),
+        "3": ("NDJSON + gzip", "ndjson", "gzip", "ndjson.gz"),
+        "4": ("Binario colunar", "binary", None, "bin"),
+        "5": ("Binario colunar + lzma", "binary", "lzma", "bin.xz")
     }
 
     print("Escolha o tabuleiro inicial:")
@@ -183,12 +1148,52 @@ if __name__ == "__main__":
     print("\nEscolha a heurística:")
     for key, (name, _) in heuristics.items():
         print(f"{key}: {name}")
-    heuristic_choice = input("Digite sua escolha (1-4): ")
+    heuristic_choice = input("Digite sua escolha (1-7): ")
     heuristic_name, heuristic_func = heuristics.get(heuristic_choice, heuristics["4"])
 
-    print(f"\nIniciando busca com {heuristic_name}...")
+    print("\nEscolha o algoritmo:")
+    for key, (name, _) in algorithms.items():
+        print(f"{key}: {name}")
+    algorithm_choice = input("Digite sua escolha (1-4): ")
+    algorithm_name, search_func = algorithms.get(algorithm_choice, algorithms["1"])
+    spec = get_spec(len(initial_state))
+
+    search_kwargs = {}
+    if search_func is anytime_a_star_search:
+        budget = input("Tempo limite em segundos (vazio = até provar a solução ótima): ").strip()
+        search_kwargs["time_limit"] = float(budget) if budget else None
+        search_kwargs["on_solution"] = lambda solution: print(
+            f"  solucao com {solution['cost']} movimentos (peso {solution['weight']}, "
+            + (f"no maximo {solution['suboptimality_bound']}x o otimo" if solution['suboptimality_bound'] is not None
+               else "sem limite de qualidade: h nao admissivel")
+            + f") em {solution['elapsed_seconds']:.4f} s")
+
+    print("\nEscolha o formato do arquivo de saída:")
+    for key, (name, *_) in export_formats.items():
+        print(f"{key}: {name}")
+    export_choice = input("Digite sua escolha (1-5): ")
+    _, export_format, export_compression, export_extension = export_formats.get(export_choice, export_formats["1"])
+
+    safe_name = heuristic_name.replace(' ', '_').replace('*', 'estrela').lower()
+    output_filename = f"resultado_{board_choice}_{safe_name}.{export_extension}"
+
+    try:
+        heuristic_func(spec.goal_state, spec) # carrega as tabelas (PDB) antes de abrir a saída
+    except PatternDatabaseMissing as exc:
+        print(f"\n{exc}")
+        raise SystemExit(1)
+
+    writer = None
+    if export_format is not None:
+        writer = open_search_writer(output_filename, spec, export_format, export_compression, metadata={
+            "board_choice": board_choice, "algorithm_used": algorithm_name, "heuristic_used": heuristic_name
+        })
+        if search_func in (a_star_search, bidirectional_search):
+            search_kwargs["on_expand"] = writer.write_visited
+
+    print(f"\nIniciando busca {algorithm_name} com {heuristic_name}...")
     start_time = time.time()
-    result = a_star_search(initial_state, heuristic_func)
+    result = search_func(initial_state, heuristic_func, **search_kwargs)
     execution_time = time.time() - start_time
 
     if result:
@@ -207,36 +1212,57 @@ if __name__ == "__main__":
         # Requisito d) - maior tamanho da fronteira
         print(f"Maior tamanho da fronteira: {result['max_frontier_size']}")
 
-        # Requisito e) - salvar fronteira e visitados em um arquivo .json
-        final_frontier_serializable = [
-            {"state": node.state, "g": node.g, "h": node.h, "f": node.get_f_score()}
-            for node in result['final_frontier']
-        ]
-        
-        visited_nodes_serializable = {
-            str(state_tuple): {"state": state_tuple, "g": node.g, "h": node.h, "f": node.get_f_score()}
-            for state_tuple, node in result['visited_nodes'].items()
-        }
-
-        output_data = {
-            "board_choice": board_choice,
-            "heuristic_used": heuristic_name,
+        # Requisito e) - salvar fronteira e visitados em um arquivo
+        summary = {
             "execution_time_seconds": round(execution_time, 4),
             "path_length": len(path),
             "nodes_visited": result['nodes_visited'],
             "max_frontier_size": result['max_frontier_size'],
-            "solution_path": result['solution_path'],
-            "final_frontier": final_frontier_serializable,
-            "visited_nodes": visited_nodes_serializable
+            "solution_path": result['solution_path']
         }
-        
-        safe_name = heuristic_name.replace(' ', '_').replace('*', 'estrela').lower()
-        output_filename = f"resultado_{board_choice}_{safe_name}.json"
-        
-        with open(output_filename, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=4, ensure_ascii=False)
+        if writer is not None:
+            # os visitados já foram gravados durante a busca (on_expand); os demais algoritmos só os têm no fim
+            if "on_expand" not in search_kwargs:
+                for node in result['visited_nodes'].values():
+                    writer.write_visited(node)
+            for node in result['final_frontier']:
+                writer.write_frontier(node)
+            writer.write_summary(summary)
+            writer.close()
+        else:
+            final_frontier_serializable = [
+                {"state": decode_state(node.state, spec), "g": node.g, "h": node.h, "f": node.get_f_score()}
+                for node in result['final_frontier']
+            ]
+            
+            visited_nodes_serializable = {
+                str(decode_state(state, spec)): {"state": decode_state(state, spec), "g": node.g, "h": node.h, "f": node.get_f_score()}
+                for state, node in result['visited_nodes'].items()
+            }
+
+            output_data = {
+                "board_choice": board_choice,
+                "algorithm_used": algorithm_name,
+                "heuristic_used": heuristic_name,
+                **summary,
+                "final_frontier": final_frontier_serializable,
+                "visited_nodes": visited_nodes_serializable
+            }
+            
+            with open(output_filename, 'w', encoding='utf-8') as f:
+                json.dump(output_data, f, indent=4, ensure_ascii=False)
             
         print(f"Dados completos da busca salvos em '{output_filename}'")
         
     else:
-        print("Nao foi possivel encontrar uma solucao.")
\ No newline at end of file
+        if writer is not None:
+            writer.write_summary({"execution_time_seconds": round(execution_time, 4), "solution_found": False})
+            writer.close()
+        print("Nao foi possivel encontrar uma solucao.")
+
+
+if __name__ == "__main__":
+    # roda o menu no módulo importado, não em __main__: pattern_database importa Trabalho_1 e
+    # registra a sua heurística lá (ADMISSIBLE_HEURISTICS), então só existe uma cópia dos registros
+    import Trabalho_1
+    Trabalho_1.main()
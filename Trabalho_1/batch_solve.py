@@ -0,0 +1,231 @@
+# Python 3
+"""Resolução em lote de vários tabuleiros em paralelo.
+
+Lê um arquivo com um tabuleiro por linha (N*N números, 0 = vazio, linha por linha;
+linhas vazias ou começando com '#' são ignoradas), descarta de cara os estados sem
+solução pelo teste de paridade e distribui as buscas num pool de processos.
+Os resultados saem um por tabuleiro, na ordem em que terminam, em NDJSON.
+
+Uso:
+    python batch_solve.py tabuleiros.txt --heuristic manhattan --workers 4 --timeout 30
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+
+from Trabalho_1 import (
+    SearchTimeout, a_star_search, anytime_a_star_search, ida_star_search, is_solvable, cached_heuristic,
+    h_uniform_cost, h_non_admissible, h_misplaced_tiles, h_manhattan_distance, h_linear_conflict, h_walking_distance,
+)
+from pattern_database import h_pattern_database
+
+HEURISTICS = {
+    "uniform": h_uniform_cost,
+    "non_admissible": h_non_admissible,
+    "misplaced": h_misplaced_tiles,
+    "manhattan": h_manhattan_distance,
+    "linear_conflict": h_linear_conflict,
+    "walking_distance": h_walking_distance,
+    "pdb": h_pattern_database,
+}
+ALGORITHMS = {
+    "astar": a_star_search,
+    "idastar": ida_star_search,
+    "anytime": anytime_a_star_search, # com --timeout devolve a melhor solução achada no prazo
+}
+MOVE_LETTERS = {"UP": "U", "DOWN": "D", "LEFT": "L", "RIGHT": "R"}
+
+
+def parse_board(line: str) -> List[List[int]]:
+    """Converte '8 6 7 2 5 4 3 0 1' (ou [[8,6,7],...]) num tabuleiro NxN."""
+    tiles = [int(tok) for tok in re.findall(r"\d+", line)]
+    size = int(round(len(tiles) ** 0.5))
+    if size < 2 or size * size != len(tiles) or sorted(tiles) != list(range(len(tiles))):
+        raise ValueError(f"tabuleiro inválido: {line.strip()!r}")
+    return [tiles[r * size:(r + 1) * size] for r in range(size)]
+
+def read_boards(path: str) -> Iterator[List[List[int]]]:
+    """Lê os tabuleiros do arquivo sob demanda."""
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                yield parse_board(line)
+            except ValueError as exc:
+                raise ValueError(f"{path}:{line_number}: {exc}") from None
+
+
+class BatchStats:
+    """Estatísticas agregadas de um lote."""
+    def __init__(self):
+        self.boards = 0
+        self.solved = 0
+        self.unsolvable = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.nodes_visited = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.search_seconds = 0.0 # soma dos tempos de cada busca (CPU dos workers)
+        self.start_time = time.time()
+        self.wall_seconds = 0.0
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self.boards += 1
+        status = result["status"]
+        if status == "solved":
+            self.solved += 1
+        elif status == "unsolvable":
+            self.unsolvable += 1
+        elif status == "timeout":
+            self.timeouts += 1
+        elif status == "error":
+            self.errors += 1
+        self.nodes_visited += result.get("nodes_visited", 0)
+        self.cache_hits += result.get("cache_hits", 0)
+        self.cache_misses += result.get("cache_misses", 0)
+        self.search_seconds += result.get("time_seconds", 0.0)
+        self.wall_seconds = time.time() - self.start_time
+
+    def summary(self) -> Dict[str, Any]:
+        wall = self.wall_seconds or 1e-9
+        lookups = self.cache_hits + self.cache_misses
+        summary = {
+            "boards": self.boards,
+            "solved": self.solved,
+            "unsolvable": self.unsolvable,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "search_seconds": round(self.search_seconds, 4),
+            "boards_per_second": round(self.boards / wall, 2),
+            "nodes_per_second": round(self.nodes_visited / wall, 1),
+        }
+        if lookups:
+            summary.update(cache_hits=self.cache_hits, cache_misses=self.cache_misses,
+                           cache_hit_rate=round(self.cache_hits / lookups, 4))
+        return summary
+
+
+def solve_one(index: int, board: List[List[int]], heuristic: str, algorithm: str, timeout: Optional[float],
+              cache_size: Optional[int] = None) -> Dict[str, Any]:
+    """Resolve um tabuleiro (roda dentro do worker).
+
+    Com cache_size, a heurística passa pelo cache LRU do processo, que continua valendo
+    p os próximos tabuleiros resolvidos pelo mesmo worker.
+    """
+    result = {"index": index, "board": board}
+    heuristic_func = HEURISTICS[heuristic]
+    if cache_size:
+        heuristic_func = cached_heuristic(heuristic_func, cache_size)
+        hits_before, misses_before = heuristic_func.hits, heuristic_func.misses
+    start_time = time.time()
+    try:
+        search = ALGORITHMS[algorithm](board, heuristic_func, time_limit=timeout)
+    except SearchTimeout:
+        result.update(status="timeout", time_seconds=round(time.time() - start_time, 4))
+        return result
+    execution_time = time.time() - start_time
+    if search is None:
+        result.update(status="unsolvable", time_seconds=round(execution_time, 4))
+        return result
+    path = search["solution_path"]
+    if cache_size:
+        result["cache_hits"] = heuristic_func.hits - hits_before
+        result["cache_misses"] = heuristic_func.misses - misses_before
+    result.update(
+        status="solved",
+        path_length=len(path),
+        moves="".join(MOVE_LETTERS[action["move_direction"]] for action in path),
+        nodes_visited=search["nodes_visited"],
+        max_frontier_size=search["max_frontier_size"],
+        time_seconds=round(execution_time, 4),
+    )
+    return result
+
+def solve_batch(boards: Iterable[List[List[int]]], heuristic: str = "manhattan", algorithm: str = "astar",
+                workers: Optional[int] = None, timeout: Optional[float] = None,
+                stats: Optional[BatchStats] = None, cache_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Resolve vários tabuleiros num pool de processos, devolvendo cada resultado assim que fica pronto.
+
+    Tabuleiros sem solução são descartados antes de irem p o pool. No máximo
+    4 * workers buscas ficam pendentes por vez, então o arquivo de entrada é lido aos poucos.
+    cache_size liga o cache LRU da heurística em cada worker (ver solve_one).
+    Uma busca que falha (exceção no worker, worker morto) vira um resultado com status "error"
+    e o lote continua.
+    """
+    if heuristic not in HEURISTICS:
+        raise ValueError(f"heurística desconhecida: {heuristic}")
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"algoritmo desconhecido: {algorithm}")
+    workers = workers or os.cpu_count() or 1
+    max_pending = 4 * workers
+
+    def record(result: Dict[str, Any]) -> Dict[str, Any]:
+        if stats is not None:
+            stats.add(result)
+        return result
+
+    def failed(index: int, board: List[List[int]], exc: BaseException) -> Dict[str, Any]:
+        return {"index": index, "board": board, "status": "error", "error": repr(exc), "time_seconds": 0.0}
+
+    def collect(future) -> Dict[str, Any]:
+        index, board = pending.pop(future)
+        try:
+            return future.result()
+        except Exception as exc:
+            return failed(index, board, exc)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {} # future -> (índice, tabuleiro), p montar o registro de erro
+        for index, board in enumerate(boards):
+            if not is_solvable(board):
+                yield record({"index": index, "board": board, "status": "unsolvable", "time_seconds": 0.0})
+                continue
+            try:
+                future = pool.submit(solve_one, index, board, heuristic, algorithm, timeout, cache_size)
+            except BrokenProcessPool as exc: # um worker morreu: o pool não aceita mais buscas
+                yield record(failed(index, board, exc))
+                continue
+            pending[future] = (index, board)
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield record(collect(future))
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield record(collect(future))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resolve em paralelo os tabuleiros de um arquivo.")
+    parser.add_argument("boards_file", help="um tabuleiro por linha (N*N números, 0 = vazio)")
+    parser.add_argument("--heuristic", choices=sorted(HEURISTICS), default="manhattan")
+    parser.add_argument("--algorithm", choices=sorted(ALGORITHMS), default="astar")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: número de CPUs)")
+    parser.add_argument("--timeout", type=float, default=None, help="limite de tempo por tabuleiro, em segundos")
+    parser.add_argument("--cache", type=int, default=None, metavar="N",
+                        help="cache LRU de até N valores da heurística por worker, mantido entre tabuleiros")
+    parser.add_argument("--output", default=None, help="arquivo NDJSON de saída (padrão: stdout)")
+    args = parser.parse_args()
+
+    stats = BatchStats()
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for result in solve_batch(read_boards(args.boards_file), args.heuristic, args.algorithm,
+                                  args.workers, args.timeout, stats, args.cache):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(json.dumps(stats.summary(), ensure_ascii=False), file=sys.stderr)
@@ -0,0 +1,208 @@
+# Python 3
+"""Benchmark do A*: todas as heurísticas sobre um conjunto fixo (semente) de tabuleiros aleatórios solúveis.
+
+Para cada (tabuleiro, heurística) são feitas três medições:
+- tempo puro (sem instrumentação; melhor de --repeat execuções) -> nós/segundo;
+- uma execução com SearchStats -> contadores, divisão do tempo e curva da fronteira;
+- uma execução sob tracemalloc -> pico de memória (bytes e bytes por nó visitado).
+
+O relatório é um JSON comparável entre versões: com --compare, as quedas de nós/segundo
+e os aumentos de memória acima de --tolerance são listados e o processo sai com código 1.
+Heurísticas que não valem p o tamanho pedido (walking distance no 5x5, PDB não gerada)
+são puladas e aparecem em "skipped" com o motivo.
+
+Uso:
+    python benchmark.py --boards 10 --seed 42 --output bench.json
+    python benchmark.py --output novo.json --compare bench.json --tolerance 0.15
+"""
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tracemalloc
+from typing import List, Dict, Any, Optional, Sequence
+
+from Trabalho_1 import OPEN_LIST_BACKENDS, SearchStats, SearchTimeout, a_star_search, get_spec, is_solvable
+from batch_solve import HEURISTICS
+from pattern_database import PatternDatabaseMissing
+
+REPORT_VERSION = 1
+
+
+def random_solvable_boards(count: int, size: int = 3, seed: int = 42) -> List[List[List[int]]]:
+    """Tabuleiros embaralhados uniformemente; os sem solução são sorteados de novo."""
+    rng = random.Random(seed)
+    num_cells = size * size
+    boards = []
+    while len(boards) < count:
+        tiles = list(range(num_cells))
+        rng.shuffle(tiles)
+        board = [tiles[r * size:(r + 1) * size] for r in range(size)]
+        if is_solvable(board):
+            boards.append(board)
+    return boards
+
+
+def run_case(board: List[List[int]], heuristic: str, backend: str, repeat: int, timeout: Optional[float],
+             measure_memory: bool) -> Dict[str, Any]:
+    """Mede um par (tabuleiro, heurística)."""
+    heuristic_func = HEURISTICS[heuristic]
+    case = {"board": board, "heuristic": heuristic, "backend": backend}
+    try:
+        best = float("inf")
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            result = a_star_search(board, heuristic_func, backend, time_limit=timeout)
+            best = min(best, time.perf_counter() - start)
+        stats = SearchStats()
+        a_star_search(board, heuristic_func, backend, time_limit=timeout, stats=stats)
+    except SearchTimeout:
+        case["status"] = "timeout"
+        return case
+
+    case.update(
+        status="solved",
+        path_length=len(result["solution_path"]),
+        nodes_visited=result["nodes_visited"],
+        max_frontier_size=result["max_frontier_size"],
+        seconds=round(best, 6),
+        nodes_per_second=round(result["nodes_visited"] / (best or 1e-9), 1),
+        stats=stats.to_dict(),
+    )
+    if measure_memory:
+        del result
+        tracemalloc.start()
+        try:
+            result = a_star_search(board, heuristic_func, backend, time_limit=timeout)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        case["peak_memory_bytes"] = peak
+        case["bytes_per_node"] = round(peak / (result["nodes_visited"] + result["max_frontier_size"]), 1)
+    return case
+
+
+def summarize(cases: Sequence[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Totais por heurística (só casos resolvidos)."""
+    summary: Dict[str, Dict[str, Any]] = {}
+    for heuristic in dict.fromkeys(case["heuristic"] for case in cases):
+        solved = [case for case in cases if case["heuristic"] == heuristic and case["status"] == "solved"]
+        nodes = sum(case["nodes_visited"] for case in solved)
+        seconds = sum(case["seconds"] for case in solved)
+        entry = {
+            "solved": len(solved),
+            "timeouts": sum(1 for case in cases if case["heuristic"] == heuristic and case["status"] == "timeout"),
+            "nodes_visited": nodes,
+            "seconds": round(seconds, 6),
+            "nodes_per_second": round(nodes / (seconds or 1e-9), 1),
+        }
+        split = {"heuristic": 0.0, "successors": 0.0, "open_list": 0.0, "other": 0.0}
+        for case in solved:
+            for part, value in case["stats"]["seconds"].items():
+                split[part] += value
+        split_total = sum(split.values()) or 1e-9
+        entry["time_fraction"] = {part: round(value / split_total, 4) for part, value in split.items()}
+        peaks = [case["peak_memory_bytes"] for case in solved if "peak_memory_bytes" in case]
+        if peaks:
+            entry["max_peak_memory_bytes"] = max(peaks)
+            entry["mean_bytes_per_node"] = round(sum(case["bytes_per_node"] for case in solved) / len(solved), 1)
+        summary[heuristic] = entry
+    return summary
+
+
+def run_benchmark(heuristics: Sequence[str], boards: int = 10, size: int = 3, seed: int = 42, backend: str = "heap",
+                  repeat: int = 3, timeout: Optional[float] = None, measure_memory: bool = True,
+                  progress=None) -> Dict[str, Any]:
+    """Roda o benchmark completo e devolve o relatório."""
+    spec = get_spec(size)
+    supported, skipped = [], {}
+    for heuristic in heuristics:
+        try:
+            HEURISTICS[heuristic](spec.goal_state, spec) # carrega PDBs/tabelas antes de medir
+        except (ValueError, PatternDatabaseMissing) as e:
+            skipped[heuristic] = str(e)
+        else:
+            supported.append(heuristic)
+    cases = []
+    for index, board in enumerate(random_solvable_boards(boards, size, seed)):
+        for heuristic in supported:
+            case = run_case(board, heuristic, backend, repeat, timeout, measure_memory)
+            case["index"] = index
+            cases.append(case)
+            if progress is not None:
+                progress(case)
+    return {
+        "version": REPORT_VERSION,
+        "config": {"boards": boards, "size": size, "seed": seed, "backend": backend, "repeat": repeat,
+                   "timeout": timeout, "heuristics": list(heuristics)},
+        "environment": {"python": platform.python_version(), "implementation": platform.python_implementation(),
+                        "machine": platform.machine(), "created": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "summary": summarize(cases),
+        "skipped": skipped,
+        "cases": cases,
+    }
+
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.1) -> List[str]:
+    """Lista as regressões do relatório atual em relação à referência.
+
+    Nós/segundo menores que (1 - tolerance) vezes a referência ou memória maior que
+    (1 + tolerance) vezes contam como regressão. Mudança em nodes_visited no mesmo
+    tabuleiro também é listada (a busca deveria ser determinística).
+    """
+    if current["config"]["seed"] != baseline["config"]["seed"] or current["config"]["size"] != baseline["config"]["size"]:
+        return ["relatórios com semente ou tamanho de tabuleiro diferentes não são comparáveis"]
+    problems = []
+    for heuristic, entry in current["summary"].items():
+        base = baseline["summary"].get(heuristic)
+        if base is None:
+            continue
+        if entry["nodes_per_second"] < base["nodes_per_second"] * (1 - tolerance):
+            problems.append(f"{heuristic}: nós/segundo {base['nodes_per_second']} -> {entry['nodes_per_second']}")
+        if "max_peak_memory_bytes" in entry and "max_peak_memory_bytes" in base \
+                and entry["max_peak_memory_bytes"] > base["max_peak_memory_bytes"] * (1 + tolerance):
+            problems.append(f"{heuristic}: pico de memória {base['max_peak_memory_bytes']} -> {entry['max_peak_memory_bytes']}")
+    base_cases = {(case["index"], case["heuristic"]): case for case in baseline["cases"]}
+    for case in current["cases"]:
+        base = base_cases.get((case["index"], case["heuristic"]))
+        if base is not None and case.get("nodes_visited") != base.get("nodes_visited"):
+            problems.append(f"tabuleiro {case['index']} / {case['heuristic']}: nodes_visited "
+                            f"{base.get('nodes_visited')} -> {case.get('nodes_visited')}")
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark reprodutível do A* com todas as heurísticas.")
+    parser.add_argument("--boards", type=int, default=10, help="quantidade de tabuleiros aleatórios")
+    parser.add_argument("--size", type=int, default=3, help="lado do tabuleiro (padrão: 8-puzzle)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--heuristics", nargs="+", choices=sorted(HEURISTICS), default=list(HEURISTICS))
+    parser.add_argument("--backend", choices=sorted(OPEN_LIST_BACKENDS), default="heap")
+    parser.add_argument("--repeat", type=int, default=3, help="execuções de tempo por caso (vale a melhor)")
+    parser.add_argument("--timeout", type=float, default=None, help="limite de tempo por busca, em segundos")
+    parser.add_argument("--no-memory", action="store_true", help="pula a medição com tracemalloc")
+    parser.add_argument("--output", default="benchmark.json", help="arquivo do relatório")
+    parser.add_argument("--compare", default=None, help="relatório de referência p detectar regressões")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="variação relativa aceita na comparação")
+    args = parser.parse_args()
+
+    def progress(case: Dict[str, Any]) -> None:
+        detail = f"{case['nodes_visited']} nós, {case['nodes_per_second']:.0f} nós/s" if case["status"] == "solved" else case["status"]
+        print(f"[{case['index']}] {case['heuristic']}: {detail}", file=sys.stderr)
+
+    report = run_benchmark(args.heuristics, args.boards, args.size, args.seed, args.backend, args.repeat,
+                           args.timeout, not args.no_memory, progress)
+    for heuristic, reason in report["skipped"].items():
+        print(f"{heuristic}: pulada ({reason})", file=sys.stderr)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(json.dumps(report["summary"], indent=2, ensure_ascii=False))
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            problems = compare_reports(report, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSAO: {problem}", file=sys.stderr)
+        sys.exit(1 if problems else 0)
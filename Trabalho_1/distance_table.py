@@ -0,0 +1,227 @@
+# Python 3
+"""Tabela com a distância ótima de todos os estados do 8-Puzzle até o objetivo.
+
+Gerada offline por uma BFS reversa a partir de GOAL_STATE_TUPLE e salva como um
+vetor de bytes indexado pelo rank (código de Lehmer) da permutação das 9 células.
+Na carga o arquivo é mapeado em memória (mmap), então a consulta é O(1) sem ler o arquivo todo.
+
+Uso:
+    python distance_table.py build
+    python distance_table.py query 8 6 7 2 5 4 3 0 1
+    python distance_table.py check
+"""
+import os
+import sys
+import mmap
+import time
+from typing import List, Dict, Any, Optional, Union
+
+from Trabalho_1 import (
+    NUM_CELLS, BITS_PER_TILE, TILE_MASK, GOAL_STATE, BLANK_MOVES, PackedState, PuzzleSpec, Node,
+    encode_state, find_blank, get_all_successors, reconstruct_solution_path,
+    h_uniform_cost, h_non_admissible, h_misplaced_tiles, h_manhattan_distance, h_linear_conflict, h_walking_distance,
+)
+from pattern_database import PatternDatabaseMissing, h_pattern_database
+
+TABLE_MAGIC = b"8PZD"
+TABLE_VERSION = 1
+HEADER_SIZE = 8
+UNREACHABLE = 0xFF
+
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tabela_distancias_8puzzle.bin")
+
+FACTORIALS = [1] * (NUM_CELLS + 1)
+for _i in range(1, NUM_CELLS + 1):
+    FACTORIALS[_i] = FACTORIALS[_i - 1] * _i
+NUM_PERMUTATIONS = FACTORIALS[NUM_CELLS] # 9! (metade deles é alcançável)
+
+# popcount de máscaras de 9 bits p o cálculo do rank
+_POPCOUNT = [bin(_m).count("1") for _m in range(1 << NUM_CELLS)]
+
+
+# --- Rank de permutações ---
+def state_rank(state: PackedState) -> int:
+    """Rank lexicográfico (código de Lehmer) da permutação guardada no estado compacto."""
+    rank = 0
+    used = 0
+    for cell in range(NUM_CELLS):
+        tile = state & TILE_MASK
+        state >>= BITS_PER_TILE
+        # quantas peças menores ainda não apareceram
+        smaller = tile - _POPCOUNT[used & ((1 << tile) - 1)]
+        rank += smaller * FACTORIALS[NUM_CELLS - 1 - cell]
+        used |= 1 << tile
+    return rank
+
+def state_unrank(rank: int) -> PackedState:
+    """Inversa de state_rank."""
+    remaining = list(range(NUM_CELLS))
+    state = 0
+    for cell in range(NUM_CELLS):
+        idx, rank = divmod(rank, FACTORIALS[NUM_CELLS - 1 - cell])
+        state |= remaining.pop(idx) << (cell * BITS_PER_TILE)
+    return state
+
+
+# --- Construção ---
+def build_distance_table() -> bytearray:
+    """BFS reversa a partir do objetivo (os movimentos são reversíveis)."""
+    distances = bytearray([UNREACHABLE]) * NUM_PERMUTATIONS
+    distances[state_rank(GOAL_STATE)] = 0
+    frontier = [(GOAL_STATE, find_blank(GOAL_STATE))]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for state, blank in frontier:
+            blank_shift = blank * BITS_PER_TILE
+            for new_cell, _ in BLANK_MOVES[blank]:
+                new_shift = new_cell * BITS_PER_TILE
+                tile = (state >> new_shift) & TILE_MASK
+                child = state + (tile << blank_shift) - (tile << new_shift)
+                rank = state_rank(child)
+                if distances[rank] == UNREACHABLE:
+                    distances[rank] = depth
+                    next_frontier.append((child, new_cell))
+        frontier = next_frontier
+    return distances
+
+def save_distance_table(distances: bytearray, path: str = DEFAULT_TABLE_PATH) -> None:
+    # grava num temporário e renomeia: vários processos podem gerar a tabela ao mesmo tempo
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(TABLE_MAGIC + bytes([TABLE_VERSION, 0, 0, 0]))
+        f.write(distances)
+    os.replace(tmp_path, path)
+
+
+# --- Consulta ---
+class DistanceTable:
+    """Tabela de distâncias mapeada em memória a partir do arquivo gerado por build."""
+    def __init__(self, path: str = DEFAULT_TABLE_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:4] != TABLE_MAGIC or self._mm[4] != TABLE_VERSION:
+            self._mm.close()
+            raise ValueError(f"arquivo '{path}' não é uma tabela de distâncias válida")
+        if len(self._mm) != HEADER_SIZE + NUM_PERMUTATIONS:
+            self._mm.close()
+            raise ValueError(f"tabela '{path}' com tamanho inesperado")
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def distance(self, state: Union[PackedState, List[List[int]]]) -> Optional[int]:
+        """Tamanho da solução ótima (None se o estado não tem solução)."""
+        value = self._mm[HEADER_SIZE + state_rank(encode_state(state))]
+        return None if value == UNREACHABLE else value
+
+    def solve(self, initial_state_list: Union[PackedState, List[List[int]]]) -> Optional[Dict[str, Any]]:
+        """Reconstrói um caminho ótimo por descida gulosa na tabela, sem rodar o A*.
+
+        Retorna o mesmo dicionário de métricas que a_star_search.
+        """
+        node = Node(state=encode_state(initial_state_list))
+        dist = self.distance(node.state)
+        if dist is None:
+            return None
+        nodes_visited = 1
+        while dist > 0:
+            # algum vizinho está sempre exatamente um passo mais perto
+            for successor in get_all_successors(node):
+                if self._mm[HEADER_SIZE + state_rank(successor.state)] == dist - 1:
+                    node = successor
+                    break
+            dist -= 1
+            nodes_visited += 1
+        return {
+            "solution_path": reconstruct_solution_path(node),
+            "nodes_visited": nodes_visited,
+            "max_frontier_size": 0,
+            "final_frontier": [],
+            "visited_nodes": {}
+        }
+
+    def heuristic(self, state: PackedState, spec: Optional[PuzzleSpec] = None) -> int:
+        """Heurística perfeita (h = h*)."""
+        return self._mm[HEADER_SIZE + state_rank(state)]
+
+
+_default_table: Optional[DistanceTable] = None
+
+def load_distance_table(path: str = DEFAULT_TABLE_PATH, build_if_missing: bool = True) -> DistanceTable:
+    """Carrega a tabela padrão uma vez por processo (gera o arquivo se ainda não existir)."""
+    global _default_table
+    if path == DEFAULT_TABLE_PATH and _default_table is not None:
+        return _default_table
+    if not os.path.exists(path):
+        if not build_if_missing:
+            raise FileNotFoundError(path)
+        save_distance_table(build_distance_table(), path)
+    table = DistanceTable(path)
+    if path == DEFAULT_TABLE_PATH:
+        _default_table = table
+    return table
+
+def h_perfect(state: PackedState, spec: Optional[PuzzleSpec] = None) -> int:
+    """Heurística perfeita lida da tabela padrão (só p o 8-puzzle)."""
+    return load_distance_table().heuristic(state)
+
+def check_heuristic(heuristic_func, table: DistanceTable) -> Dict[str, Any]:
+    """Compara uma heurística com a distância real em todos os estados alcançáveis."""
+    overestimates = 0
+    total_h = 0
+    total_d = 0
+    reachable = 0
+    max_excess = 0
+    for rank in range(NUM_PERMUTATIONS):
+        d = table._mm[HEADER_SIZE + rank]
+        if d == UNREACHABLE:
+            continue
+        h = heuristic_func(state_unrank(rank))
+        reachable += 1
+        total_h += h
+        total_d += d
+        if h > d:
+            overestimates += 1
+            max_excess = max(max_excess, h - d)
+    return {
+        "reachable_states": reachable,
+        "admissible": overestimates == 0,
+        "overestimated_states": overestimates,
+        "max_overestimate": max_excess,
+        "mean_h_over_mean_d": round(total_h / total_d, 4) if total_d else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "build"
+    if command == "build":
+        start_time = time.time()
+        save_distance_table(build_distance_table())
+        print(f"Tabela salva em '{DEFAULT_TABLE_PATH}' ({time.time() - start_time:.2f} segundos)")
+    elif command == "query":
+        tiles = [int(tok) for tok in sys.argv[2:]]
+        if sorted(tiles) != list(range(NUM_CELLS)):
+            sys.exit("informe as 9 peças do tabuleiro (0 = vazio), linha por linha")
+        board = [tiles[0:3], tiles[3:6], tiles[6:9]]
+        table = load_distance_table()
+        result = table.solve(board)
+        if result is None:
+            print("Estado sem solucao.")
+        else:
+            print(f"Tamanho da solucao otima: {len(result['solution_path'])}")
+            print(" ".join(action["move_direction"] for action in result["solution_path"]))
+    elif command == "check":
+        table = load_distance_table()
+        for name, func in [("Custo Uniforme", h_uniform_cost), ("A* Nao Admissivel", h_non_admissible),
+                           ("A* Pecas Fora do Lugar", h_misplaced_tiles), ("A* Distancia de Manhattan", h_manhattan_distance),
+                           ("A* Conflito Linear", h_linear_conflict), ("A* Walking Distance", h_walking_distance),
+                           ("A* Pattern Database", h_pattern_database)]:
+            try:
+                print(f"{name}: {check_heuristic(func, table)}")
+            except PatternDatabaseMissing as exc:
+                print(f"{name}: pulada ({exc})")
+    else:
+        sys.exit(f"comando desconhecido: {command} (use build, query ou check)")
@@ -0,0 +1,212 @@
+# Python 3
+"""Pattern databases aditivas e disjuntas p o N-Puzzle.
+
+Cada PDB guarda, p um subconjunto de peças (padrão), o menor número de movimentos
+*dessas peças* necessário p levá-las às posições do objetivo, ignorando as demais.
+Como padrões disjuntos só contam os próprios movimentos, a soma das PDBs continua admissível.
+
+As tabelas são indexadas pelo rank da permutação parcial (posições das peças do padrão),
+1 byte por entrada, salvas em arquivos binários e mapeadas em memória (mmap) na carga.
+
+Uso:
+    python pattern_database.py build 3          # partição padrão do 8-puzzle (4-4)
+    python pattern_database.py build 4          # 6-6-3 do 15-puzzle (demorado: é offline)
+    python pattern_database.py build 5          # 5-5-5-5-4 do 24-puzzle (idem)
+"""
+import os
+import sys
+import mmap
+import time
+from typing import List, Tuple, Dict, Optional, Sequence
+
+from Trabalho_1 import ADMISSIBLE_HEURISTICS, PackedState, PuzzleSpec, PUZZLE_3X3, get_spec
+
+PDB_MAGIC = b"NPDB"
+PDB_VERSION = 1
+UNKNOWN = 0xFF
+QUEUED, EXPANDED = 1, 2 # estado de (rank, vazio) durante a BFS
+
+PDB_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# partições disjuntas padrão por tamanho de tabuleiro
+DEFAULT_PARTITIONS: Dict[int, List[Tuple[int, ...]]] = {
+    3: [(1, 2, 3, 4), (5, 6, 7, 8)],
+    4: [(1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)], # 6-6-3 (Korf & Felner)
+    # 5-5-5-5-4: com 6 peças seriam 127M entradas x 25 posições do vazio durante a BFS
+    5: [(1, 2, 3, 6, 7), (4, 5, 8, 9, 10), (11, 12, 16, 17, 21), (13, 14, 15, 18, 19), (20, 22, 23, 24)],
+}
+
+
+# --- Índice de permutações parciais ---
+def pattern_table_size(num_cells: int, num_tiles: int) -> int:
+    """n! / (n-k)!: quantas formas de colocar k peças distintas em n células."""
+    size = 1
+    for i in range(num_tiles):
+        size *= num_cells - i
+    return size
+
+def pattern_rank(positions: Sequence[int], num_cells: int) -> int:
+    """Rank da permutação parcial (célula de cada peça do padrão, na ordem do padrão)."""
+    rank = 0
+    used = 0
+    for i, pos in enumerate(positions):
+        # células menores já ocupadas por peças anteriores não contam
+        smaller = pos - bin(used & ((1 << pos) - 1)).count("1")
+        rank = rank * (num_cells - i) + smaller
+        used |= 1 << pos
+    return rank
+
+
+# --- Construção ---
+def build_pattern_database(spec: PuzzleSpec, tiles: Sequence[int]) -> bytearray:
+    """BFS a partir do objetivo sobre (posições do padrão, vazio).
+
+    Mover o vazio p uma célula fora do padrão custa 0 (a região alcançável é expandida
+    inteira de uma vez); mover uma peça do padrão custa 1. O valor guardado é o mínimo
+    sobre todas as posições do vazio. Cada (rank, vazio) entra no máximo uma vez na
+    próxima fronteira.
+    """
+    n = spec.num_cells
+    neighbors = spec.blank_neighbors
+    goal_cell = {tile: r * spec.size + c for tile, (r, c) in spec.goal_positions.items()}
+    distances = bytearray([UNKNOWN]) * pattern_table_size(n, len(tiles))
+    state_flags = bytearray(len(distances) * n) # (rank, vazio): 0 novo, QUEUED, EXPANDED
+
+    goal_positions = tuple(goal_cell[tile] for tile in tiles)
+    frontier = [(goal_positions, goal_cell[0], pattern_rank(goal_positions, n))]
+    depth = 0
+    while frontier:
+        next_frontier = []
+        for positions, blank, rank in frontier:
+            base = rank * n
+            if state_flags[base + blank] == EXPANDED:
+                continue # alcançado antes, com custo 0, pela região de outro estado
+            if distances[rank] == UNKNOWN:
+                distances[rank] = depth
+            occupied = {pos: idx for idx, pos in enumerate(positions)}
+            # região que o vazio alcança sem mover peças do padrão
+            state_flags[base + blank] = EXPANDED
+            region = [blank]
+            for cell in region:
+                for nb in neighbors[cell]:
+                    idx = occupied.get(nb)
+                    if idx is None:
+                        if state_flags[base + nb] != EXPANDED:
+                            state_flags[base + nb] = EXPANDED
+                            region.append(nb)
+                    else:
+                        # a peça do padrão em nb vai p cell e o vazio p nb
+                        moved = positions[:idx] + (cell,) + positions[idx + 1:]
+                        moved_rank = pattern_rank(moved, n)
+                        if not state_flags[moved_rank * n + nb]:
+                            state_flags[moved_rank * n + nb] = QUEUED
+                            next_frontier.append((moved, nb, moved_rank))
+        frontier = next_frontier
+        depth += 1
+    return distances
+
+def pdb_filename(spec: PuzzleSpec, tiles: Sequence[int]) -> str:
+    return os.path.join(PDB_DIR, f"pdb_{spec.size}x{spec.size}_{'-'.join(map(str, tiles))}.bin")
+
+def save_pattern_database(path: str, spec: PuzzleSpec, tiles: Sequence[int], distances: bytearray) -> None:
+    # grava num temporário e renomeia: vários processos podem gerar a mesma PDB ao mesmo tempo
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(PDB_MAGIC + bytes([PDB_VERSION, spec.size, len(tiles)]) + bytes(tiles))
+        f.write(distances)
+    os.replace(tmp_path, path)
+
+
+class PatternDatabaseMissing(FileNotFoundError):
+    """Arquivo de PDB ainda não gerado; a geração é explícita (CLI ou build_if_missing)."""
+    pass
+
+
+# --- Consulta ---
+class PatternDatabase:
+    """Uma PDB mapeada em memória a partir do arquivo binário."""
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:4] != PDB_MAGIC or self._mm[4] != PDB_VERSION:
+            self._mm.close()
+            raise ValueError(f"arquivo '{path}' não é uma pattern database válida")
+        self.size = self._mm[5]
+        num_tiles = self._mm[6]
+        self.tiles = tuple(self._mm[7:7 + num_tiles])
+        self._offset = 7 + num_tiles
+        self.num_cells = self.size * self.size
+        if len(self._mm) != self._offset + pattern_table_size(self.num_cells, num_tiles):
+            self._mm.close()
+            raise ValueError(f"pattern database '{path}' com tamanho inesperado")
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def lookup(self, cell_of_tile: Sequence[int]) -> int:
+        """Custo do padrão dado o vetor peça -> célula do estado."""
+        return self._mm[self._offset + pattern_rank([cell_of_tile[tile] for tile in self.tiles], self.num_cells)]
+
+
+class AdditivePDB:
+    """Soma de PDBs disjuntas; funciona como heurística h(state, spec)."""
+    def __init__(self, databases: List[PatternDatabase]):
+        tiles = [tile for db in databases for tile in db.tiles]
+        if len(tiles) != len(set(tiles)):
+            raise ValueError("os padrões de uma PDB aditiva precisam ser disjuntos")
+        self.databases = databases
+
+    def __call__(self, state: PackedState, spec: PuzzleSpec) -> int:
+        bits, tile_mask = spec.bits_per_tile, spec.tile_mask
+        cell_of_tile = [0] * spec.num_cells
+        for cell in range(spec.num_cells):
+            cell_of_tile[state & tile_mask] = cell
+            state >>= bits
+        return sum(db.lookup(cell_of_tile) for db in self.databases)
+
+
+def load_additive_pdb(spec: PuzzleSpec, partition: Optional[List[Tuple[int, ...]]] = None, build_if_missing: bool = False) -> AdditivePDB:
+    """Carrega a PDB aditiva de uma partição.
+
+    Arquivo faltando levanta PatternDatabaseMissing; com build_if_missing ele é gerado na hora
+    (segundos no 8-puzzle, horas no 15/24-puzzle).
+    """
+    partition = partition or DEFAULT_PARTITIONS[spec.size]
+    databases = []
+    for tiles in partition:
+        path = pdb_filename(spec, tiles)
+        if not os.path.exists(path):
+            if not build_if_missing:
+                raise PatternDatabaseMissing(f"pattern database '{path}' não encontrada; gere antes com: "
+                                             f"python pattern_database.py build {spec.size}")
+            save_pattern_database(path, spec, tiles, build_pattern_database(spec, tiles))
+        databases.append(PatternDatabase(path))
+    return AdditivePDB(databases)
+
+
+_default_pdbs: Dict[int, AdditivePDB] = {}
+
+def h_pattern_database(state: PackedState, spec: PuzzleSpec = PUZZLE_3X3) -> int:
+    """Heurística admissível: soma das PDBs da partição padrão do tamanho do tabuleiro.
+
+    Não gera tabelas: sem os arquivos, levanta PatternDatabaseMissing com o comando de geração.
+    """
+    pdb = _default_pdbs.get(spec.size)
+    if pdb is None:
+        pdb = _default_pdbs[spec.size] = load_additive_pdb(spec)
+    return pdb(state, spec)
+
+ADMISSIBLE_HEURISTICS.add(h_pattern_database)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] != "build":
+        sys.exit("uso: python pattern_database.py build <tamanho> [peças do padrão, ex: 1,2,3,4]")
+    spec = get_spec(int(sys.argv[2]))
+    partition = [tuple(int(t) for t in arg.split(",")) for arg in sys.argv[3:]] or DEFAULT_PARTITIONS[spec.size]
+    for tiles in partition:
+        start_time = time.time()
+        path = pdb_filename(spec, tiles)
+        save_pattern_database(path, spec, tiles, build_pattern_database(spec, tiles))
+        print(f"PDB {tiles} salva em '{path}' ({time.time() - start_time:.2f} segundos)")
@@ -0,0 +1,239 @@
+# Python 3
+"""Exportação incremental (streaming) da fronteira e dos nós visitados de uma busca.
+
+Em vez de montar dicionários com todos os nós e chamar json.dump no fim, os nós são
+gravados um a um, enquanto a busca os expande (callback on_expand do a_star_search),
+e a fronteira final é gravada ao terminar. Dois formatos:
+
+- "ndjson": uma linha JSON por registro ({"type": "visited"|"frontier"|"header"|"summary", ...});
+- "binary": blocos colunares (estados compactos, depois g, depois h) de até BLOCK_SIZE nós.
+
+Ambos aceitam compressão gzip ou lzma. O leitor (iter_search_records) percorre o arquivo
+sob demanda; arquivos binários sem compressão são lidos via mmap.
+"""
+import io
+import gzip
+import lzma
+import json
+import mmap
+import struct
+from typing import Dict, Any, Iterator, Optional, Tuple, List, IO
+
+from Trabalho_1 import Node, PackedState, PuzzleSpec, get_spec, decode_state
+
+BINARY_MAGIC = b"NPSR"
+BINARY_VERSION = 1
+BLOCK_SIZE = 4096
+
+# tipos de bloco do formato binário
+BLOCK_VISITED = 1
+BLOCK_FRONTIER = 2
+BLOCK_SUMMARY = 3
+RECORD_TYPES = {BLOCK_VISITED: "visited", BLOCK_FRONTIER: "frontier"}
+
+COMPRESSIONS = {
+    None: open,
+    "gzip": gzip.open,
+    "lzma": lzma.open,
+}
+
+
+def state_num_bytes(spec: PuzzleSpec) -> int:
+    return (spec.num_cells * spec.bits_per_tile + 7) // 8
+
+
+# --- Escrita ---
+class NDJSONSearchWriter:
+    """Grava um registro JSON por linha."""
+    def __init__(self, path: str, spec: PuzzleSpec, metadata: Optional[Dict[str, Any]] = None, compression: Optional[str] = None):
+        self.spec = spec
+        self._file: IO[str] = COMPRESSIONS[compression](path, "wt", encoding="utf-8")
+        self._write({"type": "header", "board_size": spec.size, **(metadata or {})})
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _write_node(self, kind: str, node: Node) -> None:
+        self._write({"type": kind, "state": decode_state(node.state, self.spec), "g": node.g, "h": node.h, "f": node.get_f_score()})
+
+    def write_visited(self, node: Node) -> None:
+        self._write_node("visited", node)
+
+    def write_frontier(self, node: Node) -> None:
+        self._write_node("frontier", node)
+
+    def write_summary(self, summary: Dict[str, Any]) -> None:
+        self._write({"type": "summary", **summary})
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BinarySearchWriter:
+    """Formato binário colunar em blocos.
+
+    Cabeçalho: magic, versão, tamanho do tabuleiro, bytes por estado, tamanho + JSON dos metadados.
+    Bloco de nós: tipo (1 byte), quantidade (uint32), estados, coluna g (uint32), coluna h (uint32).
+    Bloco de resumo: tipo, tamanho (uint32), JSON.
+    """
+    def __init__(self, path: str, spec: PuzzleSpec, metadata: Optional[Dict[str, Any]] = None, compression: Optional[str] = None):
+        self.spec = spec
+        self._state_bytes = state_num_bytes(spec)
+        self._file: IO[bytes] = COMPRESSIONS[compression](path, "wb")
+        meta = json.dumps(metadata or {}, ensure_ascii=False).encode("utf-8")
+        self._file.write(BINARY_MAGIC + struct.pack("<BBBI", BINARY_VERSION, spec.size, self._state_bytes, len(meta)) + meta)
+        # buffers pequenos por tipo; só BLOCK_SIZE nós ficam em memória
+        self._buffers: Dict[int, List[Tuple[PackedState, int, int]]] = {BLOCK_VISITED: [], BLOCK_FRONTIER: []}
+
+    def _flush(self, kind: int) -> None:
+        rows = self._buffers[kind]
+        if not rows:
+            return
+        count = len(rows)
+        out = self._file
+        out.write(struct.pack("<BI", kind, count))
+        out.write(b"".join(state.to_bytes(self._state_bytes, "little") for state, _, _ in rows))
+        out.write(struct.pack(f"<{count}I", *(g for _, g, _ in rows)))
+        out.write(struct.pack(f"<{count}I", *(h for _, _, h in rows)))
+        rows.clear()
+
+    def _add(self, kind: int, node: Node) -> None:
+        rows = self._buffers[kind]
+        rows.append((node.state, node.g, node.h))
+        if len(rows) >= BLOCK_SIZE:
+            self._flush(kind)
+
+    def write_visited(self, node: Node) -> None:
+        self._add(BLOCK_VISITED, node)
+
+    def write_frontier(self, node: Node) -> None:
+        self._add(BLOCK_FRONTIER, node)
+
+    def write_summary(self, summary: Dict[str, Any]) -> None:
+        self._flush(BLOCK_VISITED)
+        self._flush(BLOCK_FRONTIER)
+        data = json.dumps(summary, ensure_ascii=False).encode("utf-8")
+        self._file.write(struct.pack("<BI", BLOCK_SUMMARY, len(data)) + data)
+
+    def close(self) -> None:
+        self._flush(BLOCK_VISITED)
+        self._flush(BLOCK_FRONTIER)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+WRITERS = {
+    "ndjson": NDJSONSearchWriter,
+    "binary": BinarySearchWriter,
+}
+
+def open_search_writer(path: str, spec: PuzzleSpec, fmt: str = "ndjson", compression: Optional[str] = None,
+                       metadata: Optional[Dict[str, Any]] = None):
+    """Abre um writer de busca ("ndjson" ou "binary"; compression None, "gzip" ou "lzma")."""
+    if fmt not in WRITERS:
+        raise ValueError(f"formato desconhecido: {fmt}")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"compressão desconhecida: {compression}")
+    return WRITERS[fmt](path, spec, metadata, compression)
+
+
+# --- Leitura ---
+def _open_maybe_compressed(path: str) -> IO[bytes]:
+    with open(path, "rb") as f:
+        magic = f.read(6)
+    if magic[:2] == b"\x1f\x8b":
+        return gzip.open(path, "rb")
+    if magic == b"\xfd7zXZ\x00":
+        return lzma.open(path, "rb")
+    return open(path, "rb")
+
+def _decode_block(kind: int, states: bytes, gs: Tuple[int, ...], hs: Tuple[int, ...], state_bytes: int, spec: PuzzleSpec, decode: bool) -> Iterator[Dict[str, Any]]:
+    kind_name = RECORD_TYPES[kind]
+    for i in range(len(gs)):
+        state = int.from_bytes(states[i * state_bytes:(i + 1) * state_bytes], "little")
+        yield {"type": kind_name, "state": decode_state(state, spec) if decode else state,
+               "g": gs[i], "h": hs[i], "f": gs[i] + hs[i]}
+
+def _iter_binary_mmap(buf, decode: bool) -> Iterator[Dict[str, Any]]:
+    """Percorre um arquivo binário sem compressão direto do mmap."""
+    version, size, state_bytes, meta_len = struct.unpack_from("<BBBI", buf, 4)
+    if version != BINARY_VERSION:
+        raise ValueError(f"versão de arquivo não suportada: {version}")
+    spec = get_spec(size)
+    offset = 4 + struct.calcsize("<BBBI")
+    yield {"type": "header", "board_size": size, **json.loads(buf[offset:offset + meta_len].decode("utf-8"))}
+    offset += meta_len
+    block_header = struct.calcsize("<BI")
+    while offset < len(buf):
+        kind, count = struct.unpack_from("<BI", buf, offset)
+        offset += block_header
+        if kind == BLOCK_SUMMARY:
+            yield {"type": "summary", **json.loads(buf[offset:offset + count].decode("utf-8"))}
+            offset += count
+            continue
+        states = buf[offset:offset + count * state_bytes]
+        offset += count * state_bytes
+        gs = struct.unpack_from(f"<{count}I", buf, offset)
+        offset += 4 * count
+        hs = struct.unpack_from(f"<{count}I", buf, offset)
+        offset += 4 * count
+        yield from _decode_block(kind, states, gs, hs, state_bytes, spec, decode)
+
+def _iter_binary_stream(stream: IO[bytes], decode: bool) -> Iterator[Dict[str, Any]]:
+    """Percorre um arquivo binário comprimido bloco a bloco (sem acesso aleatório)."""
+    header_fmt = "<BBBI"
+    version, size, state_bytes, meta_len = struct.unpack(header_fmt, stream.read(struct.calcsize(header_fmt)))
+    if version != BINARY_VERSION:
+        raise ValueError(f"versão de arquivo não suportada: {version}")
+    spec = get_spec(size)
+    yield {"type": "header", "board_size": size, **json.loads(stream.read(meta_len).decode("utf-8"))}
+    block_header = struct.calcsize("<BI")
+    while True:
+        raw = stream.read(block_header)
+        if len(raw) < block_header:
+            return
+        kind, count = struct.unpack("<BI", raw)
+        if kind == BLOCK_SUMMARY:
+            yield {"type": "summary", **json.loads(stream.read(count).decode("utf-8"))}
+            continue
+        states = stream.read(count * state_bytes)
+        gs = struct.unpack(f"<{count}I", stream.read(4 * count))
+        hs = struct.unpack(f"<{count}I", stream.read(4 * count))
+        yield from _decode_block(kind, states, gs, hs, state_bytes, spec, decode)
+
+def iter_search_records(path: str, decode: bool = True) -> Iterator[Dict[str, Any]]:
+    """Itera os registros (header, visited, frontier, summary) de um arquivo exportado.
+
+    decode=False devolve o estado como int compacto (mais barato) nos arquivos binários.
+    """
+    stream = _open_maybe_compressed(path)
+    try:
+        head = stream.read(4)
+        if head == BINARY_MAGIC:
+            if isinstance(stream, io.BufferedReader):
+                # sem compressão: mmap, nada é carregado de uma vez
+                with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    yield from _iter_binary_mmap(mm, decode)
+            else:
+                yield from _iter_binary_stream(stream, decode)
+            return
+        text = io.TextIOWrapper(stream, encoding="utf-8")
+        first_line = head.decode("utf-8") + text.readline()
+        if first_line.strip():
+            yield json.loads(first_line)
+        for line in text:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        stream.close()
@@ -0,0 +1,198 @@
+# Python 3
+"""Heurísticas vetorizadas com NumPy: avaliam um lote inteiro de estados numa chamada só.
+
+Servem p pontuar todos os sucessores de uma expansão ou um arquivo inteiro de tabuleiros
+(trabalho offline). Os estados (ints compactos ou tabuleiros) viram uma matriz (n, N*N) de
+peças e as heurísticas são consultas às tabelas do PuzzleSpec convertidas em arrays:
+
+- "manhattan": soma de manhattan_table[peça, célula];
+- "misplaced": soma de misplaced_table[peça, célula];
+- "linear_conflict": Manhattan + 2 x (peças a tirar de cada linha/coluna p desfazer os
+  conflitos), consultado numa tabela indexada pelo padrão da linha (admissível).
+
+NumPy é opcional: o resto do projeto não depende deste módulo.
+
+Uso:
+    python vector_heuristics.py tabuleiros.txt --heuristics manhattan linear_conflict
+"""
+import sys
+import json
+import time
+import argparse
+import weakref
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError: # pragma: no cover - depende do ambiente
+    np = None
+
+from Trabalho_1 import Node, PackedState, PuzzleSpec, PUZZLE_3X3, encode_state, get_spec, get_all_successors
+
+BoardOrState = Union[PackedState, List[List[int]]]
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("vector_heuristics precisa do numpy (pip install numpy)")
+
+
+# --- Tabelas ---
+class _NumpyTables:
+    """Tabelas de um PuzzleSpec convertidas p arrays."""
+    def __init__(self, spec: PuzzleSpec):
+        size = spec.size
+        self.manhattan = np.array(spec.manhattan_table, dtype=np.int16)
+        self.misplaced = np.array(spec.misplaced_table, dtype=np.int16)
+        goal_row = np.full(spec.num_cells, -1, dtype=np.int16)
+        goal_col = np.full(spec.num_cells, -1, dtype=np.int16)
+        for tile, (r, c) in spec.goal_positions.items():
+            if tile != 0: # o vazio não entra em conflito
+                goal_row[tile], goal_col[tile] = r, c
+        self.goal_row = goal_row
+        self.goal_col = goal_col
+        self.line_conflicts = np.array(spec.line_conflicts, dtype=np.int16)
+        self.line_powers = (size + 1) ** np.arange(size, dtype=np.int32)
+        self.cells = np.arange(spec.num_cells)
+
+_TABLES: "weakref.WeakKeyDictionary[PuzzleSpec, _NumpyTables]" = weakref.WeakKeyDictionary()
+
+def _tables(spec: PuzzleSpec) -> _NumpyTables:
+    tables = _TABLES.get(spec)
+    if tables is None:
+        _require_numpy()
+        tables = _TABLES[spec] = _NumpyTables(spec)
+    return tables
+
+
+# --- Conversão ---
+def unpack_states(states: Iterable[BoardOrState], spec: PuzzleSpec = PUZZLE_3X3) -> "np.ndarray":
+    """Matriz (n, N*N) com a peça de cada célula; aceita ints compactos ou tabuleiros."""
+    _require_numpy()
+    num_cells, bits = spec.num_cells, spec.bits_per_tile
+    state_bytes = (num_cells * bits + 7) // 8
+    raw = np.frombuffer(b"".join(encode_state(state, spec).to_bytes(state_bytes, "little") for state in states),
+                        dtype=np.uint8).reshape(-1, state_bytes)
+    if bits == 4:
+        # 2 peças por byte: nibble baixo, depois nibble alto
+        tiles = np.empty((raw.shape[0], state_bytes * 2), dtype=np.uint8)
+        tiles[:, 0::2] = raw & 0x0F
+        tiles[:, 1::2] = raw >> 4
+        return tiles[:, :num_cells]
+    unpacked = np.unpackbits(raw, axis=1, bitorder="little")[:, :num_cells * bits].reshape(-1, num_cells, bits)
+    return (unpacked.astype(np.uint8) << np.arange(bits, dtype=np.uint8)).sum(axis=2, dtype=np.uint8)
+
+def _as_tiles(states: Union["np.ndarray", Iterable[BoardOrState]], spec: PuzzleSpec) -> "np.ndarray":
+    if np is not None and isinstance(states, np.ndarray):
+        return states
+    return unpack_states(states, spec)
+
+
+# --- Heurísticas em lote ---
+def batch_manhattan(states, spec: PuzzleSpec = PUZZLE_3X3) -> "np.ndarray":
+    tiles = _as_tiles(states, spec)
+    tables = _tables(spec)
+    return tables.manhattan[tiles, tables.cells].sum(axis=1, dtype=np.int32)
+
+def batch_misplaced(states, spec: PuzzleSpec = PUZZLE_3X3) -> "np.ndarray":
+    tiles = _as_tiles(states, spec)
+    tables = _tables(spec)
+    return tables.misplaced[tiles, tables.cells].sum(axis=1, dtype=np.int32)
+
+def batch_linear_conflict(states, spec: PuzzleSpec = PUZZLE_3X3) -> "np.ndarray":
+    tiles = _as_tiles(states, spec)
+    tables = _tables(spec)
+    size = spec.size
+    by_row = tiles.reshape(-1, size, size) # [estado, linha, coluna]
+    goal_row, goal_col = tables.goal_row[by_row], tables.goal_col[by_row]
+    line_index = np.arange(size)[None, :, None]
+    # padrão de cada linha: coluna-objetivo das peças que pertencem a ela; size nas demais
+    row_codes = np.where(goal_row == line_index, goal_col, size) @ tables.line_powers
+    # idem p as colunas, percorrendo de cima p baixo
+    col_codes = np.where(goal_col.transpose(0, 2, 1) == line_index, goal_row.transpose(0, 2, 1), size) @ tables.line_powers
+    conflicts = tables.line_conflicts[row_codes].sum(axis=1) + tables.line_conflicts[col_codes].sum(axis=1)
+    return batch_manhattan(tiles, spec) + 2 * conflicts.astype(np.int32)
+
+BATCH_HEURISTICS = {
+    "manhattan": batch_manhattan,
+    "misplaced": batch_misplaced,
+    "linear_conflict": batch_linear_conflict,
+}
+
+def score_states(states, heuristic: str = "manhattan", spec: PuzzleSpec = PUZZLE_3X3) -> "np.ndarray":
+    """h de cada estado do lote (ints compactos, tabuleiros ou matriz de peças)."""
+    if heuristic not in BATCH_HEURISTICS:
+        raise ValueError(f"heurística desconhecida: {heuristic}")
+    return BATCH_HEURISTICS[heuristic](states, spec)
+
+def score_successors(node: Node, heuristic: str = "manhattan", spec: PuzzleSpec = PUZZLE_3X3) -> List[Node]:
+    """Gera os sucessores de node com h preenchido por uma única avaliação em lote."""
+    successors = get_all_successors(node, spec)
+    for successor, h in zip(successors, score_states([s.state for s in successors], heuristic, spec).tolist()):
+        successor.h = h
+    return successors
+
+
+# --- Deltas incrementais de Manhattan ---
+def manhattan_deltas(tiles: Sequence[int], from_cells: Sequence[int], to_cells: Sequence[int],
+                     spec: PuzzleSpec = PUZZLE_3X3) -> "np.ndarray":
+    """Variação de Manhattan de cada movimento (peça, célula de origem, célula de destino).
+
+    Só a peça movida muda de lugar, então h(filho) = h(pai) + delta, sem reavaliar o tabuleiro.
+    """
+    table = _tables(spec).manhattan
+    tiles = np.asarray(tiles)
+    return table[tiles, np.asarray(to_cells)].astype(np.int32) - table[tiles, np.asarray(from_cells)]
+
+def successor_manhattan(node: Node, spec: PuzzleSpec = PUZZLE_3X3) -> "np.ndarray":
+    """Manhattan dos sucessores de node (na ordem de get_all_successors) a partir de node.h, pelos deltas da peça movida."""
+    bits, tile_mask = spec.bits_per_tile, spec.tile_mask
+    neighbors = spec.blank_neighbors[node.blank]
+    moved = [(node.state >> (cell * bits)) & tile_mask for cell in neighbors]
+    # a peça sai da célula vizinha e vai p onde estava o vazio
+    return node.h + manhattan_deltas(moved, neighbors, [node.blank] * len(neighbors), spec)
+
+
+# --- Pontuação em massa de arquivos ---
+def score_board_file(path: str, heuristics: Sequence[str] = ("manhattan",), chunk_size: int = 65536) -> Iterable[Dict[str, Any]]:
+    """Lê o arquivo em blocos de chunk_size tabuleiros e devolve um registro por tabuleiro."""
+    from batch_solve import read_boards
+
+    boards = read_boards(path)
+    index = 0
+    while True:
+        chunk = list(islice(boards, chunk_size))
+        if not chunk:
+            return
+        spec = get_spec(len(chunk[0]))
+        if any(len(board) != spec.size for board in chunk):
+            raise ValueError("todos os tabuleiros do arquivo precisam ter o mesmo tamanho")
+        tiles = unpack_states(chunk, spec)
+        scores = {name: score_states(tiles, name, spec).tolist() for name in heuristics}
+        for i in range(len(chunk)):
+            yield {"index": index + i, **{name: values[i] for name, values in scores.items()}}
+        index += len(chunk)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pontua em lote (NumPy) os tabuleiros de um arquivo.")
+    parser.add_argument("boards_file", help="um tabuleiro por linha (N*N números, 0 = vazio)")
+    parser.add_argument("--heuristics", nargs="+", choices=sorted(BATCH_HEURISTICS), default=["manhattan"])
+    parser.add_argument("--chunk", type=int, default=65536, help="tabuleiros avaliados por chamada")
+    parser.add_argument("--output", default=None, help="arquivo NDJSON de saída (padrão: stdout)")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    count = 0
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for record in score_board_file(args.boards_file, args.heuristics, args.chunk):
+            out.write(json.dumps(record) + "\n")
+            count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.time() - start_time
+    print(json.dumps({"boards": count, "seconds": round(elapsed, 4), "boards_per_second": round(count / (elapsed or 1e-9), 1)}),
+          file=sys.stderr)